@@ -12,12 +12,89 @@ from datetime import date
 import logging
 import time
 
+from psycopg2.extras import execute_values
 import requests
 from bs4 import BeautifulSoup
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bulk upsert for equity_domains (one statement per page of rows)
+UPSERT_SQL = """
+    INSERT INTO equity_domains (
+        domain, b_corp, verified_date, verification_source, notes
+    ) VALUES %s
+    ON CONFLICT (domain) 
+    DO UPDATE SET 
+        b_corp = TRUE,
+        verified_date = EXCLUDED.verified_date,
+        verification_source = EXCLUDED.verification_source,
+        notes = EXCLUDED.notes
+"""
+UPSERT_TEMPLATE = "(%s, TRUE, %s, %s, %s)"
+UPSERT_PAGE_SIZE = 500
+
+# Single-row upsert, prepared once per fallback pass so it is planned once
+PREPARE_UPSERT_SQL = """
+    PREPARE upsert_equity (text, date, text, text) AS
+    INSERT INTO equity_domains (
+        domain, b_corp, verified_date, verification_source, notes
+    ) VALUES ($1, TRUE, $2, $3, $4)
+    ON CONFLICT (domain) 
+    DO UPDATE SET 
+        b_corp = TRUE,
+        verified_date = EXCLUDED.verified_date,
+        verification_source = EXCLUDED.verification_source,
+        notes = EXCLUDED.notes
+"""
+
+# Known B-Corps (manually curated + periodically updated)
+_KNOWN_BCORPS = (
+    # Major B-Corps
+    ('patagonia.com', 'Outdoor clothing, environmental activism'),
+    ('benandjerrys.com', 'Ice cream, social justice'),
+    ('warbyparker.com', 'Eyewear, buy-one-give-one'),
+    ('allbirds.com', 'Sustainable footwear'),
+    ('etsy.com', 'Handmade goods marketplace'),
+    ('kickstarter.com', 'Crowdfunding platform'),
+    ('cabot.coop', 'Farmer-owned dairy cooperative'),
+    ('seventhgeneration.com', 'Eco-friendly household products'),
+    ('newbelgium.com', 'Craft brewery'),
+    ('danonewave.com', 'Organic food products'),
+    ('method.com', 'Eco-friendly cleaning products'),
+    ('kingarthurbaking.com', 'Employee-owned baking company'),
+    ('greyston.org', 'Social enterprise bakery'),
+    ('altereco.com', 'Fair trade chocolate'),
+    ('thistle.co', 'Plant-based meal delivery'),
+    ('blueavocado.com', 'Reusable bags and food storage'),
+    ('athleta.com', 'Women\'s athletic wear'),
+    ('ifixit.com', 'Repair guides and parts'),
+    ('plumorganics.com', 'Organic baby food'),
+    ('nativecos.com', 'Natural personal care'),
+    ('happyfamilyorganics.com', 'Organic baby food'),
+    ('drinkgtea.com', 'Organic beverages'),
+    ('nutiva.com', 'Organic superfoods'),
+    ('rhodeisland.com', 'Design school'),
+    ('newresource.bank', 'Sustainable banking'),
+    ('beneficial-state.org', 'Community development bank'),
+    ('lemonade.com', 'Insurance tech with giveback'),
+    ('reformation.com', 'Sustainable fashion'),
+    ('everlane.com', 'Ethical fashion'),
+    ('bombas.com', 'Socks with donation model'),
+    ('toms.com', 'Shoes with giving model'),
+    ('tentree.com', 'Apparel, plants 10 trees per item'),
+    ('goodr.com', 'Sunglasses'),
+    ('pactapparel.com', 'Organic cotton basics'),
+    ('wearpact.com', 'Organic clothing'),
+    ('organicindia.com', 'Organic supplements'),
+    ('drinkpedialyte.com', 'Hydration products'),
+    ('clif.com', 'Energy bars'),
+    ('larabar.com', 'Fruit and nut bars'),
+    ('barmethod.com', 'Fitness studios'),
+    ('corepower.yoga', 'Yoga studios'),
+    ('sweetgreen.com', 'Fast casual salads'),
+)
+
 
 class BCorpScraper:
     """Scrape B-Corp Directory for certified companies"""
@@ -42,96 +119,115 @@ class BCorpScraper:
     
     def _add_known_bcorps(self):
         """Add known B-Corps (manually curated + periodically updated)"""
-        known_bcorps = [
-            # Major B-Corps
-            ('patagonia.com', 'Outdoor clothing, environmental activism'),
-            ('benandjerrys.com', 'Ice cream, social justice'),
-            ('warbyparker.com', 'Eyewear, buy-one-give-one'),
-            ('allbirds.com', 'Sustainable footwear'),
-            ('etsy.com', 'Handmade goods marketplace'),
-            ('kickstarter.com', 'Crowdfunding platform'),
-            ('cabot.coop', 'Farmer-owned dairy cooperative'),
-            ('seventhgeneration.com', 'Eco-friendly household products'),
-            ('newbelgium.com', 'Craft brewery'),
-            ('danonewave.com', 'Organic food products'),
-            ('method.com', 'Eco-friendly cleaning products'),
-            ('kingarthurbaking.com', 'Employee-owned baking company'),
-            ('greyston.org', 'Social enterprise bakery'),
-            ('altereco.com', 'Fair trade chocolate'),
-            ('thistle.co', 'Plant-based meal delivery'),
-            ('blueavocado.com', 'Reusable bags and food storage'),
-            ('athleta.com', 'Women\'s athletic wear'),
-            ('ifixit.com', 'Repair guides and parts'),
-            ('plumorganics.com', 'Organic baby food'),
-            ('nativecos.com', 'Natural personal care'),
-            ('happyfamilyorganics.com', 'Organic baby food'),
-            ('drinkgtea.com', 'Organic beverages'),
-            ('nutiva.com', 'Organic superfoods'),
-            ('rhodeisland.com', 'Design school'),
-            ('newresource.bank', 'Sustainable banking'),
-            ('beneficial-state.org', 'Community development bank'),
-            ('lemonade.com', 'Insurance tech with giveback'),
-            ('reformation.com', 'Sustainable fashion'),
-            ('everlane.com', 'Ethical fashion'),
-            ('bombas.com', 'Socks with donation model'),
-            ('toms.com', 'Shoes with giving model'),
-            ('tentree.com', 'Apparel, plants 10 trees per item'),
-            ('goodr.com', 'Sunglasses'),
-            ('pactapparel.com', 'Organic cotton basics'),
-            ('wearpact.com', 'Organic clothing'),
-            ('organicindia.com', 'Organic supplements'),
-            ('drinkpedialyte.com', 'Hydration products'),
-            ('clif.com', 'Energy bars'),
-            ('larabar.com', 'Fruit and nut bars'),
-            ('barmethod.com', 'Fitness studios'),
-            ('corepower.yoga', 'Yoga studios'),
-            ('sweetgreen.com', 'Fast casual salads'),
-        ]
+        self.bcorps.extend(
+            {'domain': domain, 'notes': notes, 'source': 'B-Corp Directory'}
+            for domain, notes in _KNOWN_BCORPS
+        )
         
-        for domain, notes in known_bcorps:
-            self.bcorps.append({
-                'domain': domain,
-                'notes': notes,
-                'source': 'B-Corp Directory'
-            })
-        
-        logger.info(f"Added {len(known_bcorps)} known B-Corps")
+        logger.info(f"Added {len(_KNOWN_BCORPS)} known B-Corps")
     
     def update_database(self):
-        """Update equity_domains table with B-Corps"""
-        cursor = self.db_conn.cursor()
+        """
+        Update equity_domains table with B-Corps
+        Runs as one transaction: committed on success, rolled back on error
+        """
+        today = date.today()
+        rows = [
+            (
+                bcorp['domain'],
+                today,
+                bcorp.get('source', 'B-Corp Automated Scraper'),
+                bcorp.get('notes', '')
+            )
+            for bcorp in self.bcorps
+        ]
         
         updated = 0
         
-        for bcorp in self.bcorps:
-            domain = bcorp['domain']
-            notes = bcorp.get('notes', '')
-            source = bcorp.get('source', 'B-Corp Automated Scraper')
+        with self.db_conn, self.db_conn.cursor() as cursor:
+            # Only write rows that are new or changed since the last run
+            existing = self._fetch_existing(cursor, [row[0] for row in rows])
+            rows = [
+                row for row in rows
+                if existing.get(row[0]) != (True, row[2], row[3])
+            ]
             
-            try:
-                cursor.execute("""
-                    INSERT INTO equity_domains (
-                        domain, b_corp, verified_date, verification_source, notes
-                    ) VALUES (%s, TRUE, %s, %s, %s)
-                    ON CONFLICT (domain) 
-                    DO UPDATE SET 
-                        b_corp = TRUE,
-                        verified_date = EXCLUDED.verified_date,
-                        verification_source = EXCLUDED.verification_source,
-                        notes = EXCLUDED.notes
-                """, (domain, date.today(), source, notes))
-                
-                updated += 1
-                logger.info(f"✅ Updated: {domain}")
+            unchanged = len(self.bcorps) - len(rows)
+            if unchanged:
+                logger.info(f"Skipping {unchanged} unchanged B-Corps")
+            
+            # One round-trip per page of rows instead of one per domain
+            for start in range(0, len(rows), UPSERT_PAGE_SIZE):
+                page = rows[start:start + UPSERT_PAGE_SIZE]
                 
-            except Exception as e:
-                logger.error(f"❌ Error updating {domain}: {e}")
-        
-        self.db_conn.commit()
-        cursor.close()
+                try:
+                    cursor.execute("SAVEPOINT bcorp_page")
+                    execute_values(
+                        cursor,
+                        UPSERT_SQL,
+                        page,
+                        template=UPSERT_TEMPLATE,
+                        page_size=UPSERT_PAGE_SIZE
+                    )
+                    cursor.execute("RELEASE SAVEPOINT bcorp_page")
+                    updated += len(page)
+                    
+                    if logger.isEnabledFor(logging.DEBUG):
+                        for row in page:
+                            logger.debug(f"✅ Updated: {row[0]}")
+                    
+                except Exception as e:
+                    # Fall back to per-row inserts for the failing page only
+                    cursor.execute("ROLLBACK TO SAVEPOINT bcorp_page")
+                    logger.warning(f"Bulk upsert failed, retrying page row by row: {e}")
+                    updated += self._upsert_rows_individually(cursor, page)
+            
+            # Refresh planner statistics so rescoring lookups use the new rows
+            if updated:
+                cursor.execute("ANALYZE equity_domains")
         
         logger.info(f"Updated {updated} B-Corps in database")
         return updated
+    
+    def _fetch_existing(self, cursor, domains):
+        """
+        Load current rows for the given domains in one query
+        Returns dict: {domain: (b_corp, verification_source, notes)}
+        """
+        if not domains:
+            return {}
+        
+        cursor.execute("""
+            SELECT domain, b_corp, verification_source, notes
+            FROM equity_domains
+            WHERE domain = ANY(%s)
+        """, (domains,))
+        
+        return {
+            domain: (bool(b_corp), source, notes)
+            for domain, b_corp, source, notes in cursor.fetchall()
+        }
+    
+    def _upsert_rows_individually(self, cursor, rows):
+        """Upsert rows one at a time, skipping the ones that fail"""
+        updated = 0
+        
+        cursor.execute(PREPARE_UPSERT_SQL)
+        try:
+            for row in rows:
+                try:
+                    cursor.execute("SAVEPOINT bcorp_row")
+                    cursor.execute("EXECUTE upsert_equity (%s, %s, %s, %s)", row)
+                    cursor.execute("RELEASE SAVEPOINT bcorp_row")
+                    updated += 1
+                    
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bcorp_row")
+                    logger.error(f"❌ Error updating {row[0]}: {e}")
+        finally:
+            cursor.execute("DEALLOCATE upsert_equity")
+        
+        return updated
 
 
 def main():
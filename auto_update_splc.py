@@ -7,16 +7,82 @@ Fetches updated hate group websites from SPLC and updates blocklist
 import os
 import sys
 import re
+import io
+import asyncio
 import psycopg2
 from datetime import date
 import logging
 
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from lxml import html as lxml_html
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent fetch limits for group pages
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+MAX_CONCURRENT_FETCHES = 32
+KEEPALIVE_TIMEOUT = 30
+
+# Retry policy for throttled/failed fetches
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Domains linked from group pages that are never the group's own site
+_SKIP_DOMAINS = frozenset({
+    # Social media
+    'facebook.com', 'twitter.com', 'youtube.com', 'instagram.com',
+    'tiktok.com', 'linkedin.com', 'reddit.com',
+    
+    # News sites
+    'cnn.com', 'foxnews.com', 'nytimes.com', 'washingtonpost.com',
+    'reuters.com', 'apnews.com', 'bbc.com', 'npr.org',
+})
+
+# Known hate groups from research and previous SPLC reports
+_KNOWN_HATE_GROUPS = (
+    # White Nationalist/Neo-Nazi
+    ('stormfront.org', 'White nationalist forum - SPLC listed'),
+    ('dailystormer.name', 'Neo-Nazi website - SPLC listed'),
+    ('dailystormer.su', 'Neo-Nazi website - SPLC listed'),
+    ('vdare.com', 'White nationalist publication - SPLC listed'),
+    ('americanrenaissance.com', 'White nationalist publication - SPLC listed'),
+    ('counter-currents.com', 'White nationalist publication - SPLC listed'),
+    ('theoccidentalobserver.net', 'White nationalist publication - SPLC listed'),
+    ('nationalvanguard.org', 'Neo-Nazi organization - SPLC listed'),
+    ('nsm88.org', 'Neo-Nazi organization - SPLC listed'),
+    ('therightstuff.biz', 'Neo-Nazi podcast network - SPLC listed'),
+    ('altright.com', 'White nationalist - SPLC listed'),
+    ('radixjournal.com', 'White nationalist - SPLC listed'),
+    
+    # Anti-Muslim Hate
+    ('jihadwatch.org', 'Anti-Muslim hate site - SPLC listed'),
+    ('barenakedislam.com', 'Anti-Muslim hate site - SPLC listed'),
+    ('atlasshrugs.com', 'Anti-Muslim hate site - SPLC listed'),
+    ('pamelageller.com', 'Anti-Muslim hate - SPLC listed'),
+    ('thereligionofpeace.com', 'Anti-Muslim hate site - SPLC listed'),
+    ('gatesofvienna.net', 'Anti-Muslim hate site - SPLC listed'),
+    
+    # Conspiracy/Extremist
+    ('infowars.com', 'Conspiracy theories, extremist content - SPLC listed'),
+    ('prisonplanet.com', 'Conspiracy theories - SPLC listed'),
+    ('naturalnews.com', 'Dangerous health misinformation - SPLC listed'),
+    ('beforeitsnews.com', 'Conspiracy theories - SPLC listed'),
+    ('veteranstoday.com', 'Conspiracy theories, antisemitism - SPLC listed'),
+    
+    # Add more from SPLC Hate Map research
+)
+
+
+def _copy_escape(value):
+    """Escape a value for COPY ... FROM STDIN text format"""
+    return (value.replace('\\', '\\\\')
+                 .replace('\t', '\\t')
+                 .replace('\n', '\\n')
+                 .replace('\r', '\\r'))
+
 
 class SPLCScraper:
     """Scrape SPLC Hate Map for hate group websites"""
@@ -26,6 +92,11 @@ class SPLCScraper:
         self.base_url = "https://www.splcenter.org"
         self.hate_map_url = f"{self.base_url}/hate-map"
         
+        # Sent with every request in the scrape session
+        self.headers = {
+            'User-Agent': 'NotHere.one Bot/1.0 (Values-based search engine; +https://nothere.one/bot)'
+        }
+        
         # Known hate group domains (seed list + scraped)
         self.hate_domains = set()
         
@@ -40,40 +111,74 @@ class SPLCScraper:
         logger.info("Fetching SPLC Hate Map...")
         
         try:
-            response = requests.get(self.hate_map_url, timeout=30)
-            response.raise_for_status()
+            asyncio.run(self._scrape_async())
+            logger.info(f"Found {len(self.hate_domains)} hate domains from SPLC")
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+        except Exception as e:
+            logger.error(f"Error scraping SPLC: {e}")
+    
+    async def _scrape_async(self):
+        """Fetch the hate map, then all group pages concurrently"""
+        # One pooled HTTP/2 client for the whole scrape: group page requests
+        # are multiplexed over kept-alive connections to splcenter.org
+        # instead of a TCP+TLS handshake per page
+        limits = httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_TIMEOUT
+        )
+        
+        async with httpx.AsyncClient(http2=True, limits=limits, headers=self.headers,
+                                     follow_redirects=True) as session:
+            content = await self._fetch(session, self.hate_map_url, timeout=30)
+            
+            tree = lxml_html.fromstring(content)
             
             # SPLC's map is dynamic, but we can extract group names and research their sites
             # This is a simplified version - in production, you'd use Selenium for JS rendering
             
             # Look for links to hate group profiles
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                
+            group_urls = set()
+            for href in tree.xpath('//a/@href'):
                 # SPLC group profile pages
                 if '/fighting-hate/extremist-files/group/' in href:
-                    group_url = self.base_url + href if href.startswith('/') else href
-                    self._scrape_group_page(group_url)
+                    group_urls.add(self.base_url + href if href.startswith('/') else href)
             
-            logger.info(f"Found {len(self.hate_domains)} hate domains from SPLC")
+            logger.info(f"Fetching {len(group_urls)} group pages...")
             
-        except Exception as e:
-            logger.error(f"Error scraping SPLC: {e}")
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+            await asyncio.gather(*[
+                self._scrape_group_page(session, semaphore, url)
+                for url in group_urls
+            ])
     
-    def _scrape_group_page(self, url):
+    async def _fetch(self, session, url, timeout=10):
+        """
+        GET a page body (bytes), retrying 429/5xx responses with exponential backoff
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            response = await session.get(url, timeout=timeout)
+            
+            if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                delay = BACKOFF_BASE * (2 ** attempt)
+                logger.debug(f"HTTP {response.status_code} for {url}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            
+            response.raise_for_status()
+            return response.content
+    
+    async def _scrape_group_page(self, session, semaphore, url):
         """Scrape individual hate group page for website URLs"""
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            async with semaphore:
+                content = await self._fetch(session, url, timeout=10)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            tree = lxml_html.fromstring(content)
+            page_text = tree.text_content()
             
             # Look for website links in the page
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                
+            for href in tree.xpath('//a/@href'):
                 # Skip SPLC internal links
                 if 'splcenter.org' in href:
                     continue
@@ -81,7 +186,7 @@ class SPLCScraper:
                 # Look for external website links
                 if href.startswith('http'):
                     domain = self._extract_domain(href)
-                    if domain and self._is_likely_hate_site(domain, soup.text):
+                    if domain and self._is_likely_hate_site(domain, page_text):
                         self.hate_domains.add(domain)
         
         except Exception as e:
@@ -107,19 +212,11 @@ class SPLCScraper:
         Heuristic check if domain is likely a hate group site
         (vs. social media, news coverage, etc.)
         """
-        # Skip social media
-        social_media = ['facebook.com', 'twitter.com', 'youtube.com', 'instagram.com',
-                       'tiktok.com', 'linkedin.com', 'reddit.com']
-        
-        if any(sm in domain for sm in social_media):
-            return False
-        
-        # Skip news sites
-        news_sites = ['cnn.com', 'foxnews.com', 'nytimes.com', 'washingtonpost.com',
-                     'reuters.com', 'apnews.com', 'bbc.com', 'npr.org']
-        
-        if any(news in domain for news in news_sites):
-            return False
+        # Skip social media and news coverage (domain or any parent domain)
+        parts = domain.split('.')
+        for i in range(len(parts)):
+            if '.'.join(parts[i:]) in _SKIP_DOMAINS:
+                return False
         
         return True
     
@@ -128,50 +225,17 @@ class SPLCScraper:
         Add known hate groups from research and previous SPLC reports
         This serves as a fallback for when scraping is difficult
         """
-        known_groups = [
-            # White Nationalist/Neo-Nazi
-            ('stormfront.org', 'White nationalist forum - SPLC listed'),
-            ('dailystormer.name', 'Neo-Nazi website - SPLC listed'),
-            ('dailystormer.su', 'Neo-Nazi website - SPLC listed'),
-            ('vdare.com', 'White nationalist publication - SPLC listed'),
-            ('americanrenaissance.com', 'White nationalist publication - SPLC listed'),
-            ('counter-currents.com', 'White nationalist publication - SPLC listed'),
-            ('theoccidentalobserver.net', 'White nationalist publication - SPLC listed'),
-            ('nationalvanguard.org', 'Neo-Nazi organization - SPLC listed'),
-            ('nsm88.org', 'Neo-Nazi organization - SPLC listed'),
-            ('therightstuff.biz', 'Neo-Nazi podcast network - SPLC listed'),
-            ('altright.com', 'White nationalist - SPLC listed'),
-            ('radixjournal.com', 'White nationalist - SPLC listed'),
-            
-            # Anti-Muslim Hate
-            ('jihadwatch.org', 'Anti-Muslim hate site - SPLC listed'),
-            ('barenakedislam.com', 'Anti-Muslim hate site - SPLC listed'),
-            ('atlasshrugs.com', 'Anti-Muslim hate site - SPLC listed'),
-            ('pamelageller.com', 'Anti-Muslim hate - SPLC listed'),
-            ('thereligionofpeace.com', 'Anti-Muslim hate site - SPLC listed'),
-            ('gatesofvienna.net', 'Anti-Muslim hate site - SPLC listed'),
-            
-            # Conspiracy/Extremist
-            ('infowars.com', 'Conspiracy theories, extremist content - SPLC listed'),
-            ('prisonplanet.com', 'Conspiracy theories - SPLC listed'),
-            ('naturalnews.com', 'Dangerous health misinformation - SPLC listed'),
-            ('beforeitsnews.com', 'Conspiracy theories - SPLC listed'),
-            ('veteranstoday.com', 'Conspiracy theories, antisemitism - SPLC listed'),
-            
-            # Add more from SPLC Hate Map research
-        ]
-        
-        for domain, reason in known_groups:
-            self.hate_domains.add((domain, reason))
+        self.hate_domains.update(_KNOWN_HATE_GROUPS)
         
-        logger.info(f"Added {len(known_groups)} known hate groups")
+        logger.info(f"Added {len(_KNOWN_HATE_GROUPS)} known hate groups")
     
     def update_database(self):
-        """Update org_blocklist table with scraped domains"""
-        cursor = self.db_conn.cursor()
-        
-        updated = 0
-        
+        """
+        Update org_blocklist table with scraped domains
+        Streams rows into a temp table with COPY, then merges in one statement.
+        Runs as one transaction: committed on success, rolled back on error
+        """
+        rows = {}
         for item in self.hate_domains:
             if isinstance(item, tuple):
                 domain, reason = item
@@ -179,29 +243,95 @@ class SPLCScraper:
                 domain = item
                 reason = "SPLC Hate Map - Automated scrape"
             
-            try:
-                cursor.execute("""
-                    INSERT INTO org_blocklist (
-                        domain, splc_flagged, reason, flagged_date, verification_source
-                    ) VALUES (%s, TRUE, %s, %s, %s)
-                    ON CONFLICT (domain) 
-                    DO UPDATE SET 
-                        splc_flagged = TRUE,
-                        reason = EXCLUDED.reason,
-                        flagged_date = EXCLUDED.flagged_date
-                """, (domain, reason, date.today(), 'SPLC Automated Scraper'))
+            # Known groups win over bare scraped domains (ON CONFLICT can't
+            # touch the same row twice in one statement)
+            if domain not in rows or isinstance(item, tuple):
+                rows[domain] = reason
+        
+        updated = 0
+        
+        try:
+            with self.db_conn, self.db_conn.cursor() as cursor:
+                # Only write rows that are new or changed since the last run
+                existing = self._fetch_existing(cursor, list(rows))
+                total = len(rows)
+                rows = {
+                    domain: reason for domain, reason in rows.items()
+                    if existing.get(domain) != reason
+                }
                 
-                updated += 1
-                logger.info(f"✅ Updated: {domain}")
+                if total - len(rows):
+                    logger.info(f"Skipping {total - len(rows)} unchanged domains")
                 
-            except Exception as e:
-                logger.error(f"❌ Error updating {domain}: {e}")
+                if rows:
+                    updated = self._merge_rows(cursor, rows)
+                
+        except Exception as e:
+            logger.error(f"❌ Error updating SPLC blocklist: {e}")
+            raise
         
-        self.db_conn.commit()
-        cursor.close()
+        if logger.isEnabledFor(logging.DEBUG):
+            for domain in rows:
+                logger.debug(f"✅ Updated: {domain}")
         
         logger.info(f"Updated {updated} domains in database")
         return updated
+    
+    def _merge_rows(self, cursor, rows):
+        """
+        COPY {domain: reason} rows into a staging table and upsert them
+        into org_blocklist
+        Returns: number of rows written
+        """
+        buf = io.StringIO()
+        for domain, reason in rows.items():
+            buf.write(f"{_copy_escape(domain)}\t{_copy_escape(reason)}\n")
+        buf.seek(0)
+        
+        cursor.execute("""
+            CREATE TEMP TABLE _splc_stage (domain text, reason text)
+            ON COMMIT DROP
+        """)
+        cursor.copy_expert(
+            "COPY _splc_stage (domain, reason) FROM STDIN WITH (FORMAT text)",
+            buf
+        )
+        cursor.execute("""
+            INSERT INTO org_blocklist (
+                domain, splc_flagged, reason, flagged_date, verification_source
+            )
+            SELECT domain, TRUE, reason, %s, %s
+            FROM _splc_stage
+            ON CONFLICT (domain) 
+            DO UPDATE SET 
+                splc_flagged = TRUE,
+                reason = EXCLUDED.reason,
+                flagged_date = EXCLUDED.flagged_date
+        """, (date.today(), 'SPLC Automated Scraper'))
+        
+        updated = cursor.rowcount
+        
+        # Refresh planner statistics so rescoring lookups use the new rows
+        if updated:
+            cursor.execute("ANALYZE org_blocklist")
+        
+        return updated
+    
+    def _fetch_existing(self, cursor, domains):
+        """
+        Load reasons for domains already flagged by SPLC in one query
+        Returns dict: {domain: reason}
+        """
+        if not domains:
+            return {}
+        
+        cursor.execute("""
+            SELECT domain, reason
+            FROM org_blocklist
+            WHERE splc_flagged AND domain = ANY(%s)
+        """, (domains,))
+        
+        return dict(cursor.fetchall())
 
 
 def main():
@@ -8,11 +8,13 @@ import os
 import sys
 import logging
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
 import psycopg2
 
 # Import our scrapers
 from auto_update_splc import SPLCScraper
 from auto_update_bcorp import BCorpScraper
+from composite_scorer import scoring_algo_version
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,6 +22,63 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bumped by triggers whenever theme keywords change; CompositeScorer polls it
+# to know when to reload its keyword matchers
+KEYWORD_VERSION_SQL = """
+    CREATE SEQUENCE IF NOT EXISTS theme_keywords_version;
+    
+    CREATE OR REPLACE FUNCTION bump_theme_keywords_version() RETURNS trigger AS $$
+    BEGIN
+        PERFORM nextval('theme_keywords_version');
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+    
+    -- Triggers are only created when missing: CREATE/DROP TRIGGER lock the
+    -- tables against the scorers reading them
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger
+            WHERE tgname = 'theme_keywords_version_bump'
+              AND tgrelid = 'theme_keywords'::regclass
+        ) THEN
+            CREATE TRIGGER theme_keywords_version_bump
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON theme_keywords
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_theme_keywords_version();
+        END IF;
+        
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger
+            WHERE tgname = 'islamic_themes_version_bump'
+              AND tgrelid = 'islamic_themes'::regclass
+        ) THEN
+            CREATE TRIGGER islamic_themes_version_bump
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON islamic_themes
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_theme_keywords_version();
+        END IF;
+    END
+    $$;
+"""
+
+# Content-derived component scores keyed on (content hash, algorithm version);
+# CompositeScorer reads and fills it so unchanged pages skip recompute
+SCORING_CACHE_SQL = """
+    CREATE TABLE IF NOT EXISTS scoring_cache (
+        content_sha BYTEA NOT NULL,
+        algo_version TEXT NOT NULL,
+        components_json JSONB NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (content_sha, algo_version)
+    )
+"""
+
+# (index name, table, column) created by ensure_indexes
+INDEXES = (
+    ('pages_domain_idx', 'pages', 'domain'),
+    ('links_target_url_idx', 'links', 'target_url'),
+)
+
 
 class AutomatedUpdater:
     """Run all automated data updates"""
@@ -31,14 +90,19 @@ class AutomatedUpdater:
             'bcorp': {'success': False, 'count': 0, 'error': None},
         }
     
-    def update_blocklists(self):
-        """Update all blocklist sources"""
+    def update_blocklists(self, db_conn=None):
+        """
+        Update all blocklist sources
+        
+        Args:
+            db_conn: Connection to use instead of self.db_conn (one per thread)
+        """
         logger.info("🛡️  Updating blocklists...")
         
         # SPLC
         try:
             logger.info("Running SPLC scraper...")
-            scraper = SPLCScraper(self.db_conn)
+            scraper = SPLCScraper(db_conn or self.db_conn)
             scraper.add_known_hate_groups()
             
             try:
@@ -53,14 +117,19 @@ class AutomatedUpdater:
             logger.error(f"SPLC update failed: {e}")
             self.results['splc'] = {'success': False, 'count': 0, 'error': str(e)}
     
-    def update_equity_domains(self):
-        """Update all equity domain sources"""
+    def update_equity_domains(self, db_conn=None):
+        """
+        Update all equity domain sources
+        
+        Args:
+            db_conn: Connection to use instead of self.db_conn (one per thread)
+        """
         logger.info("✊ Updating equity domains...")
         
         # B-Corp
         try:
             logger.info("Running B-Corp scraper...")
-            scraper = BCorpScraper(self.db_conn)
+            scraper = BCorpScraper(db_conn or self.db_conn)
             scraper.scrape_directory()
             count = scraper.update_database()
             self.results['bcorp'] = {'success': True, 'count': count, 'error': None}
@@ -69,6 +138,98 @@ class AutomatedUpdater:
             logger.error(f"B-Corp update failed: {e}")
             self.results['bcorp'] = {'success': False, 'count': 0, 'error': str(e)}
     
+    def run_updates_concurrently(self, splc_conn, bcorp_conn):
+        """
+        Run blocklist and equity updates in parallel
+        They hit different sites and tables, so wall time is the slower of
+        the two. Each gets its own connection (psycopg2 connections must not
+        be shared across concurrent threads).
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.update_blocklists, splc_conn),
+                executor.submit(self.update_equity_domains, bcorp_conn),
+            ]
+            wait(futures)
+        
+        # Surface anything the update methods didn't already catch
+        for future in futures:
+            future.result()
+    
+    def ensure_indexes(self):
+        """
+        Make sure pages.domain and links.target_url are indexed so the
+        affected-page counts and the scorer's per-page lookups are index
+        lookups instead of sequential scans
+        (org_blocklist/equity_domains are keyed on domain already)
+        """
+        previous_autocommit = self.db_conn.autocommit
+        
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction
+        self.db_conn.commit()
+        self.db_conn.autocommit = True
+        cursor = self.db_conn.cursor()
+        try:
+            for index_name, table, column in INDEXES:
+                try:
+                    cursor.execute(f"""
+                        CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name}
+                        ON {table} ({column})
+                    """)
+                except Exception as e:
+                    logger.warning(f"Could not create {index_name}: {e}")
+        finally:
+            cursor.close()
+            self.db_conn.autocommit = previous_autocommit
+    
+    def ensure_keyword_versioning(self):
+        """
+        Install the theme_keywords_version sequence and the triggers that
+        bump it, so running scorers reload keywords without a restart
+        """
+        cursor = self.db_conn.cursor()
+        try:
+            cursor.execute(KEYWORD_VERSION_SQL)
+            self.db_conn.commit()
+        except Exception as e:
+            self.db_conn.rollback()
+            logger.warning(f"Could not install keyword version triggers: {e}")
+        finally:
+            cursor.close()
+    
+    def ensure_scoring_cache(self):
+        """Create the scoring_cache table used by CompositeScorer"""
+        cursor = self.db_conn.cursor()
+        try:
+            cursor.execute(SCORING_CACHE_SQL)
+            self.db_conn.commit()
+        except Exception as e:
+            self.db_conn.rollback()
+            logger.warning(f"Could not create scoring_cache table: {e}")
+        finally:
+            cursor.close()
+    
+    def prune_scoring_cache(self):
+        """
+        Delete scoring_cache rows computed under an older algorithm or theme
+        keyword version; scorers never read them again
+        """
+        cursor = self.db_conn.cursor()
+        try:
+            cursor.execute("SELECT last_value, is_called FROM theme_keywords_version")
+            current_version = scoring_algo_version(cursor.fetchone())
+            cursor.execute(
+                "DELETE FROM scoring_cache WHERE algo_version <> %s", (current_version,)
+            )
+            deleted = cursor.rowcount
+            self.db_conn.commit()
+            logger.info(f"Pruned {deleted} stale scoring_cache rows (current version {current_version})")
+        except Exception as e:
+            self.db_conn.rollback()
+            logger.warning(f"Could not prune scoring_cache: {e}")
+        finally:
+            cursor.close()
+    
     def rescore_affected_pages(self):
         """
         Rescore pages that might be affected by updates
@@ -78,28 +239,21 @@ class AutomatedUpdater:
         
         cursor = self.db_conn.cursor()
         
-        # Count pages from updated domains
-        cursor.execute("""
-            SELECT COUNT(*) 
-            FROM pages p
-            WHERE EXISTS (
-                SELECT 1 FROM org_blocklist ob 
-                WHERE p.domain = ob.domain
-            )
-        """)
-        
-        blocklisted_pages = cursor.fetchone()[0]
-        
+        # Count pages from updated domains (both counts in one pass over pages)
         cursor.execute("""
-            SELECT COUNT(*) 
+            SELECT
+                COUNT(*) FILTER (WHERE EXISTS (
+                    SELECT 1 FROM org_blocklist ob 
+                    WHERE p.domain = ob.domain
+                )),
+                COUNT(*) FILTER (WHERE EXISTS (
+                    SELECT 1 FROM equity_domains ed 
+                    WHERE p.domain = ed.domain
+                ))
             FROM pages p
-            WHERE EXISTS (
-                SELECT 1 FROM equity_domains ed 
-                WHERE p.domain = ed.domain
-            )
         """)
         
-        equity_pages = cursor.fetchone()[0]
+        blocklisted_pages, equity_pages = cursor.fetchone()
         
         cursor.close()
         
@@ -164,6 +318,8 @@ def main():
     
     try:
         conn = psycopg2.connect(database_url)
+        # Second connection so the B-Corp update can run alongside SPLC
+        bcorp_conn = psycopg2.connect(database_url)
         logger.info("✅ Connected to database")
     except Exception as e:
         logger.error(f"❌ Database connection failed: {e}")
@@ -173,13 +329,14 @@ def main():
     updater = AutomatedUpdater(conn)
     
     try:
-        # Update blocklists
-        updater.update_blocklists()
-        
-        # Update equity domains
-        updater.update_equity_domains()
+        # Update blocklists and equity domains in parallel
+        updater.run_updates_concurrently(conn, bcorp_conn)
         
         # Check for pages needing rescoring
+        updater.ensure_indexes()
+        updater.ensure_keyword_versioning()
+        updater.ensure_scoring_cache()
+        updater.prune_scoring_cache()
         updater.rescore_affected_pages()
         
         # Send notification
@@ -193,6 +350,7 @@ def main():
         raise
     
     finally:
+        bcorp_conn.close()
         conn.close()
         logger.info("Database connection closed")
     
@@ -4,7 +4,79 @@ Filters harmful content before crawling
 """
 
 from urllib.parse import urlparse
+from functools import lru_cache
 import re
+import logging
+
+# Optional dependencies (graceful degradation)
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+logger = logging.getLogger(__name__)
+
+# Max distinct domains remembered by Tier1Blocklist._check_domain
+DOMAIN_CACHE_SIZE = 50_000
+URL_CACHE_SIZE = 65_536
+
+# Prefilter tokenization: URLs are reduced to their alphanumeric runs
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# Patterns the prefilter can reason about: slash-delimited literals with no
+# regex syntax (e.g. /casino/ or /adult/content/); any other pattern turns
+# the prefilter off
+_LITERAL_PATTERN_RE = re.compile(r'/[a-z0-9_-]+(?:/[a-z0-9_-]+)*/')
+
+# Domain-level blocks (exact matches)
+_BLOCKED_DOMAINS = frozenset({
+    # Adult content
+    'pornhub.com', 'xvideos.com', 'xnxx.com', 'redtube.com', 'youporn.com',
+    'tube8.com', 'spankbang.com', 'xhamster.com', 'eporner.com', 'motherless.com',
+    'livejasmin.com', 'chaturbate.com', 'cam4.com', 'stripchat.com', 'camsoda.com',
+    
+    # Gambling
+    'bet365.com', 'pokerstars.com', 'bwin.com', 'draftkings.com', 'fanduel.com',
+    'betfair.com', 'casino.com', 'bovada.lv', '888casino.com', 'williamhill.com',
+    'paddypower.com', 'betway.com', 'unibet.com', 'betonline.ag',
+    
+    # Alcohol/drug promotion
+    'totalwine.com', 'wine.com', 'drizly.com', 'reservebar.com',
+    'leafly.com', 'weedmaps.com', 'eaze.com',
+    
+    # Payday loans & predatory lending
+    'cashnetusa.com', 'checkintocash.com', 'cashadvance.com', 'speedycash.com',
+    'moneylion.com', 'advanceamerica.net', 'titlemax.com', 'checkngo.com',
+    
+    # Known MLM/pyramid schemes
+    'amway.com', 'herbalife.com', 'monat.com', 'lularoe.com', 'itworks.com',
+    'younique.com', 'avon.com', 'marykay.com', 'arbonne.com', 'beachbody.com',
+    'rodan-fields.com', 'pampered-chef.com', 'usana.com', 'isagenix.com',
+    
+    # Hate groups (SPLC-flagged examples)
+    'stormfront.org', 'dailystormer.name', 'vdare.com', 'americanrenaissance.com',
+    'counter-currents.com', 'theoccidentalobserver.net', 'unz.com',
+    
+    # Misinformation & conspiracy
+    'infowars.com', 'prisonplanet.com', 'naturalnews.com', 'beforeitsnews.com',
+    'veteranstoday.com', 'rense.com', 'davidicke.com', 'thetruthseeker.co.uk',
+    'conspiracyplanet.com', 'rumormillnews.com', 'qmap.pub', 'qanon.pub',
+    'thegatewaypundit.com', 'tfrlive.com', 'theepochtimes.com',
+    
+    # Antivax & dangerous pseudoscience
+    'naturalnews.com', 'mercola.com', 'greenmedinfo.com', 'tenpenny.com',
+    'learntherisk.org', 'childrenshealthdefense.org', 'nvic.org',
+    
+    # Content farms & spam
+    'ehow.com', 'answers.com', 'ask.com', 'answerbag.com', 'chacha.com',
+    'mahalo.com', 'wikihow.com', 'buzzle.com', 'listverse.com',
+})
 
 
 class Tier1Blocklist:
@@ -14,55 +86,16 @@ class Tier1Blocklist:
     """
     
     def __init__(self):
-        # Domain-level blocks (exact matches)
-        self.blocked_domains = {
-            # Adult content
-            'pornhub.com', 'xvideos.com', 'xnxx.com', 'redtube.com', 'youporn.com',
-            'tube8.com', 'spankbang.com', 'xhamster.com', 'eporner.com', 'motherless.com',
-            'livejasmin.com', 'chaturbate.com', 'cam4.com', 'stripchat.com', 'camsoda.com',
-            
-            # Gambling
-            'bet365.com', 'pokerstars.com', 'bwin.com', 'draftkings.com', 'fanduel.com',
-            'betfair.com', 'casino.com', 'bovada.lv', '888casino.com', 'williamhill.com',
-            'paddypower.com', 'betway.com', 'unibet.com', 'betonline.ag',
-            
-            # Alcohol/drug promotion
-            'totalwine.com', 'wine.com', 'drizly.com', 'reservebar.com',
-            'leafly.com', 'weedmaps.com', 'eaze.com',
-            
-            # Payday loans & predatory lending
-            'cashnetusa.com', 'checkintocash.com', 'cashadvance.com', 'speedycash.com',
-            'moneylion.com', 'advanceamerica.net', 'titlemax.com', 'checkngo.com',
-            
-            # Known MLM/pyramid schemes
-            'amway.com', 'herbalife.com', 'monat.com', 'lularoe.com', 'itworks.com',
-            'younique.com', 'avon.com', 'marykay.com', 'arbonne.com', 'beachbody.com',
-            'rodan-fields.com', 'pampered-chef.com', 'usana.com', 'isagenix.com',
-            
-            # Hate groups (SPLC-flagged examples)
-            'stormfront.org', 'dailystormer.name', 'vdare.com', 'americanrenaissance.com',
-            'counter-currents.com', 'theoccidentalobserver.net', 'unz.com',
-            
-            # Misinformation & conspiracy
-            'infowars.com', 'prisonplanet.com', 'naturalnews.com', 'beforeitsnews.com',
-            'veteranstoday.com', 'rense.com', 'davidicke.com', 'thetruthseeker.co.uk',
-            'conspiracyplanet.com', 'rumormillnews.com', 'qmap.pub', 'qanon.pub',
-            'thegatewaypundit.com', 'tfrlive.com', 'theepochtimes.com',
-            
-            # Antivax & dangerous pseudoscience
-            'naturalnews.com', 'mercola.com', 'greenmedinfo.com', 'tenpenny.com',
-            'learntherisk.org', 'childrenshealthdefense.org', 'nvic.org',
-            
-            # Content farms & spam
-            'ehow.com', 'answers.com', 'ask.com', 'answerbag.com', 'chacha.com',
-            'mahalo.com', 'wikihow.com', 'buzzle.com', 'listverse.com',
-        }
+        # Domain-level blocks (exact matches) - a mutable copy, since
+        # add_domain/remove_domain edit it at runtime
+        self.blocked_domains = set(_BLOCKED_DOMAINS)
         
         # Blocked TLDs
         self.blocked_tlds = {
             '.xxx', '.adult', '.porn', '.sex', '.sexy', '.casino', '.bet',
             '.poker', '.loan', '.loans', '.date', '.download', '.click'
         }
+        self._blocked_tlds_tuple = tuple(self.blocked_tlds)
         
         # URL path/keyword patterns (regex)
         self.blocked_patterns = [
@@ -120,38 +153,47 @@ class Tier1Blocklist:
         # Compile regex patterns for efficiency
         self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.blocked_patterns]
         
+        # All patterns as one alternation so each URL is scanned once
+        self._compile_pattern_union()
+        
+        # Crawls revisit the same domains constantly - cache domain verdicts
+        # (cleared whenever blocked_domains changes)
+        self._check_domain = lru_cache(maxsize=DOMAIN_CACHE_SIZE)(self._check_domain_uncached)
+        
+        # Links on a page repeat heavily (nav, footers) - cache whole-URL
+        # verdicts too (cleared with the domain cache)
+        self._check_url = lru_cache(maxsize=URL_CACHE_SIZE)(self._check_url_uncached)
+        
+        # Token prefilter for the common not-blocked case
+        self._build_prefilter()
+        
     def is_blocked(self, url):
         """
         Check if URL should be blocked
         Returns: (is_blocked: bool, reason: str)
         """
+        return self._check_url(url)
+    
+    def _check_url_uncached(self, url):
+        """is_blocked without the per-URL cache"""
         try:
-            parsed = urlparse(url.lower())
-            domain = parsed.netloc
-            
-            # Remove www. prefix for checking
-            if domain.startswith('www.'):
-                domain = domain[4:]
+            full_url = url.lower()
             
-            # Check exact domain match
-            if domain in self.blocked_domains:
-                return True, f"Blocked domain: {domain}"
+            # Most URLs share no token with anything blocked - skip parsing
+            if self._prefilter_rules_out(full_url):
+                return False, None
             
-            # Check if it's a subdomain of a blocked domain
-            for blocked in self.blocked_domains:
-                if domain.endswith('.' + blocked) or domain == blocked:
-                    return True, f"Blocked domain: {blocked}"
+            domain = self._domain_of(full_url)
             
-            # Check TLD
-            for tld in self.blocked_tlds:
-                if domain.endswith(tld):
-                    return True, f"Blocked TLD: {tld}"
+            # Domain/TLD checks (cached per domain)
+            reason = self._check_domain(domain)
+            if reason:
+                return True, reason
             
             # Check URL path patterns
-            full_url = url.lower()
-            for pattern in self.compiled_patterns:
-                if pattern.search(full_url):
-                    return True, f"Blocked pattern: {pattern.pattern}"
+            reason = self._check_url_patterns(full_url)
+            if reason:
+                return True, reason
             
             return False, None
             
@@ -159,18 +201,211 @@ class Tier1Blocklist:
             # If we can't parse the URL, block it to be safe
             return True, f"Invalid URL format: {str(e)}"
     
+    def is_blocked_batch(self, urls, with_reasons=False):
+        """
+        Check many URLs at once
+        Lowercasing, domain extraction and pattern matching run as vectorized
+        pandas string operations; domain/TLD verdicts are computed once per
+        distinct domain. URLs the vectorized domain extraction can't read
+        the way is_blocked does (no scheme://host, IPv6 or malformed hosts,
+        characters urlparse strips, non-ASCII) are checked with is_blocked,
+        as is every URL without pandas, so verdicts always match is_blocked.
+        
+        Args:
+            with_reasons: return is_blocked's (is_blocked, reason) tuples
+                instead; reasons are only looked up for blocked URLs
+        
+        Returns: list of bools (is_blocked), one per URL (tuples with
+            with_reasons)
+        """
+        urls = list(urls)
+        if not HAS_PANDAS:
+            if with_reasons:
+                return [self.is_blocked(url) for url in urls]
+            return [self.is_blocked(url)[0] for url in urls]
+        
+        full_urls = pd.Series(urls, dtype=object).str.lower()
+        domains = full_urls.str.extract(
+            r'^[a-z][a-z0-9+.-]*://(?:www\.)?([^/?#]*)', expand=False
+        ).fillna('')
+        irregular = (domains == '') | full_urls.str.contains(
+            r'[\[\t\r\n\x80-\U0010ffff]|^[\x00-\x20]', regex=True, na=True
+        )
+        
+        domain_verdicts = {
+            domain: self._check_domain(domain) is not None
+            for domain in domains.unique()
+        }
+        blocked = domains.map(domain_verdicts)
+        
+        if self.blocked_patterns:
+            blocked |= full_urls.str.contains(
+                self._pattern_alternation, regex=True, case=False, na=False
+            )
+        
+        blocked = blocked.tolist()
+        for index in irregular[irregular].index:
+            blocked[index] = self.is_blocked(urls[index])[0]
+        
+        if with_reasons:
+            return [self.is_blocked(url) if is_blocked else (False, None)
+                    for url, is_blocked in zip(urls, blocked)]
+        return blocked
+    
+    def _domain_of(self, full_url):
+        """Extract the domain (without www.) from a lowercased URL"""
+        return urlparse(full_url).netloc.removeprefix('www.')
+    
+    def _build_prefilter(self):
+        """
+        Collect the alphanumeric tokens a URL must contain to possibly be
+        blocked: one label token per blocked domain and TLD, and the tokens
+        of each literal path pattern. A URL sharing none of them can't match.
+        """
+        tokens = set()
+        self._prefilter_enabled = True
+        
+        for domain in list(self.blocked_domains) + list(self.blocked_tlds):
+            first = _TOKEN_RE.search(domain)
+            if first:
+                tokens.add(first.group())
+        
+        for pattern in self.blocked_patterns:
+            # Only slash-delimited literals (e.g. /casino/) are guaranteed
+            # to surface as whole tokens in a matching URL
+            if not _LITERAL_PATTERN_RE.fullmatch(pattern.lower()):
+                self._prefilter_enabled = False
+                break
+            tokens.update(_TOKEN_RE.findall(pattern.lower()))
+        
+        self._prefilter_tokens = frozenset(tokens)
+    
+    def _prefilter_rules_out(self, full_url):
+        """True if the lowercased URL definitely isn't blocked"""
+        if not self._prefilter_enabled or '[' in full_url or not full_url.isascii():
+            # '[' and non-ASCII - let urlparse validate IPv6 hosts and reject
+            # malformed netlocs (e.g. NFKC-unsafe characters); fail closed
+            return False
+        return self._prefilter_tokens.isdisjoint(_TOKEN_RE.findall(full_url))
+    
+    def _check_domain_uncached(self, domain):
+        """
+        Check a normalized domain against blocked domains and TLDs
+        Returns: block reason, or None if allowed
+        """
+        # Check the domain and each parent domain (exact match or subdomain
+        # of a blocked domain) with one set lookup per label
+        parts = domain.split('.')
+        for i in range(len(parts)):
+            candidate = '.'.join(parts[i:])
+            if candidate in self.blocked_domains:
+                return f"Blocked domain: {candidate}"
+        
+        # Check TLD (one C-level endswith call over all TLDs)
+        if domain.endswith(self._blocked_tlds_tuple):
+            tld = next(tld for tld in self._blocked_tlds_tuple if domain.endswith(tld))
+            return f"Blocked TLD: {tld}"
+        
+        return None
+    
+    def _check_url_patterns(self, full_url):
+        """
+        Check a lowercased URL against blocked path patterns
+        Returns: block reason, or None if allowed
+        """
+        pattern_id = self._match_pattern(full_url)
+        if pattern_id is not None:
+            return f"Blocked pattern: {self.blocked_patterns[pattern_id]}"
+        return None
+    
     def add_domain(self, domain):
         """Add a domain to the blocklist"""
         domain = domain.lower().strip()
         if domain.startswith('www.'):
             domain = domain[4:]
         self.blocked_domains.add(domain)
+        self._check_domain.cache_clear()
+        self._check_url.cache_clear()
+        self._build_prefilter()
+    
+    def _compile_pattern_union(self):
+        """
+        Build a single regex with one named group per blocked pattern,
+        plus a Hyperscan database over the same patterns when available
+        """
+        self._pattern_union = re.compile(
+            '|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(self.blocked_patterns)),
+            re.IGNORECASE
+        )
+        
+        # Same alternation without capture groups, for pandas str.contains
+        self._pattern_alternation = '|'.join(f'(?:{pattern})' for pattern in self.blocked_patterns)
+        
+        self._hs_db = None
+        self._hs_scratch = None
+        if HAS_HYPERSCAN and self.blocked_patterns:
+            try:
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[pattern.encode() for pattern in self.blocked_patterns],
+                    ids=list(range(len(self.blocked_patterns))),
+                    elements=len(self.blocked_patterns),
+                    flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH]
+                          * len(self.blocked_patterns)
+                )
+                self._hs_db = db
+                self._hs_scratch = hyperscan.Scratch(db)
+            except Exception as e:
+                # Pattern not supported by Hyperscan - use the regex union
+                logger.warning(f"Hyperscan compile failed, using regex matching: {e}")
+    
+    def _match_pattern(self, full_url):
+        """
+        Scan URL against all blocked patterns in one pass
+        Returns: index into blocked_patterns of the first match, or None
+        """
+        if self._hs_db is not None:
+            matched = []
+            
+            def on_match(pattern_id, start, end, flags, context):
+                matched.append(pattern_id)
+                return True  # Stop at first match
+            
+            try:
+                self._hs_db.scan(
+                    full_url.encode(),
+                    match_event_handler=on_match,
+                    scratch=self._hs_scratch
+                )
+            except hyperscan.ScanTerminated:
+                pass
+            
+            return matched[0] if matched else None
+        
+        match = self._pattern_union.search(full_url) if self.blocked_patterns else None
+        if match:
+            return int(match.lastgroup[1:])
+        return None
     
     def add_pattern(self, pattern):
         """Add a URL pattern to the blocklist"""
         compiled = re.compile(pattern, re.IGNORECASE)
         self.compiled_patterns.append(compiled)
         self.blocked_patterns.append(pattern)
+        self._compile_pattern_union()
+        self._check_url.cache_clear()
+        self._build_prefilter()
+    
+    def remove_pattern(self, pattern):
+        """Remove a URL pattern from the blocklist"""
+        if pattern not in self.blocked_patterns:
+            return
+        index = self.blocked_patterns.index(pattern)
+        del self.blocked_patterns[index]
+        del self.compiled_patterns[index]
+        self._compile_pattern_union()
+        self._check_url.cache_clear()
+        self._build_prefilter()
     
     def remove_domain(self, domain):
         """Remove a domain from the blocklist"""
@@ -178,6 +413,9 @@ class Tier1Blocklist:
         if domain.startswith('www.'):
             domain = domain[4:]
         self.blocked_domains.discard(domain)
+        self._check_domain.cache_clear()
+        self._check_url.cache_clear()
+        self._build_prefilter()
     
     def get_stats(self):
         """Get blocklist statistics"""
@@ -17,12 +17,24 @@ Final Score: 0-100 (determines indexing and ranking)
 Override: SPLC/ACLU/CAIR flagged = instant 0 (never index)
 """
 
+import os
 import re
+import time
+import shelve
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 from urllib.parse import urlparse
-from collections import defaultdict
-import json
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+
+import blake3
+from cachetools import LRUCache, TTLCache
+import psycopg2
+from psycopg2.extras import Json, execute_values
 
 # Optional dependencies (graceful degradation)
 try:
@@ -32,8 +44,353 @@ except ImportError:
     HAS_TEXTSTAT = False
     logging.warning("textstat not available, using simplified readability scoring")
 
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+    logging.warning("pyahocorasick not available, using regex alternation for keyword matching")
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import numpy as np
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
+# Pages per score_batch call when rescoring the whole table, and page IDs
+# per round-trip from the streaming ID cursor
+RESCORE_BATCH_SIZE = 500
+RESCORE_ID_FETCH_SIZE = 10_000
+
+# Composite weights: islamic alignment (normalized), quality, authority,
+# media literacy, equity boost
+COMPOSITE_WEIGHTS = (0.30, 0.25, 0.20, 0.15, 0.10)
+INDEXABLE_MIN_SCORE = 25
+
+# Rows per round-trip when streaming theme keywords at startup
+KEYWORD_FETCH_SIZE = 10_000
+
+# Rows per multi-row statement when saving scores
+SAVE_PAGE_SIZE = 500
+
+UPDATE_PAGE_SCORES_SQL = """
+    UPDATE pages
+    SET islamic_alignment_score = v.islamic_alignment_score,
+        quality_score = v.quality_score,
+        authority_score = v.authority_score,
+        media_literacy_score = v.media_literacy_score,
+        equity_boost = v.equity_boost,
+        final_composite_score = v.final_composite_score,
+        indexable = v.indexable,
+        scored_at = v.scored_at
+    FROM (VALUES %s) AS v(
+        id, islamic_alignment_score, quality_score, authority_score,
+        media_literacy_score, equity_boost, final_composite_score,
+        indexable, scored_at
+    )
+    WHERE pages.id = v.id
+"""
+
+INSERT_SCORING_LOG_SQL = """
+    INSERT INTO page_scoring_logs (
+        page_id, url,
+        islamic_alignment_score, islamic_themes_matched,
+        quality_score, quality_details,
+        authority_score,
+        equity_boost,
+        media_literacy_score,
+        final_composite_score,
+        indexable,
+        blocklist_reason,
+        scored_at
+    ) VALUES %s
+"""
+
+# Matched keywords kept in the alignment details saved with each page
+TOP_MATCHES_LIMIT = 20
+
+# How often a long-lived scorer checks theme_keywords_version for edits
+KEYWORD_VERSION_CHECK_SECONDS = 60
+
+# Pages at least this long get their text stats from the compiled Numba scan
+# (unique-word counts become approximate, via a fixed-size hash table)
+NUMBA_MIN_CONTENT_LENGTH = 100_000
+_UNIQUE_TABLE_SIZE = 65536
+
+# org_blocklist is preloaded into memory when it has at most this many rows,
+# and reloaded after BLOCKLIST_REFRESH_SECONDS
+BLOCKLIST_PRELOAD_MAX_ROWS = 100_000
+BLOCKLIST_REFRESH_SECONDS = 15 * 60
+
+# Cache bounds; equity/blocklist entries are also persisted to a shelf in
+# SCORER_CACHE_DIR (if set) so restarts start warm
+CACHE_TTL_SECONDS = 7 * 86400
+AUTHORITY_CACHE_SIZE = 100_000
+EQUITY_CACHE_SIZE = 200_000
+BLOCKLIST_CACHE_SIZE = 200_000
+
+# Content-derived components (alignment, content quality, media literacy) are
+# stored in scoring_cache keyed on (content hash, algo version); bump this
+# whenever any of those components' scoring code changes
+SCORING_ALGO_VERSION = 1
+
+# After a scoring_cache error (e.g. the table isn't created yet), pages are
+# scored without the cache for this long before it's tried again
+SCORING_CACHE_RETRY_SECONDS = 300
+
+INSERT_SCORING_CACHE_SQL = """
+    INSERT INTO scoring_cache (content_sha, algo_version, components_json)
+    VALUES %s
+    ON CONFLICT DO NOTHING
+"""
+
+
+def _orjson_dumps(obj):
+    """json.dumps replacement for psycopg2 Json adapters"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+# Encoder for the JSON columns (None = psycopg2's json.dumps default)
+_JSON_DUMPS = _orjson_dumps if HAS_ORJSON else None
+
+
+@contextmanager
+def _savepoint(db_conn, cursor, name):
+    """
+    Run the block inside SAVEPOINT name, so a failing query only undoes its
+    own work, never the caller's open transaction on the shared connection
+    (autocommit connections have no transaction to protect)
+    """
+    if db_conn.autocommit:
+        yield
+        return
+    
+    cursor.execute(f"SAVEPOINT {name}")
+    try:
+        yield
+    except Exception:
+        cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+        raise
+    cursor.execute(f"RELEASE SAVEPOINT {name}")
+
+
+@lru_cache(maxsize=10_000)
+def _domain_netloc(domain):
+    """Host part of a domain or URL, as stored in pages.domain"""
+    return urlparse(domain if '://' in domain else f'https://{domain}').netloc
+
+
+def _content_sha(domain, title, content):
+    """16-byte BLAKE3 key for everything the cached components read"""
+    hasher = blake3.blake3()
+    for part in (domain, title, content):
+        hasher.update((part or '').encode('utf-8', 'surrogatepass'))
+        hasher.update(b'\x00')
+    return hasher.digest()[:16]
+
+
+def scoring_algo_version(keyword_version):
+    """
+    scoring_cache version: SCORING_ALGO_VERSION plus the theme keyword
+    version (theme_keywords_version's (last_value, is_called), or a falsy
+    value if the sequence isn't installed)
+    """
+    if not keyword_version:
+        return str(SCORING_ALGO_VERSION)
+    last_value, is_called = keyword_version
+    return f"{SCORING_ALGO_VERSION}.{last_value}.{int(is_called)}"
+
+
+@lru_cache(maxsize=10_000)
+def _clean_domain(domain):
+    """Lowercased host without www., the key used by equity/blocklist tables"""
+    return _domain_netloc(domain).lower().replace('www.', '')
+
+
+# Substrings that mark content as research/academic (matched anywhere, as
+# plain substrings, in lowercased content)
+_RESEARCH_TERMS_RE = re.compile('|'.join(map(re.escape, [
+    'research', 'study', 'paper', 'journal', 'academic',
+    'university', 'scholar', 'peer-reviewed', 'abstract'
+])))
+
+# Per-page lookups, keyed by prepared statement name (one text parameter each)
+_LOOKUP_QUERIES = {
+    'scorer_link_counts': """
+        SELECT COUNT(DISTINCT l.source_page_id) AS backlink_count,
+               COUNT(DISTINCT CASE WHEN p.domain LIKE '%%.edu' THEN p.domain END) AS edu_refs,
+               COUNT(DISTINCT CASE WHEN p.domain LIKE '%%.gov' THEN p.domain END) AS gov_refs
+        FROM links l
+        LEFT JOIN pages p ON l.source_page_id = p.id
+        WHERE l.target_url = %s
+    """,
+    'scorer_first_seen': """
+        SELECT MIN(crawled_at) as first_seen
+        FROM pages
+        WHERE domain = %s
+    """,
+    'scorer_equity': """
+        SELECT minority_owned, women_owned, veteran_owned, 
+               b_corp, lgbtq_owned, disability_owned
+        FROM equity_domains
+        WHERE domain = %s
+    """,
+    'scorer_blocklist': """
+        SELECT splc_flagged, aclu_flagged, cair_flagged, 
+               adl_flagged, other_org_flagged, reason
+        FROM org_blocklist
+        WHERE domain = %s
+    """,
+}
+
+# Maximal run of word characters (same class as regex \w / _is_word_char)
+_WORD_TOKEN_RE = re.compile(r'\w+')
+
+# One (keyword, theme) association loaded from theme_keywords/islamic_themes
+ThemeInfo = namedtuple('ThemeInfo', ['theme_id', 'principle', 'category', 'weight'])
+
+# Maps ! and ? to . so sentence ends are counted with a single str.count
+_SENTENCE_END_TABLE = str.maketrans({'!': '.', '?': '.'})
+
+_ContentStats = namedtuple(
+    '_ContentStats',
+    ['word_count', 'unique_count', 'unique_lower_count', 'newline_count',
+     'sentence_count', 'has_caps_line']
+)
+
+
+def _content_stats(content):
+    """Word/line statistics shared by the quality sub-scorers, computed once"""
+    lines = content.split('\n')
+    has_caps_line = any(len(line) < 100 and line.isupper() for line in lines)
+    
+    if HAS_NUMBA and len(content) >= NUMBA_MIN_CONTENT_LENGTH:
+        data = np.frombuffer(content.encode('utf-8'), dtype=np.uint8)
+        words, unique, unique_lower, newlines, sentences = _text_stats_kernel(
+            data,
+            np.zeros(_UNIQUE_TABLE_SIZE, dtype=np.int64),
+            np.zeros(_UNIQUE_TABLE_SIZE, dtype=np.int64),
+        )
+        return _ContentStats(words, unique, unique_lower, newlines, sentences, has_caps_line)
+    
+    words = content.split()
+    unique = set(words)
+    return _ContentStats(
+        word_count=len(words),
+        unique_count=len(unique),
+        unique_lower_count=len(set(map(str.lower, unique))),
+        newline_count=len(lines) - 1,
+        sentence_count=content.translate(_SENTENCE_END_TABLE).count('.'),
+        has_caps_line=has_caps_line,
+    )
+
+
+def _insert_hash(table, h):
+    """Add a word hash to an open-addressing table; True if it was new"""
+    mask = table.shape[0] - 1
+    slot = h & mask
+    for _ in range(table.shape[0]):
+        if table[slot] == 0:
+            table[slot] = h + 1  # 0 marks an empty slot
+            return True
+        if table[slot] == h + 1:
+            return False
+        slot = (slot + 1) & mask
+    return False  # Table full, count saturates
+
+
+def _text_stats_kernel(data, table, table_lower):
+    """
+    Single scan over UTF-8 bytes: (words, unique, unique_lower, newlines, sentences)
+    Words are split on ASCII whitespace and hashed with 32-bit FNV-1a;
+    lowercasing folds ASCII letters only
+    """
+    words = unique = unique_lower = newlines = sentences = 0
+    h = h_lower = 0
+    in_word = False
+    
+    for i in range(data.shape[0] + 1):
+        b = data[i] if i < data.shape[0] else 32
+        
+        if b == 10:
+            newlines += 1
+        elif b == 46 or b == 33 or b == 63:  # . ! ?
+            sentences += 1
+        
+        if b == 32 or 9 <= b <= 13 or 28 <= b <= 31:
+            if in_word:
+                words += 1
+                if _insert_hash(table, h):
+                    unique += 1
+                if _insert_hash(table_lower, h_lower):
+                    unique_lower += 1
+                in_word = False
+            continue
+        
+        if not in_word:
+            h = h_lower = 2166136261
+            in_word = True
+        lower = b + 32 if 65 <= b <= 90 else b
+        h = ((h ^ b) * 16777619) & 0xFFFFFFFF
+        h_lower = ((h_lower ^ lower) * 16777619) & 0xFFFFFFFF
+    
+    return words, unique, unique_lower, newlines, sentences
+
+
+if HAS_NUMBA:
+    _insert_hash = njit(cache=True)(_insert_hash)
+    _text_stats_kernel = njit(cache=True)(_text_stats_kernel)
+
+
+def _blocklist_reason(row):
+    """
+    Block reason for an org_blocklist row
+    (splc, aclu, cair, adl, other, reason), or None if nothing is flagged
+    """
+    splc, aclu, cair, adl, other, reason = row
+    
+    if not any([splc, aclu, cair, adl, other]):
+        return None
+    
+    flags = []
+    if splc: flags.append('SPLC')
+    if aclu: flags.append('ACLU')
+    if cair: flags.append('CAIR')
+    if adl: flags.append('ADL')
+    if other: flags.append('Other')
+    
+    block_reason = f"Flagged by: {', '.join(flags)}"
+    if reason:
+        block_reason += f" - {reason}"
+    return block_reason
+
+
+def _is_word_char(char):
+    """Word character as defined by the re module's \\w"""
+    return char.isalnum() or char == '_'
+
+
+def _is_word_boundary(text, index):
+    """Same test as regex \\b at position index of text"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
 
 class CompositeScorer:
     """
@@ -52,9 +409,36 @@ class CompositeScorer:
         
         # Caches for performance
         self._keyword_cache = None
-        self._domain_authority_cache = {}
-        self._equity_cache = {}
-        self._blocklist_cache = {}
+        self._keyword_version = None
+        self._keyword_version_checked_at = None
+        self._keyword_automaton = None
+        self._single_word_keywords = frozenset()
+        self._keyword_regex = None
+        self._keyword_prefixes = {}
+        self._hs_db = None
+        self._hs_scratch = None
+        self._hs_keywords = []
+        self._hs_last_scan = (None, None)
+        self._domain_authority_cache = TTLCache(maxsize=AUTHORITY_CACHE_SIZE, ttl=CACHE_TTL_SECONDS)
+        self._equity_cache = LRUCache(maxsize=EQUITY_CACHE_SIZE)
+        self._blocklist_cache = LRUCache(maxsize=BLOCKLIST_CACHE_SIZE)
+        self._shelf = self._open_shelf(os.getenv('SCORER_CACHE_DIR'))
+        self._prepared = self._prepare_lookups()
+        
+        # org_blocklist held in memory (see reload_blocklist)
+        self._blocklist_map = None
+        self._blocklist_loaded_at = None
+        self.reload_blocklist()
+        
+        # Per-batch lookups filled by score_batch (see _prefetch_batch)
+        self._link_counts_prefetch = {}
+        self._first_seen_prefetch = {}
+        
+        # scoring_cache rows by content hash for the current batch, None for
+        # known misses (see _content_components)
+        self._scoring_cache_retry_at = None  # set after an error, see _scoring_cache_usable
+        self._components_prefetch = {}
+        self._media_prefetch = {}
         
         # Category weights for Islamic alignment
         self.category_weights = {
@@ -76,9 +460,111 @@ class CompositeScorer:
             r'\bbitch\s+magazine\b',  # Feminist publication, not profanity
             r'\bthe\s+intercept\b',   # News outlet
         ]
+        self._false_positive_re = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.false_positive_patterns)
+        )
         
         logger.info("CompositeScorer initialized")
     
+    # ========================================================================
+    # PREPARED LOOKUPS
+    # ========================================================================
+    
+    def _prepare_lookups(self):
+        """
+        PREPARE the per-page lookup queries once per connection so PostgreSQL
+        doesn't re-plan them for every page. Returns False (inline SQL is used
+        instead) if preparing fails.
+        
+        A transaction the caller already has open is left open (the work runs
+        in a savepoint); only a transaction started here is ended.
+        """
+        started_idle = (self.db_conn.get_transaction_status()
+                        == psycopg2.extensions.TRANSACTION_STATUS_IDLE)
+        cursor = self.db_conn.cursor()
+        try:
+            with _savepoint(self.db_conn, cursor, 'scorer_prepare'):
+                cursor.execute(
+                    "SELECT name FROM pg_prepared_statements WHERE name = ANY(%s)",
+                    (list(_LOOKUP_QUERIES),)
+                )
+                existing = {row[0] for row in cursor.fetchall()}
+                
+                for name, sql in _LOOKUP_QUERIES.items():
+                    if name not in existing:
+                        # No parameters are passed here, so undo the %% escaping
+                        cursor.execute(
+                            f"PREPARE {name} (text) AS "
+                            + sql.replace('%s', '$1').replace('%%', '%')
+                        )
+            
+            # Prepared statements outlive the transaction; end the one this
+            # call opened so the connection is handed back idle
+            if started_idle:
+                self.db_conn.commit()
+            return True
+            
+        except Exception as e:
+            if started_idle:
+                self.db_conn.rollback()
+            logger.warning(f"Could not prepare scorer lookups, using inline SQL: {e}")
+            return False
+        finally:
+            cursor.close()
+    
+    def _execute_lookup(self, cursor, name, value):
+        """Run one of _LOOKUP_QUERIES for a single value"""
+        if self._prepared:
+            cursor.execute(f"EXECUTE {name} (%s)", (value,))
+        else:
+            cursor.execute(_LOOKUP_QUERIES[name], (value,))
+    
+    # ========================================================================
+    # PERSISTENT CACHE
+    # ========================================================================
+    
+    def _open_shelf(self, cache_dir):
+        """Open the on-disk equity/blocklist cache, or None if not configured"""
+        if not cache_dir:
+            return None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            return shelve.open(os.path.join(cache_dir, 'scorer_cache'), writeback=False)
+        except Exception as e:
+            logger.warning(f"Could not open scorer cache in {cache_dir}: {e}")
+            return None
+    
+    def _cache_get(self, cache, name, key):
+        """
+        Look up key in an in-memory cache, falling back to the shelf
+        Returns None on a miss (cached values are always tuples)
+        """
+        if key in cache:
+            return cache[key]
+        
+        if self._shelf is not None:
+            entry = self._shelf.get(f'{name}:{key}')
+            if entry and time.time() - entry[0] < CACHE_TTL_SECONDS:
+                cache[key] = entry[1]
+                return entry[1]
+        
+        return None
+    
+    def _cache_set(self, cache, name, key, value):
+        """Store value in an in-memory cache and the shelf"""
+        cache[key] = value
+        if self._shelf is not None:
+            try:
+                self._shelf[f'{name}:{key}'] = (time.time(), value)
+            except Exception as e:
+                logger.debug("Could not persist %s cache entry for %s: %s", name, key, e)
+    
+    def close(self):
+        """Flush and close the on-disk cache"""
+        if self._shelf is not None:
+            self._shelf.close()
+            self._shelf = None
+    
     # ========================================================================
     # ISLAMIC ALIGNMENT SCORING
     # ========================================================================
@@ -86,44 +572,212 @@ class CompositeScorer:
     def _load_keywords_from_db(self):
         """
         Load all keywords and their themes from database
-        Returns dict: {keyword: [(theme_id, principle, category), ...]}
+        Returns dict: {keyword: [ThemeInfo(theme_id, principle, category, weight), ...]}
         """
-        if self._keyword_cache is not None:
+        if self._keyword_cache is not None and not self._keywords_changed():
             return self._keyword_cache
         
-        cursor = self.db_conn.cursor()
+        if self._keyword_version is None:
+            self._keyword_version = self._fetch_keyword_version()
+            self._keyword_version_checked_at = time.monotonic()
+        
+        # Server-side cursor: stream rows instead of materializing them all
+        cursor = self.db_conn.cursor(name='keyword_stream')
+        cursor.itersize = KEYWORD_FETCH_SIZE
         try:
             cursor.execute("""
                 SELECT tk.keyword, tk.theme_id, it.principle, it.category
                 FROM theme_keywords tk
                 JOIN islamic_themes it ON tk.theme_id = it.id
-                ORDER BY tk.keyword
             """)
             
             # Build keyword -> themes mapping
             keyword_map = defaultdict(list)
-            for keyword, theme_id, principle, category in cursor.fetchall():
-                keyword_map[keyword.lower()].append({
-                    'theme_id': theme_id,
-                    'principle': principle,
-                    'category': category,
-                    'weight': self.category_weights.get(category, 0)
-                })
+            for keyword, theme_id, principle, category in cursor:
+                keyword_map[keyword.lower()].append(ThemeInfo(
+                    theme_id, principle, category, self.category_weights.get(category, 0)
+                ))
             
             self._keyword_cache = dict(keyword_map)
-            logger.info(f"Loaded {len(self._keyword_cache)} unique keywords from database")
+            self._build_keyword_matchers(self._keyword_cache)
+            logger.info("Loaded %d unique keywords from database", len(self._keyword_cache))
             return self._keyword_cache
             
         finally:
             cursor.close()
     
-    def _detect_context_signals(self, content, domain):
+    def _fetch_keyword_version(self):
+        """
+        Current theme_keywords_version sequence state, or False if the
+        sequence isn't installed (yet - it's still polled, and keywords are
+        reloaded once it appears)
+        """
+        cursor = self.db_conn.cursor()
+        try:
+            with _savepoint(self.db_conn, cursor, 'keyword_version'):
+                cursor.execute("SELECT last_value, is_called FROM theme_keywords_version")
+                return cursor.fetchone()
+        except Exception as e:
+            # Logged once, not on every poll while the sequence is missing
+            if self._keyword_version is not False:
+                logger.info("Keyword versioning unavailable, polling until it is installed: %s", e)
+            return False
+        finally:
+            cursor.close()
+    
+    def _keywords_changed(self):
+        """
+        Poll the keyword version at most every KEYWORD_VERSION_CHECK_SECONDS
+        Returns True (and records the new version) if keywords were edited,
+        or the version sequence was installed since the last poll
+        """
+        now = time.monotonic()
+        if (self._keyword_version_checked_at is not None
+                and now - self._keyword_version_checked_at < KEYWORD_VERSION_CHECK_SECONDS):
+            return False
+        self._keyword_version_checked_at = now
+        
+        version = self._fetch_keyword_version()
+        if version is False or version == self._keyword_version:
+            return False
+        
+        logger.info("Theme keywords changed, reloading keyword matchers")
+        self._keyword_version = version
+        return True
+    
+    def _build_keyword_matchers(self, keyword_map):
+        """
+        Prepare the fastest available multi-keyword matcher:
+        Hyperscan, then Aho-Corasick, then a single regex alternation
+        Without Hyperscan, keywords made only of word characters are found
+        by tokenizing the page and checking a set; only the rest (phrases,
+        hyphenated terms) go to the automaton/regex
+        """
+        # Drop matchers from a previous keyword version
+        self._hs_db = None
+        self._hs_scratch = None
+        self._hs_keywords = []
+        self._hs_last_scan = (None, None)
+        self._keyword_automaton = None
+        self._keyword_regex = None
+        self._keyword_prefixes = {}
+        self._single_word_keywords = frozenset()
+        
+        if self._build_hyperscan_db(keyword_map):
+            return
+        
+        self._single_word_keywords = frozenset(
+            keyword for keyword in keyword_map if _WORD_TOKEN_RE.fullmatch(keyword)
+        )
+        other_keywords = {
+            keyword: themes for keyword, themes in keyword_map.items()
+            if keyword not in self._single_word_keywords
+        }
+        
+        self._keyword_automaton = self._build_keyword_automaton(other_keywords)
+        if self._keyword_automaton is None:
+            self._build_keyword_regex(other_keywords)
+    
+    def _build_hyperscan_db(self, keyword_map):
+        """
+        Compile all keywords plus false_positive_patterns into one Hyperscan
+        database (keyword ids first, then pattern ids)
+        Returns True if the database is ready
+        """
+        if not HAS_HYPERSCAN or not keyword_map:
+            return False
+        
+        keywords = list(keyword_map)
+        expressions = [r'\b' + re.escape(keyword) + r'\b' for keyword in keywords]
+        expressions += self.false_positive_patterns
+        flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+        
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[expression.encode('utf-8') for expression in expressions],
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[flags] * len(expressions)
+            )
+        except Exception as e:
+            logger.warning(f"Hyperscan compile failed, using fallback matcher: {e}")
+            return False
+        
+        self._hs_db = db
+        self._hs_scratch = hyperscan.Scratch(db)
+        self._hs_keywords = keywords
+        self._hs_last_scan = (None, None)
+        return True
+    
+    def _hyperscan_matches(self, content_lower):
+        """
+        Scan content once against the shared database
+        Returns set of matched ids; the last page's result is reused so the
+        context check and keyword matching share one scan
+        """
+        last_content, last_ids = self._hs_last_scan
+        if last_content == content_lower:
+            return last_ids
+        
+        matched_ids = set()
+        
+        def on_match(match_id, start, end, flags, context):
+            matched_ids.add(match_id)
+        
+        self._hs_db.scan(
+            content_lower.encode('utf-8', errors='replace'),
+            match_event_handler=on_match,
+            scratch=self._hs_scratch
+        )
+        
+        self._hs_last_scan = (content_lower, matched_ids)
+        return matched_ids
+    
+    def _build_keyword_automaton(self, keyword_map):
+        """
+        Build an Aho-Corasick automaton over all keywords so a page is
+        scanned once for every keyword at the same time
+        Returns None if pyahocorasick isn't installed
+        """
+        if not HAS_AHOCORASICK or not keyword_map:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for keyword in keyword_map:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_keyword_regex(self, keyword_map):
+        """
+        Fallback when pyahocorasick is missing: compile every keyword into
+        one alternation (longest first) instead of a regex per keyword
+        """
+        if not keyword_map:
+            return
+        
+        keywords = sorted(keyword_map, key=len, reverse=True)
+        self._keyword_regex = re.compile(
+            r'(?=\b(' + '|'.join(re.escape(keyword) for keyword in keywords) + r')\b)'
+        )
+        
+        # Shorter keywords hidden behind a longer one at the same position
+        self._keyword_prefixes = {}
+        for keyword in keywords:
+            prefixes = [
+                keyword[:length] for length in range(len(keyword) - 1, 0, -1)
+                if keyword[:length] in keyword_map
+            ]
+            if prefixes:
+                self._keyword_prefixes[keyword] = prefixes
+    
+    def _detect_context_signals(self, content_lower, domain):
         """
         Detect if content is educational/research context
+        Expects already-lowercased content
         Returns context flags dict
         """
-        content_lower = content.lower()
-        
         context = {
             'is_educational': False,
             'is_news': False,
@@ -132,8 +786,7 @@ class CompositeScorer:
         }
         
         # Check domain
-        parsed = urlparse(domain if '://' in domain else f'https://{domain}')
-        domain_clean = parsed.netloc.lower().replace('www.', '')
+        domain_clean = _clean_domain(domain)
         
         # Educational domains
         for tld in self.educational_tlds:
@@ -146,41 +799,111 @@ class CompositeScorer:
             context['is_news'] = True
         
         # Research indicators
-        research_terms = ['research', 'study', 'paper', 'journal', 'academic',
-                         'university', 'scholar', 'peer-reviewed', 'abstract']
-        if any(term in content_lower for term in research_terms):
+        if _RESEARCH_TERMS_RE.search(content_lower):
             context['is_research'] = True
         
         # False positive patterns
-        for pattern in self.false_positive_patterns:
-            if re.search(pattern, content_lower):
-                context['is_false_positive'] = True
-                break
+        if self._hs_db is not None:
+            # Pattern ids follow the keyword ids in the shared database
+            matched_ids = self._hyperscan_matches(content_lower)
+            context['is_false_positive'] = any(
+                pattern_id >= len(self._hs_keywords) for pattern_id in matched_ids
+            )
+        else:
+            context['is_false_positive'] = bool(self._false_positive_re.search(content_lower))
         
         return context
     
-    def _match_keywords_in_content(self, content, keyword_map):
+    def _match_keywords_in_content(self, content_lower, keyword_map):
         """
-        Match keywords in content with whole-word matching
+        Match keywords in already-lowercased content with whole-word matching
         Returns list of matches: [(keyword, theme_info), ...]
         """
-        content_lower = content.lower()
         matches = []
         
-        for keyword, theme_list in keyword_map.items():
-            # Whole-word regex pattern
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            
-            if re.search(pattern, content_lower):
-                for theme_info in theme_list:
-                    matches.append((keyword, theme_info))
+        if keyword_map is self._keyword_cache and self._hs_db is not None:
+            matched_ids = self._hyperscan_matches(content_lower)
+            # Ids past the keyword list are false-positive patterns
+            keyword_count = len(self._hs_keywords)
+            matched_keywords = [
+                self._hs_keywords[keyword_id] for keyword_id in sorted(matched_ids)
+                if keyword_id < keyword_count
+            ]
+        elif keyword_map is self._keyword_cache:
+            matched_keywords = self._scan_single_word_keywords(content_lower)
+            if self._keyword_automaton is not None:
+                matched_keywords += self._scan_with_automaton(content_lower)
+            elif self._keyword_regex is not None:
+                matched_keywords += self._scan_with_regex(content_lower)
+        else:
+            matched_keywords = [
+                keyword for keyword in keyword_map
+                if re.search(r'\b' + re.escape(keyword) + r'\b', content_lower)
+            ]
+        
+        for keyword in matched_keywords:
+            for theme_info in keyword_map[keyword]:
+                matches.append((keyword, theme_info))
         
         return matches
     
-    def calculate_islamic_alignment(self, content, domain):
+    def _scan_single_word_keywords(self, content_lower):
+        """
+        Tokenize into maximal runs of word characters and look each up in the
+        single-word keyword set; a whole token is exactly a \\b...\\b match
+        Returns matched keywords in order of first occurrence
+        """
+        keywords = self._single_word_keywords
+        if not keywords:
+            return []
+        return [
+            token for token in dict.fromkeys(_WORD_TOKEN_RE.findall(content_lower))
+            if token in keywords
+        ]
+    
+    def _scan_with_automaton(self, content_lower):
+        """
+        Single Aho-Corasick pass over the content; \\b is enforced on
+        each hit by hand
+        Returns matched keywords in order of first occurrence
+        """
+        matched_keywords = {}
+        for end, keyword in self._keyword_automaton.iter(content_lower):
+            if keyword in matched_keywords:
+                continue
+            start = end - len(keyword) + 1
+            if (_is_word_boundary(content_lower, start)
+                    and _is_word_boundary(content_lower, end + 1)):
+                matched_keywords[keyword] = True
+        
+        return list(matched_keywords)
+    
+    def _scan_with_regex(self, content_lower):
+        """
+        Single pass of the precompiled keyword alternation
+        At each position the alternation reports only the longest keyword,
+        so shorter keywords that are prefixes of it are checked separately
+        Returns matched keywords in order of first occurrence
+        """
+        matched_keywords = {}
+        for match in self._keyword_regex.finditer(content_lower):
+            keyword = match.group(1)
+            matched_keywords[keyword] = True
+            
+            start = match.start()
+            for prefix in self._keyword_prefixes.get(keyword, ()):
+                if _is_word_boundary(content_lower, start + len(prefix)):
+                    matched_keywords[prefix] = True
+        
+        return list(matched_keywords)
+    
+    def calculate_islamic_alignment(self, content, domain, content_lower=None):
         """
         Calculate Islamic alignment score
         
+        Args:
+            content_lower: content.lower(), if the caller already has it
+        
         Returns:
             tuple: (score: int, matched_themes: dict)
             - score: -100 to +100 (normalized to 0-100 later)
@@ -192,22 +915,26 @@ class CompositeScorer:
         # Load keywords
         keyword_map = self._load_keywords_from_db()
         
+        if content_lower is None:
+            content_lower = content.lower()
+        
         # Detect context
-        context = self._detect_context_signals(content, domain)
+        context = self._detect_context_signals(content_lower, domain)
         
         # Match keywords
-        matches = self._match_keywords_in_content(content, keyword_map)
+        matches = self._match_keywords_in_content(content_lower, keyword_map)
         
         if not matches:
             return 0, {'reason': 'no_keywords_matched'}
         
         # Calculate score by category
-        category_scores = defaultdict(lambda: {'count': 0, 'weight': 0, 'total': 0})
+        category_totals = defaultdict(int)
+        category_counts = defaultdict(int)
         matched_themes_detail = []
         
         for keyword, theme_info in matches:
-            category = theme_info['category']
-            weight = theme_info['weight']
+            category = theme_info.category
+            weight = theme_info.weight
             
             # Apply context-aware weight reduction for negative categories
             if weight < 0:
@@ -219,19 +946,20 @@ class CompositeScorer:
                 if context['is_false_positive']:
                     weight = 0  # Neutralize false positives
             
-            category_scores[category]['count'] += 1
-            category_scores[category]['weight'] = theme_info['weight']
-            category_scores[category]['total'] += weight
+            category_counts[category] += 1
+            category_totals[category] += weight
             
-            matched_themes_detail.append({
-                'keyword': keyword,
-                'theme': theme_info['principle'],
-                'category': category,
-                'weight': weight
-            })
+            # Only the first TOP_MATCHES_LIMIT are reported
+            if len(matched_themes_detail) < TOP_MATCHES_LIMIT:
+                matched_themes_detail.append({
+                    'keyword': keyword,
+                    'theme': theme_info.principle,
+                    'category': category,
+                    'weight': weight
+                })
         
         # Sum total score
-        raw_score = sum(cat['total'] for cat in category_scores.values())
+        raw_score = sum(category_totals.values())
         
         # Normalize to -100 to +100 range
         # Assume max ~50 matches * max weight (10) = 500 theoretical max
@@ -242,12 +970,19 @@ class CompositeScorer:
             'raw_score': raw_score,
             'normalized_score': normalized_score,
             'matches_count': len(matches),
-            'categories': dict(category_scores),
+            'categories': {
+                category: {
+                    'count': count,
+                    'weight': self.category_weights.get(category, 0),
+                    'total': category_totals[category]
+                }
+                for category, count in category_counts.items()
+            },
             'context': context,
-            'top_matches': matched_themes_detail[:20]  # Keep top 20 for logging
+            'top_matches': matched_themes_detail  # Keep top 20 for logging
         }
         
-        logger.debug(f"Islamic alignment: {normalized_score} (raw: {raw_score}, matches: {len(matches)})")
+        logger.debug("Islamic alignment: %s (raw: %s, matches: %d)", normalized_score, raw_score, len(matches))
         
         return normalized_score, matched_themes
     
@@ -255,7 +990,7 @@ class CompositeScorer:
     # QUALITY SCORING
     # ========================================================================
     
-    def _calculate_readability(self, content):
+    def _calculate_readability(self, content, stats=None):
         """Calculate readability score (0-15 points)"""
         if HAS_TEXTSTAT:
             try:
@@ -273,13 +1008,13 @@ class CompositeScorer:
                 pass
         
         # Fallback: Simple approximation
-        words = content.split()
-        sentences = content.count('.') + content.count('!') + content.count('?')
+        stats = stats or _content_stats(content)
+        sentences = stats.sentence_count
         
         if sentences == 0:
             return 5
         
-        avg_words_per_sentence = len(words) / sentences
+        avg_words_per_sentence = stats.word_count / sentences
         
         if avg_words_per_sentence <= 15:
             return 15  # Short sentences, easier
@@ -288,9 +1023,9 @@ class CompositeScorer:
         else:
             return 5   # Long sentences, harder
     
-    def _calculate_content_length_score(self, content):
+    def _calculate_content_length_score(self, content, stats=None):
         """Calculate content length score (0-10 points)"""
-        word_count = len(content.split())
+        word_count = (stats or _content_stats(content)).word_count
         
         if word_count < 100:
             return 0  # Thin content
@@ -301,32 +1036,56 @@ class CompositeScorer:
         else:
             return 8   # Very long, might be spam
     
-    def _calculate_structural_quality(self, content):
+    def _calculate_structural_quality(self, content, stats=None):
         """Calculate structural quality (0-15 points)"""
+        stats = stats or _content_stats(content)
         score = 0
         
         # Check for headings (h1, h2 tags would be stripped, so we approximate)
         # Look for patterns like lines in ALL CAPS or with special formatting
-        lines = content.split('\n')
-        has_structure = any(len(line) < 100 and line.isupper() for line in lines)
-        
-        if has_structure:
+        if stats.has_caps_line:
             score += 5
         
         # Check for lists or structured content
-        if content.count('\n') > 5:  # Multiple paragraphs
+        if stats.newline_count > 5:  # Multiple paragraphs
             score += 5
         
         # Not a content farm pattern (avoid excessive repetition)
-        words = content.lower().split()
-        if len(words) > 50:
-            unique_ratio = len(set(words)) / len(words)
+        if stats.word_count > 50:
+            unique_ratio = stats.unique_lower_count / stats.word_count
             if unique_ratio > 0.4:  # At least 40% unique words
                 score += 5
         
         return score
     
-    def calculate_quality_score(self, content, domain, title):
+    def _content_quality(self, content):
+        """
+        Content-only quality points (readability, length, structure,
+        uniqueness), or None if the content is too short to score
+        
+        Returns:
+            dict: {component: points}
+        """
+        if not content or len(content.strip()) < 50:
+            return None
+        
+        stats = _content_stats(content)
+        
+        # Grammar/uniqueness (basic check)
+        if stats.word_count > 50:
+            unique_ratio = stats.unique_count / stats.word_count
+            grammar_score = min(15, int(unique_ratio * 20))
+        else:
+            grammar_score = 5
+        
+        return {
+            'readability': self._calculate_readability(content, stats),
+            'content_length': self._calculate_content_length_score(content, stats),
+            'structural_quality': self._calculate_structural_quality(content, stats),
+            'grammar_uniqueness': grammar_score,
+        }
+    
+    def calculate_quality_score(self, content, domain, title, now=None, content_quality=None):
         """
         Calculate quality score (0-100)
         
@@ -338,37 +1097,21 @@ class CompositeScorer:
         - Freshness: 0-15 points (from crawl date)
         - Grammar/uniqueness: 0-15 points
         
+        Args:
+            content_quality: Precomputed _content_quality(content) (e.g. from
+                             the scoring cache)
+        
         Returns:
             tuple: (score: int, details: dict)
         """
-        if not content or len(content.strip()) < 50:
+        if content_quality is None:
+            content_quality = self._content_quality(content)
+        if content_quality is None:
             return 0, {'reason': 'content_too_short'}
         
-        details = {}
-        total_score = 0
-        
         # A. Content Quality (0-40 points)
-        readability = self._calculate_readability(content)
-        details['readability'] = readability
-        total_score += readability
-        
-        length_score = self._calculate_content_length_score(content)
-        details['content_length'] = length_score
-        total_score += length_score
-        
-        structural = self._calculate_structural_quality(content)
-        details['structural_quality'] = structural
-        total_score += structural
-        
-        # Grammar/uniqueness (basic check)
-        words = content.split()
-        if len(words) > 50:
-            unique_ratio = len(set(words)) / len(words)
-            grammar_score = min(15, int(unique_ratio * 20))
-        else:
-            grammar_score = 5
-        details['grammar_uniqueness'] = grammar_score
-        total_score += grammar_score
+        details = dict(content_quality)
+        total_score = sum(content_quality.values())
         
         # B. Technical Quality (0-30 points)
         technical_score = 0
@@ -381,7 +1124,7 @@ class CompositeScorer:
             details['has_ssl'] = False
         
         # Domain age (use first crawl date from DB)
-        domain_age_score = self._get_domain_age_score(domain)
+        domain_age_score = self._get_domain_age_score(domain, now)
         technical_score += domain_age_score
         details['domain_age_score'] = domain_age_score
         
@@ -397,41 +1140,26 @@ class CompositeScorer:
         # Total out of 100
         details['total'] = min(100, total_score)
         
-        logger.debug(f"Quality score: {details['total']} (readability={readability}, length={length_score})")
+        logger.debug("Quality score: %s (readability=%s, length=%s)",
+                     details['total'], details['readability'], details['content_length'])
         
         return min(100, total_score), details
     
-    def _get_domain_age_score(self, domain):
+    def _get_domain_age_score(self, domain, now=None):
         """
         Get domain age score from first crawl date (0-15 points)
         """
+        domain_clean = _domain_netloc(domain)
+        
+        if domain_clean in self._first_seen_prefetch:
+            return self._domain_age_points(self._first_seen_prefetch[domain_clean], now)
+        
         cursor = self.db_conn.cursor()
         try:
-            parsed = urlparse(domain if '://' in domain else f'https://{domain}')
-            domain_clean = parsed.netloc
-            
-            cursor.execute("""
-                SELECT MIN(crawled_at) as first_seen
-                FROM pages
-                WHERE domain = %s
-            """, (domain_clean,))
+            self._execute_lookup(cursor, 'scorer_first_seen', domain_clean)
             
             result = cursor.fetchone()
-            if not result or not result[0]:
-                return 5  # Default for new domains
-            
-            first_seen = result[0]
-            age = datetime.now() - first_seen
-            
-            # Score based on age in our database
-            if age.days < 7:
-                return 0   # Very new, suspicious
-            elif age.days < 30:
-                return 5
-            elif age.days < 90:
-                return 10
-            else:
-                return 15  # Established
+            return self._domain_age_points(result[0] if result else None, now)
             
         except Exception as e:
             logger.error(f"Error getting domain age: {e}")
@@ -439,14 +1167,30 @@ class CompositeScorer:
         finally:
             cursor.close()
     
+    def _domain_age_points(self, first_seen, now=None):
+        """Score a domain's first crawl date (0-15 points)"""
+        if not first_seen:
+            return 5  # Default for new domains
+        
+        age = (now or datetime.now()) - first_seen
+        
+        # Score based on age in our database
+        if age.days < 7:
+            return 0   # Very new, suspicious
+        elif age.days < 30:
+            return 5
+        elif age.days < 90:
+            return 10
+        else:
+            return 15  # Established
+    
     # ========================================================================
     # AUTHORITY SCORING
     # ========================================================================
     
     def _get_tld_score(self, domain):
         """Calculate TLD prestige score (0-50 points)"""
-        parsed = urlparse(domain if '://' in domain else f'https://{domain}')
-        domain_clean = parsed.netloc.lower()
+        domain_clean = _domain_netloc(domain).lower()
         
         if domain_clean.endswith('.gov'):
             return 50
@@ -461,74 +1205,53 @@ class CompositeScorer:
         else:
             return 10
     
-    def _get_backlink_score(self, url):
-        """Calculate backlink score (0-30 points)"""
+    def _get_link_authority_scores(self, url):
+        """
+        Calculate backlink score (0-30 points) and external authority
+        signals (0-20 points) from a single query over links
+        
+        Returns:
+            tuple: (backlink_score: int, external_authority_score: int)
+        """
+        if url in self._link_counts_prefetch:
+            return self._link_authority_points(*self._link_counts_prefetch[url])
+        
         cursor = self.db_conn.cursor()
         try:
-            cursor.execute("""
-                SELECT COUNT(DISTINCT source_page_id) as backlink_count
-                FROM links
-                WHERE target_url = %s
-            """, (url,))
+            self._execute_lookup(cursor, 'scorer_link_counts', url)
             
-            result = cursor.fetchone()
-            backlink_count = result[0] if result else 0
-            
-            # Score based on backlink count
-            if backlink_count == 0:
-                return 0
-            elif backlink_count <= 5:
-                return 10
-            elif backlink_count <= 20:
-                return 20
-            else:
-                return 30
+            backlink_count, edu_refs, gov_refs = cursor.fetchone()
             
         except Exception as e:
-            logger.error(f"Error counting backlinks: {e}")
-            return 0
+            logger.error(f"Error calculating link authority: {e}")
+            return 0, 0
         finally:
             cursor.close()
+        
+        return self._link_authority_points(backlink_count, edu_refs, gov_refs)
     
-    def _get_external_authority_score(self, url, domain):
-        """Calculate external authority signals (0-20 points)"""
-        cursor = self.db_conn.cursor()
-        try:
-            score = 0
-            
-            # Check if referenced by .edu domains
-            cursor.execute("""
-                SELECT COUNT(DISTINCT p.domain) as edu_refs
-                FROM links l
-                JOIN pages p ON l.source_page_id = p.id
-                WHERE l.target_url = %s
-                    AND p.domain LIKE '%.edu'
-            """, (url,))
-            
-            edu_refs = cursor.fetchone()[0]
-            if edu_refs > 0:
-                score += 10
-            
-            # Check if referenced by .gov domains
-            cursor.execute("""
-                SELECT COUNT(DISTINCT p.domain) as gov_refs
-                FROM links l
-                JOIN pages p ON l.source_page_id = p.id
-                WHERE l.target_url = %s
-                    AND p.domain LIKE '%.gov'
-            """, (url,))
-            
-            gov_refs = cursor.fetchone()[0]
-            if gov_refs > 0:
-                score += 10
-            
-            return min(20, score)
-            
-        except Exception as e:
-            logger.error(f"Error calculating external authority: {e}")
-            return 0
-        finally:
-            cursor.close()
+    def _link_authority_points(self, backlink_count, edu_refs, gov_refs):
+        """
+        Score link counts as (backlink_score 0-30, external_authority_score 0-20)
+        """
+        # Score based on backlink count
+        if backlink_count == 0:
+            backlink_score = 0
+        elif backlink_count <= 5:
+            backlink_score = 10
+        elif backlink_count <= 20:
+            backlink_score = 20
+        else:
+            backlink_score = 30
+        
+        # Referenced by .edu / .gov domains
+        external_score = 0
+        if edu_refs > 0:
+            external_score += 10
+        if gov_refs > 0:
+            external_score += 10
+        
+        return backlink_score, min(20, external_score)
     
     def calculate_authority_score(self, url, domain):
         """
@@ -545,10 +1268,7 @@ class CompositeScorer:
         # Check cache
         cache_key = domain
         if cache_key in self._domain_authority_cache:
-            cached = self._domain_authority_cache[cache_key]
-            # Cache for 7 days
-            if (datetime.now() - cached['timestamp']).days < 7:
-                return cached['score'], cached['details']
+            return self._domain_authority_cache[cache_key]
         
         details = {}
         
@@ -556,25 +1276,18 @@ class CompositeScorer:
         tld_score = self._get_tld_score(domain)
         details['tld_score'] = tld_score
         
-        # Backlink score
-        backlink_score = self._get_backlink_score(url)
+        # Backlink score and external authority (one query)
+        backlink_score, external_score = self._get_link_authority_scores(url)
         details['backlink_score'] = backlink_score
-        
-        # External authority
-        external_score = self._get_external_authority_score(url, domain)
         details['external_authority_score'] = external_score
         
         total = tld_score + backlink_score + external_score
         details['total'] = total
         
-        # Cache result
-        self._domain_authority_cache[cache_key] = {
-            'score': total,
-            'details': details,
-            'timestamp': datetime.now()
-        }
+        # Cache result (TTLCache expires it after 7 days)
+        self._domain_authority_cache[cache_key] = (total, details)
         
-        logger.debug(f"Authority score: {total} (TLD={tld_score}, backlinks={backlink_score})")
+        logger.debug("Authority score: %s (TLD=%s, backlinks=%s)", total, tld_score, backlink_score)
         
         return total, details
     
@@ -598,62 +1311,18 @@ class CompositeScorer:
         Returns:
             tuple: (boost: int, details: dict)
         """
-        parsed = urlparse(domain if '://' in domain else f'https://{domain}')
-        domain_clean = parsed.netloc.lower().replace('www.', '')
+        domain_clean = _clean_domain(domain)
         
         # Check cache
-        if domain_clean in self._equity_cache:
-            return self._equity_cache[domain_clean]
+        cached = self._cache_get(self._equity_cache, 'equity', domain_clean)
+        if cached is not None:
+            return cached
         
         cursor = self.db_conn.cursor()
         try:
-            cursor.execute("""
-                SELECT minority_owned, women_owned, veteran_owned, 
-                       b_corp, lgbtq_owned, disability_owned
-                FROM equity_domains
-                WHERE domain = %s
-            """, (domain_clean,))
-            
-            result = cursor.fetchone()
-            if not result:
-                self._equity_cache[domain_clean] = (0, {'reason': 'not_in_equity_list'})
-                return 0, {'reason': 'not_in_equity_list'}
-            
-            minority, women, veteran, bcorp, lgbtq, disability = result
+            self._execute_lookup(cursor, 'scorer_equity', domain_clean)
             
-            boost = 0
-            details = {}
-            
-            if minority:
-                boost += 15
-                details['minority_owned'] = True
-            if women:
-                boost += 15
-                details['women_owned'] = True
-            if veteran:
-                boost += 15
-                details['veteran_owned'] = True
-            if bcorp:
-                boost += 10
-                details['b_corp'] = True
-            if lgbtq:
-                boost += 15
-                details['lgbtq_owned'] = True
-            if disability:
-                boost += 15
-                details['disability_owned'] = True
-            
-            # Cap at 30
-            boost = min(30, boost)
-            details['total_boost'] = boost
-            
-            result = (boost, details)
-            self._equity_cache[domain_clean] = result
-            
-            if boost > 0:
-                logger.info(f"Equity boost: +{boost} points for {domain_clean}")
-            
-            return result
+            return self._equity_from_row(domain_clean, cursor.fetchone())
             
         except Exception as e:
             logger.error(f"Error checking equity domains: {e}")
@@ -661,6 +1330,50 @@ class CompositeScorer:
         finally:
             cursor.close()
     
+    def _equity_from_row(self, domain_clean, row):
+        """
+        Turn an equity_domains row (or None) into (boost, details) and cache it
+        """
+        if not row:
+            self._cache_set(self._equity_cache, 'equity', domain_clean, (0, {'reason': 'not_in_equity_list'}))
+            return 0, {'reason': 'not_in_equity_list'}
+        
+        minority, women, veteran, bcorp, lgbtq, disability = row
+        
+        boost = 0
+        details = {}
+        
+        if minority:
+            boost += 15
+            details['minority_owned'] = True
+        if women:
+            boost += 15
+            details['women_owned'] = True
+        if veteran:
+            boost += 15
+            details['veteran_owned'] = True
+        if bcorp:
+            boost += 10
+            details['b_corp'] = True
+        if lgbtq:
+            boost += 15
+            details['lgbtq_owned'] = True
+        if disability:
+            boost += 15
+            details['disability_owned'] = True
+        
+        # Cap at 30
+        boost = min(30, boost)
+        details['total_boost'] = boost
+        
+        result = (boost, details)
+        self._cache_set(self._equity_cache, 'equity', domain_clean, result)
+        
+        if boost > 0:
+            logger.info("Equity boost: +%s points for %s", boost, domain_clean)
+        
+        return result
+    
     # ========================================================================
     # ORGANIZATIONAL BLOCKLIST
     # ========================================================================
@@ -672,53 +1385,97 @@ class CompositeScorer:
         Returns:
             tuple: (is_blocked: bool, reason: str)
         """
-        parsed = urlparse(domain if '://' in domain else f'https://{domain}')
-        domain_clean = parsed.netloc.lower().replace('www.', '')
+        domain_clean = _clean_domain(domain)
+        
+        # Whole table preloaded in memory: no per-domain query
+        blocklist_map = self._get_blocklist_map()
+        if blocklist_map is not None:
+            result = blocklist_map.get(domain_clean, (False, None))
+            if result[0]:
+                # Hit on every check of the domain (the load is logged once)
+                logger.debug("Domain blocked: %s - %s", domain_clean, result[1])
+            return result
         
         # Check cache
-        if domain_clean in self._blocklist_cache:
-            return self._blocklist_cache[domain_clean]
+        cached = self._cache_get(self._blocklist_cache, 'blocklist', domain_clean)
+        if cached is not None:
+            return cached
         
         cursor = self.db_conn.cursor()
         try:
-            cursor.execute("""
-                SELECT splc_flagged, aclu_flagged, cair_flagged, 
-                       adl_flagged, other_org_flagged, reason
-                FROM org_blocklist
-                WHERE domain = %s
-            """, (domain_clean,))
+            self._execute_lookup(cursor, 'scorer_blocklist', domain_clean)
             
-            result = cursor.fetchone()
-            if not result:
-                self._blocklist_cache[domain_clean] = (False, None)
-                return False, None
+            return self._blocklist_from_row(domain_clean, cursor.fetchone())
             
-            splc, aclu, cair, adl, other, reason = result
+        except Exception as e:
+            logger.error(f"Error checking org blocklist: {e}")
+            return False, None
+        finally:
+            cursor.close()
+    
+    def _blocklist_from_row(self, domain_clean, row):
+        """
+        Turn an org_blocklist row (or None) into (is_blocked, reason) and cache it
+        """
+        if not row:
+            self._cache_set(self._blocklist_cache, 'blocklist', domain_clean, (False, None))
+            return False, None
+        
+        block_reason = _blocklist_reason(row)
+        
+        if block_reason:
+            result = (True, block_reason)
+            self._cache_set(self._blocklist_cache, 'blocklist', domain_clean, result)
             
-            if any([splc, aclu, cair, adl, other]):
-                flags = []
-                if splc: flags.append('SPLC')
-                if aclu: flags.append('ACLU')
-                if cair: flags.append('CAIR')
-                if adl: flags.append('ADL')
-                if other: flags.append('Other')
-                
-                block_reason = f"Flagged by: {', '.join(flags)}"
-                if reason:
-                    block_reason += f" - {reason}"
-                
-                result = (True, block_reason)
-                self._blocklist_cache[domain_clean] = result
-                
-                logger.warning(f"Domain blocked: {domain_clean} - {block_reason}")
-                return result
+            logger.warning(f"Domain blocked: {domain_clean} - {block_reason}")
+            return result
+        
+        self._cache_set(self._blocklist_cache, 'blocklist', domain_clean, (False, None))
+        return False, None
+    
+    def _get_blocklist_map(self):
+        """
+        Return {domain: (True, reason)} for every flagged org_blocklist row,
+        reloading it every BLOCKLIST_REFRESH_SECONDS. None if the table is
+        too large to hold in memory or couldn't be read.
+        """
+        if (self._blocklist_loaded_at is None
+                or time.monotonic() - self._blocklist_loaded_at >= BLOCKLIST_REFRESH_SECONDS):
+            self.reload_blocklist()
+        return self._blocklist_map
+    
+    def reload_blocklist(self):
+        """Load the whole org_blocklist table into memory"""
+        self._blocklist_loaded_at = time.monotonic()
+        
+        cursor = self.db_conn.cursor()
+        try:
+            with _savepoint(self.db_conn, cursor, 'org_blocklist_preload'):
+                cursor.execute("""
+                    SELECT domain, splc_flagged, aclu_flagged, cair_flagged, 
+                           adl_flagged, other_org_flagged, reason
+                    FROM org_blocklist
+                    LIMIT %s
+                """, (BLOCKLIST_PRELOAD_MAX_ROWS + 1,))
+                rows = cursor.fetchall()
             
-            self._blocklist_cache[domain_clean] = (False, None)
-            return False, None
+            if len(rows) > BLOCKLIST_PRELOAD_MAX_ROWS:
+                logger.info("org_blocklist too large to preload, using per-domain lookups")
+                self._blocklist_map = None
+                return
+            
+            blocklist_map = {}
+            for row in rows:
+                block_reason = _blocklist_reason(row[1:])
+                if block_reason:
+                    blocklist_map[row[0]] = (True, block_reason)
+            
+            self._blocklist_map = blocklist_map
+            logger.info("Preloaded %d blocked domains from org_blocklist", len(blocklist_map))
             
         except Exception as e:
-            logger.error(f"Error checking org blocklist: {e}")
-            return False, None
+            logger.error(f"Error preloading org blocklist: {e}")
+            self._blocklist_map = None
         finally:
             cursor.close()
     
@@ -726,7 +1483,7 @@ class CompositeScorer:
     # MEDIA LITERACY (STUB)
     # ========================================================================
     
-    def calculate_media_literacy_score(self, content, domain, title=None):
+    def calculate_media_literacy_score(self, content, domain, title=None, content_lower=None):
         """
         Media literacy score using AI-powered pattern detection
         
@@ -741,6 +1498,9 @@ class CompositeScorer:
         
         Cost-optimized: Only analyzes content with red flag keywords
         
+        Args:
+            content_lower: content.lower(), if the caller already has it
+        
         Returns:
             tuple: (score: int, details: dict)
         """
@@ -752,7 +1512,8 @@ class CompositeScorer:
                 content=content,
                 domain=domain,
                 title=title,
-                db_conn=self.db_conn
+                db_conn=self.db_conn,
+                content_lower=content_lower
             )
             
             return score, details
@@ -765,11 +1526,101 @@ class CompositeScorer:
             # Graceful degradation - return neutral score
             return 50, {'status': 'error', 'error': str(e)}
     
+    # ========================================================================
+    # SCORING CACHE
+    # ========================================================================
+    
+    def _algo_version(self):
+        """
+        scoring_cache version: SCORING_ALGO_VERSION plus the theme keyword
+        version, so keyword edits invalidate cached alignment scores
+        """
+        self._load_keywords_from_db()
+        return scoring_algo_version(self._keyword_version)
+    
+    def _scoring_cache_usable(self):
+        """False for SCORING_CACHE_RETRY_SECONDS after a scoring_cache error"""
+        if self._scoring_cache_retry_at is None:
+            return True
+        if time.monotonic() < self._scoring_cache_retry_at:
+            return False
+        self._scoring_cache_retry_at = None
+        return True
+    
+    def _fetch_cached_components(self, content_shas):
+        """
+        Look up scoring_cache rows for many content hashes in one query
+        Returns {content_sha: components}; on an error (e.g. the table is
+        missing) the cache is skipped for SCORING_CACHE_RETRY_SECONDS
+        """
+        if not content_shas or not self._scoring_cache_usable():
+            return {}
+        
+        cursor = self.db_conn.cursor()
+        try:
+            algo_version = self._algo_version()
+            with _savepoint(self.db_conn, cursor, 'scoring_cache_fetch'):
+                cursor.execute("""
+                    SELECT content_sha, components_json
+                    FROM scoring_cache
+                    WHERE algo_version = %s AND content_sha = ANY(%s)
+                """, (algo_version, list(content_shas)))
+                return {bytes(sha): components for sha, components in cursor.fetchall()}
+        except Exception as e:
+            self._scoring_cache_retry_at = time.monotonic() + SCORING_CACHE_RETRY_SECONDS
+            logger.info("Scoring cache unavailable, computing every page for %ds: %s",
+                        SCORING_CACHE_RETRY_SECONDS, e)
+            return {}
+        finally:
+            cursor.close()
+    
+    def _content_components(self, content, domain, title):
+        """
+        Islamic alignment, content quality and media literacy for a page,
+        from scoring_cache when this exact domain/title/content was scored
+        before with the current algorithm version
+        
+        Returns:
+            tuple: (components: dict, cache_entry: (content_sha, algo_version,
+                    components) to store, or None on a cache hit)
+        """
+        content_sha = _content_sha(domain, title, content)
+        
+        if content_sha in self._components_prefetch:
+            components = self._components_prefetch[content_sha]
+        else:
+            components = self._fetch_cached_components([content_sha]).get(content_sha)
+        if components is not None:
+            return components, None
+        
+        # One lowercased copy shared by both keyword scans
+        content_lower = content.lower() if content else content
+        
+        # score_batch analyzes its pages' media literacy together up front
+        media_literacy = self._media_prefetch.get(content_sha)
+        if media_literacy is None:
+            media_literacy = self.calculate_media_literacy_score(content, domain, title, content_lower)
+        
+        components = {
+            'islamic_alignment': self.calculate_islamic_alignment(content, domain, content_lower),
+            'content_quality': self._content_quality(content),
+            'media_literacy': media_literacy,
+        }
+        
+        # Don't pin a neutral fallback from a failed API call
+        if components['media_literacy'][1].get('status') in ('error', 'stub'):
+            return components, None
+        
+        # Later duplicates in the same batch hit this entry
+        if content_sha in self._components_prefetch:
+            self._components_prefetch[content_sha] = components
+        return components, (content_sha, self._algo_version(), components)
+    
     # ========================================================================
     # COMPOSITE CALCULATION
     # ========================================================================
     
-    def calculate_composite_score(self, page_id, url, title, content, domain, crawled_at):
+    def calculate_composite_score(self, page_id, url, title, content, domain, crawled_at, now=None):
         """
         Calculate final composite score
         
@@ -780,15 +1631,22 @@ class CompositeScorer:
         - Media literacy: 15%
         - Equity boost: 10%
         
+        Args:
+            now: Reference time for age/freshness (defaults to datetime.now();
+                 score_batch passes one value for the whole batch)
+        
         Returns:
             dict with all scores and details
         """
-        logger.info(f"Scoring page {page_id}: {url}")
+        logger.info("Scoring page %s: %s", page_id, url)
+        
+        if now is None:
+            now = datetime.now()
         
         result = {
             'page_id': page_id,
             'url': url,
-            'scored_at': datetime.now()
+            'scored_at': now
         }
         
         # Check org blocklist first (instant disqualification)
@@ -804,11 +1662,16 @@ class CompositeScorer:
             logger.warning(f"Page {page_id} blocked by org blocklist: {block_reason}")
             return result
         
+        # Content-derived components come from scoring_cache when unchanged
+        cached, cache_entry = self._content_components(content, domain, title)
+        if cache_entry is not None:
+            result['cache_entry'] = cache_entry
+        
         # Calculate all components
         components = {}
         
         # 1. Islamic Alignment (30%)
-        islamic_score, islamic_details = self.calculate_islamic_alignment(content, domain)
+        islamic_score, islamic_details = cached['islamic_alignment']
         # Normalize from -100:+100 to 0:100
         islamic_normalized = (islamic_score + 100) / 2
         components['islamic_alignment'] = {
@@ -818,11 +1681,13 @@ class CompositeScorer:
         }
         
         # 2. Quality Score (25%)
-        quality_score, quality_details = self.calculate_quality_score(content, domain, title)
+        quality_score, quality_details = self.calculate_quality_score(
+            content, domain, title, now, cached['content_quality']
+        )
         
         # Add freshness component
         if crawled_at:
-            age = datetime.now() - crawled_at
+            age = now - crawled_at
             if age.days < 30:
                 freshness = 15
             elif age.days < 90:
@@ -847,7 +1712,7 @@ class CompositeScorer:
         }
         
         # 4. Media Literacy (15%)
-        media_score, media_details = self.calculate_media_literacy_score(content, domain, title)
+        media_score, media_details = cached['media_literacy']
         components['media_literacy'] = {
             'score': media_score,
             'details': media_details
@@ -861,19 +1726,20 @@ class CompositeScorer:
         }
         
         # Calculate weighted composite score
+        w_islamic, w_quality, w_authority, w_media, w_equity = COMPOSITE_WEIGHTS
         composite = (
-            islamic_normalized * 0.30 +
-            quality_score * 0.25 +
-            authority_score * 0.20 +
-            media_score * 0.15 +
-            equity_boost * 0.10
+            islamic_normalized * w_islamic +
+            quality_score * w_quality +
+            authority_score * w_authority +
+            media_score * w_media +
+            equity_boost * w_equity
         )
         
         # Round to integer
         final_score = int(round(composite))
         
         # Determine indexability
-        indexable = final_score >= 25
+        indexable = final_score >= INDEXABLE_MIN_SCORE
         
         result['islamic_alignment_score'] = int(islamic_score)
         result['quality_score'] = quality_score
@@ -885,9 +1751,9 @@ class CompositeScorer:
         result['blocklist_reason'] = None
         result['components'] = components
         
-        logger.info(f"Page {page_id} final score: {final_score} (indexable={indexable})")
-        logger.debug(f"  Islamic: {islamic_score}, Quality: {quality_score}, "
-                    f"Authority: {authority_score}, Equity: +{equity_boost}")
+        logger.info("Page %s final score: %s (indexable=%s)", page_id, final_score, indexable)
+        logger.debug("  Islamic: %s, Quality: %s, Authority: %s, Equity: +%s",
+                     islamic_score, quality_score, authority_score, equity_boost)
         
         return result
     
@@ -900,66 +1766,62 @@ class CompositeScorer:
         Save scoring results to database
         Updates pages table and logs to page_scoring_logs
         """
+        self.save_scores_batch([result])
+    
+    def save_scores_batch(self, results):
+        """
+        Save many scoring results in one transaction: one UPDATE ... FROM
+        (VALUES ...) for pages and one multi-row INSERT for page_scoring_logs
+        per SAVE_PAGE_SIZE results, then a single commit
+        """
+        if not results:
+            return
+        
         cursor = self.db_conn.cursor()
         try:
-            # Update pages table
-            cursor.execute("""
-                UPDATE pages
-                SET islamic_alignment_score = %s,
-                    quality_score = %s,
-                    authority_score = %s,
-                    media_literacy_score = %s,
-                    equity_boost = %s,
-                    final_composite_score = %s,
-                    indexable = %s,
-                    scored_at = %s
-                WHERE id = %s
-            """, (
-                result['islamic_alignment_score'],
-                result['quality_score'],
-                result['authority_score'],
-                result['media_literacy_score'],
-                result['equity_boost'],
-                result['final_composite_score'],
-                result['indexable'],
-                result['scored_at'],
-                result['page_id']
-            ))
+            execute_values(
+                cursor,
+                UPDATE_PAGE_SCORES_SQL,
+                [self._page_scores_row(result) for result in results],
+                page_size=SAVE_PAGE_SIZE
+            )
             
-            # Log to page_scoring_logs for audit trail
-            components = result['components']
+            # Log to page_scoring_logs for audit trail (details shared by
+            # several results are wrapped once)
+            json_params = {}
+            execute_values(
+                cursor,
+                INSERT_SCORING_LOG_SQL,
+                [self._scoring_log_row(result, json_params) for result in results],
+                page_size=SAVE_PAGE_SIZE
+            )
             
-            cursor.execute("""
-                INSERT INTO page_scoring_logs (
-                    page_id, url,
-                    islamic_alignment_score, islamic_themes_matched,
-                    quality_score, quality_details,
-                    authority_score,
-                    equity_boost,
-                    media_literacy_score,
-                    final_composite_score,
-                    indexable,
-                    blocklist_reason,
-                    scored_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                result['page_id'],
-                result['url'],
-                result['islamic_alignment_score'],
-                json.dumps(components.get('islamic_alignment', {}).get('details', {})),
-                result['quality_score'],
-                json.dumps(components.get('quality', {}).get('details', {})),
-                result['authority_score'],
-                result['equity_boost'],
-                result['media_literacy_score'],
-                result['final_composite_score'],
-                result['indexable'],
-                result.get('blocklist_reason'),
-                result['scored_at']
-            ))
+            # Newly computed content components for later rescoring
+            cache_rows = {}
+            for result in results:
+                if 'cache_entry' in result:
+                    content_sha, algo_version, components = result['cache_entry']
+                    cache_rows[content_sha, algo_version] = Json(components, dumps=_JSON_DUMPS)
+            if cache_rows and self._scoring_cache_usable():
+                # A cache failure mustn't cost the scores saved above
+                try:
+                    with _savepoint(self.db_conn, cursor, 'scoring_cache_insert'):
+                        execute_values(
+                            cursor,
+                            INSERT_SCORING_CACHE_SQL,
+                            [(psycopg2.Binary(sha), algo_version, components)
+                             for (sha, algo_version), components in cache_rows.items()],
+                            page_size=SAVE_PAGE_SIZE
+                        )
+                except Exception as e:
+                    self._scoring_cache_retry_at = time.monotonic() + SCORING_CACHE_RETRY_SECONDS
+                    logger.info("Could not store scoring cache rows: %s", e)
             
             self.db_conn.commit()
-            logger.info(f"Scores saved for page {result['page_id']}")
+            if len(results) == 1:
+                logger.info("Scores saved for page %s", results[0]['page_id'])
+            else:
+                logger.info("Scores saved for %d pages", len(results))
             
         except Exception as e:
             self.db_conn.rollback()
@@ -968,7 +1830,53 @@ class CompositeScorer:
         finally:
             cursor.close()
     
-    def score_page(self, page_id, url, title, content, domain, crawled_at=None):
+    def _page_scores_row(self, result):
+        """VALUES row for UPDATE_PAGE_SCORES_SQL"""
+        return (
+            result['page_id'],
+            result['islamic_alignment_score'],
+            result['quality_score'],
+            result['authority_score'],
+            result['media_literacy_score'],
+            result['equity_boost'],
+            result['final_composite_score'],
+            result['indexable'],
+            result['scored_at']
+        )
+    
+    def _scoring_log_row(self, result, json_params=None):
+        """
+        VALUES row for INSERT_SCORING_LOG_SQL
+        JSON columns are passed as psycopg2 Json adapters; json_params
+        ({id(details): (details, Json)}) reuses one adapter per details dict
+        """
+        if json_params is None:
+            json_params = {}
+        
+        def as_json(details):
+            entry = json_params.get(id(details))
+            if entry is None:
+                entry = json_params[id(details)] = (details, Json(details, dumps=_JSON_DUMPS))
+            return entry[1]
+        
+        components = result['components']
+        return (
+            result['page_id'],
+            result['url'],
+            result['islamic_alignment_score'],
+            as_json(components.get('islamic_alignment', {}).get('details', {})),
+            result['quality_score'],
+            as_json(components.get('quality', {}).get('details', {})),
+            result['authority_score'],
+            result['equity_boost'],
+            result['media_literacy_score'],
+            result['final_composite_score'],
+            result['indexable'],
+            result.get('blocklist_reason'),
+            result['scored_at']
+        )
+    
+    def score_page(self, page_id, url, title, content, domain, crawled_at=None, now=None):
         """
         Main entry point: Score a page and save to database
         
@@ -979,27 +1887,182 @@ class CompositeScorer:
             content: Page text content
             domain: Domain name
             crawled_at: When page was crawled (datetime)
+            now: Reference time for age/freshness (default: datetime.now())
         
         Returns:
             Final composite score (0-100)
         """
         result = self.calculate_composite_score(
-            page_id, url, title, content, domain, crawled_at
+            page_id, url, title, content, domain, crawled_at, now
         )
         
         self.save_scores_to_db(result)
         
         return result['final_composite_score']
+    
+    def score_batch(self, pages):
+        """
+        Score and save a batch of pages (saved together, one commit)
+        All DB lookups (backlinks, domain age, equity, org blocklist) are
+        fetched up front with one query per table instead of per page
+        
+        Args:
+            pages: iterable of (page_id, url, title, content, domain, crawled_at)
+        
+        Returns:
+            dict: {page_id: final composite score}
+        """
+        pages = list(pages)
+        results = []
+        now = datetime.now()
+        
+        self._prefetch_batch(pages)
+        self._prefetch_media_literacy(pages)
+        try:
+            for page_id, url, title, content, domain, crawled_at in pages:
+                try:
+                    result = self.calculate_composite_score(
+                        page_id, url, title, content, domain, crawled_at, now
+                    )
+                    # Build the rows now so a result missing fields fails alone
+                    self._page_scores_row(result)
+                    self._scoring_log_row(result)
+                    results.append(result)
+                except Exception as e:
+                    logger.error(f"Error scoring page {page_id}: {e}")
+        finally:
+            self._link_counts_prefetch = {}
+            self._first_seen_prefetch = {}
+            self._components_prefetch = {}
+            self._media_prefetch = {}
+        
+        # One transaction for the whole batch
+        self.save_scores_batch(results)
+        
+        return {result['page_id']: result['final_composite_score'] for result in results}
+    
+    def _prefetch_media_literacy(self, pages):
+        """
+        Media literacy for every page of a batch that will need it (not in
+        scoring_cache, not org-blocked), with the OpenRouter calls made
+        concurrently; kept in self._media_prefetch by content hash
+        """
+        items = {}
+        for _, _, title, content, domain, _ in pages:
+            content_sha = _content_sha(domain, title, content)
+            if content_sha in items or self._components_prefetch.get(content_sha) is not None:
+                continue
+            if self.check_org_blocklist(domain)[0]:
+                continue
+            items[content_sha] = (content, domain, title, None)
+        
+        if not items:
+            return
+        
+        try:
+            from media_literacy_scorer import calculate_media_literacy_scores
+            results = calculate_media_literacy_scores(list(items.values()), db_conn=self.db_conn)
+        except Exception as e:
+            # Pages fall back to calculate_media_literacy_score one by one
+            logger.error(f"Batch media literacy scoring failed: {e}")
+            return
+        
+        self._media_prefetch = dict(zip(items, results))
+    
+    def _prefetch_batch(self, pages):
+        """
+        Load per-URL link counts, per-domain age/equity/blocklist rows and
+        scoring_cache entries for a batch of pages, one query per table
+        using = ANY(...)
+        """
+        content_shas = {_content_sha(domain, title, content)
+                        for _, _, title, content, domain, _ in pages}
+        self._components_prefetch = dict.fromkeys(content_shas)
+        self._components_prefetch.update(self._fetch_cached_components(content_shas))
+        
+        urls = list({url for _, url, _, _, _, _ in pages})
+        netlocs = set()
+        clean_domains = set()
+        for _, _, _, _, domain, _ in pages:
+            netlocs.add(_domain_netloc(domain))
+            clean_domains.add(_clean_domain(domain))
+        
+        equity_todo = [d for d in clean_domains
+                       if self._cache_get(self._equity_cache, 'equity', d) is None]
+        if self._get_blocklist_map() is not None:
+            blocklist_todo = []  # check_org_blocklist answers from memory
+        else:
+            blocklist_todo = [d for d in clean_domains
+                              if self._cache_get(self._blocklist_cache, 'blocklist', d) is None]
+        
+        cursor = self.db_conn.cursor()
+        try:
+            with _savepoint(self.db_conn, cursor, 'scorer_prefetch'):
+                cursor.execute("""
+                    SELECT l.target_url,
+                           COUNT(DISTINCT l.source_page_id) AS backlink_count,
+                           COUNT(DISTINCT CASE WHEN p.domain LIKE '%%.edu' THEN p.domain END) AS edu_refs,
+                           COUNT(DISTINCT CASE WHEN p.domain LIKE '%%.gov' THEN p.domain END) AS gov_refs
+                    FROM links l
+                    LEFT JOIN pages p ON l.source_page_id = p.id
+                    WHERE l.target_url = ANY(%s)
+                    GROUP BY l.target_url
+                """, (urls,))
+                self._link_counts_prefetch = {url: (0, 0, 0) for url in urls}
+                for url, backlinks, edu_refs, gov_refs in cursor.fetchall():
+                    self._link_counts_prefetch[url] = (backlinks, edu_refs, gov_refs)
+                
+                cursor.execute("""
+                    SELECT domain, MIN(crawled_at) AS first_seen
+                    FROM pages
+                    WHERE domain = ANY(%s)
+                    GROUP BY domain
+                """, (list(netlocs),))
+                self._first_seen_prefetch = {netloc: None for netloc in netlocs}
+                self._first_seen_prefetch.update(cursor.fetchall())
+                
+                if equity_todo:
+                    cursor.execute("""
+                        SELECT domain, minority_owned, women_owned, veteran_owned, 
+                               b_corp, lgbtq_owned, disability_owned
+                        FROM equity_domains
+                        WHERE domain = ANY(%s)
+                    """, (equity_todo,))
+                    rows = {row[0]: row[1:] for row in cursor.fetchall()}
+                    for domain_clean in equity_todo:
+                        self._equity_from_row(domain_clean, rows.get(domain_clean))
+                
+                if blocklist_todo:
+                    cursor.execute("""
+                        SELECT domain, splc_flagged, aclu_flagged, cair_flagged, 
+                               adl_flagged, other_org_flagged, reason
+                        FROM org_blocklist
+                        WHERE domain = ANY(%s)
+                    """, (blocklist_todo,))
+                    rows = {row[0]: row[1:] for row in cursor.fetchall()}
+                    for domain_clean in blocklist_todo:
+                        self._blocklist_from_row(domain_clean, rows.get(domain_clean))
+            
+        except Exception as e:
+            # Fall back to per-page lookups
+            logger.error(f"Error prefetching batch scoring data: {e}")
+            self._link_counts_prefetch = {}
+            self._first_seen_prefetch = {}
+        finally:
+            cursor.close()
 
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
-def score_page_by_id(db_conn, page_id):
+def score_page_by_id(db_conn, page_id, scorer=None):
     """
     Score a page by its database ID
     Convenience function that fetches page data and scores it
+    
+    Args:
+        scorer: CompositeScorer to reuse (a new one is built if omitted)
     """
     cursor = db_conn.cursor()
     try:
@@ -1015,7 +2078,8 @@ def score_page_by_id(db_conn, page_id):
         
         page_id, url, domain, title, content, crawled_at = result
         
-        scorer = CompositeScorer(db_conn)
+        if scorer is None:
+            scorer = CompositeScorer(db_conn)
         final_score = scorer.score_page(
             page_id, url, title, content, domain, crawled_at
         )
@@ -1026,43 +2090,188 @@ def score_page_by_id(db_conn, page_id):
         cursor.close()
 
 
-def rescore_all_pages(db_conn, limit=None):
+def rescore_all_pages(db_conn, limit=None, shard=None, progress=None):
     """
     Rescore all pages in database
     Useful for applying updated scoring algorithms
     
+    Page IDs are streamed from a server-side cursor; content is fetched
+    RESCORE_BATCH_SIZE pages at a time with one = ANY(...) query, and one
+    CompositeScorer is shared by every batch, so memory stays O(batch)
+    
     Args:
         db_conn: Database connection
         limit: Max number of pages to rescore (None = all)
+        shard: (k, n) to only rescore pages with id % n == k
+        progress: Called with the size of each scored batch (replaces the
+                  per-batch progress log)
+    
+    Returns:
+        Number of pages rescored
     """
+    query = "SELECT id FROM pages WHERE content IS NOT NULL"
+    params = ()
+    if shard is not None:
+        query += " AND id %% %s = %s"
+        params = (shard[1], shard[0])
+    query += " ORDER BY id"
+    if limit:
+        query += f" LIMIT {limit}"
+    
+    # WITH HOLD so the cursor survives score_batch's commits
+    id_cursor = db_conn.cursor(name='rescore_ids', withhold=True)
+    id_cursor.itersize = RESCORE_ID_FETCH_SIZE
     cursor = db_conn.cursor()
+    scorer = None
+    scored = 0
     try:
-        query = "SELECT id FROM pages WHERE content IS NOT NULL"
-        if limit:
-            query += f" LIMIT {limit}"
-        
-        cursor.execute(query)
-        page_ids = [row[0] for row in cursor.fetchall()]
-        
-        logger.info(f"Rescoring {len(page_ids)} pages...")
+        id_cursor.execute(query, params)
+        db_conn.commit()
         
+        logger.info("Rescoring pages...")
         scorer = CompositeScorer(db_conn)
         
-        for i, page_id in enumerate(page_ids, 1):
-            try:
-                score_page_by_id(db_conn, page_id)
-                
-                if i % 100 == 0:
-                    logger.info(f"Progress: {i}/{len(page_ids)} pages scored")
-                    
-            except Exception as e:
-                logger.error(f"Error scoring page {page_id}: {e}")
-                continue
+        while True:
+            page_ids = [row[0] for row in islice(id_cursor, RESCORE_BATCH_SIZE)]
+            if not page_ids:
+                break
+            
+            cursor.execute("""
+                SELECT id, url, title, content, domain, crawled_at
+                FROM pages
+                WHERE id = ANY(%s)
+            """, (page_ids,))
+            scorer.score_batch(cursor.fetchall())
+            scored += len(page_ids)
+            if progress is not None:
+                progress(len(page_ids))
+            else:
+                logger.info("Progress: %d pages scored", scored)
         
-        logger.info(f"Rescoring complete: {len(page_ids)} pages processed")
+        logger.info("Rescoring complete: %d pages processed", scored)
+        return scored
         
+    finally:
+        if scorer is not None:
+            scorer.close()
+        cursor.close()
+        id_cursor.close()
+
+
+# Shared page counter for rescore_all_pages_parallel workers
+_rescore_progress = None
+
+
+def _init_rescore_worker(counter):
+    """ProcessPoolExecutor initializer: keep the shared progress counter"""
+    global _rescore_progress
+    _rescore_progress = counter
+
+
+def _report_rescore_progress(count):
+    with _rescore_progress.get_lock():
+        _rescore_progress.value += count
+        total = _rescore_progress.value
+    logger.info("Progress: %d pages scored (all workers)", total)
+
+
+def _rescore_shard(database_url, shard, shard_count):
+    """Worker task: rescore one id % shard_count partition on its own connection"""
+    conn = psycopg2.connect(database_url)
+    try:
+        return rescore_all_pages(
+            conn, shard=(shard, shard_count), progress=_report_rescore_progress
+        )
+    finally:
+        conn.close()
+
+
+def rescore_all_pages_parallel(database_url, workers=None):
+    """
+    rescore_all_pages across worker processes (scoring is CPU-bound, so
+    threads would serialize on the GIL)
+    Pages are partitioned by id % workers; each worker has its own
+    connection and CompositeScorer
+    
+    Args:
+        database_url: DSN each worker connects with
+        workers: Number of processes (default: os.cpu_count())
+    
+    Returns:
+        Number of pages rescored
+    """
+    workers = workers or os.cpu_count() or 1
+    counter = multiprocessing.Value('q', 0)
+    
+    logger.info("Rescoring pages with %d workers...", workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_rescore_worker,
+                             initargs=(counter,)) as executor:
+        futures = [executor.submit(_rescore_shard, database_url, shard, workers)
+                   for shard in range(workers)]
+        scored = sum(future.result() for future in futures)
+    
+    logger.info("Parallel rescoring complete: %d pages processed", scored)
+    return scored
+
+
+def rescore_all_composites_only(db_conn):
+    """
+    Recompute final_composite_score/indexable from the stored component
+    scores, for when only COMPOSITE_WEIGHTS changed
+    One UPDATE does the weighted sum inside PostgreSQL (float8 arithmetic
+    and round(), which ties to even like Python's round), so no rows leave
+    the database; pages never scored and pages zeroed by the org
+    blocklist are left alone
+    
+    Returns:
+        Number of pages whose score or indexability changed
+    """
+    w_islamic, w_quality, w_authority, w_media, w_equity = COMPOSITE_WEIGHTS
+    
+    cursor = db_conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE pages
+            SET final_composite_score = c.final_composite_score,
+                indexable = c.final_composite_score >= %(min_score)s
+            FROM (
+                SELECT id, round(
+                    (islamic_alignment_score::float8 + 100) / 2 * %(islamic)s::float8 +
+                    quality_score::float8 * %(quality)s::float8 +
+                    authority_score::float8 * %(authority)s::float8 +
+                    media_literacy_score::float8 * %(media)s::float8 +
+                    equity_boost::float8 * %(equity)s::float8
+                )::int AS final_composite_score
+                FROM pages
+                WHERE islamic_alignment_score IS NOT NULL
+                  AND quality_score IS NOT NULL
+                  AND authority_score IS NOT NULL
+                  AND media_literacy_score IS NOT NULL
+                  AND equity_boost IS NOT NULL
+                  AND final_composite_score <> 0
+            ) AS c
+            WHERE pages.id = c.id
+              AND (pages.final_composite_score IS DISTINCT FROM c.final_composite_score
+                   OR pages.indexable IS DISTINCT FROM (c.final_composite_score >= %(min_score)s))
+        """, {
+            'islamic': w_islamic,
+            'quality': w_quality,
+            'authority': w_authority,
+            'media': w_media,
+            'equity': w_equity,
+            'min_score': INDEXABLE_MIN_SCORE,
+        })
+        updated = cursor.rowcount
+        db_conn.commit()
+    except Exception as e:
+        db_conn.rollback()
+        logger.error(f"Error recomputing composite scores: {e}")
+        raise
     finally:
         cursor.close()
+    
+    logger.info("Composite rescore complete: %d pages changed", updated)
+    return updated
 
 
 # ============================================================================
@@ -1107,13 +2316,15 @@ if __name__ == '__main__':
     
     print(f"\nScoring {len(test_pages)} test pages...\n")
     
+    scorer = CompositeScorer(conn)
     for page_id, url, domain in test_pages:
         try:
-            score = score_page_by_id(conn, page_id)
+            score = score_page_by_id(conn, page_id, scorer=scorer)
             print(f"âœ… {domain}: {score}/100")
         except Exception as e:
             print(f"âŒ {domain}: Error - {e}")
     
+    scorer.close()
     conn.close()
     
     print("\n" + "="*60)
@@ -3,18 +3,25 @@ NotHere.one Web Crawler
 Production-ready crawler with Tier 1 filtering
 """
 
+import io
 import os
 import sys
+import math
 import time
 import argparse
 import logging
+from collections import deque
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 from datetime import datetime, UTC
-import hashlib
+from functools import lru_cache
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+
+import blake3
+import httpx
+from cachetools import LRUCache
+from lxml import html as lxml_html
 import psycopg2
 from psycopg2.extras import execute_values
 
@@ -30,18 +37,146 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Crawled pages written (COPY), scored and followed together
+PAGE_BATCH_SIZE = 50
+
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# Concurrent fetches (one in flight per host at a time) and HTTP client pool
+CRAWL_CONCURRENCY = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+FETCH_TIMEOUT = 10
+
+# Pages larger than this are skipped (checked against Content-Length, then
+# while streaming the body)
+MAX_PAGE_BYTES = 5_000_000
+
+# Distinct links kept per page (saved to links and offered to the queue)
+MAX_LINKS_PER_PAGE = 500
+QUEUE_POLL_INTERVAL = 0.5
+
+# Hosts tracked for politeness before idle ones (unlocked, last fetched more
+# than politeness_delay + FETCH_TIMEOUT ago) are dropped
+HOST_STATE_MAX_SIZE = 4096
+
+# URLs taken from Redis per round-trip, shared by all workers
+DEQUEUE_BATCH_SIZE = 32
+
+# robots.txt bodies shared through Redis, parsed rules kept per process
+ROBOTS_CACHE_TTL = 24 * 3600
+ROBOTS_MEMORY_CACHE_SIZE = 4096
+
+# Bloom filter of crawled url_hashes: sized for BLOOM_CAPACITY pages at
+# BLOOM_ERROR_RATE false positives (~18 MB)
+BLOOM_CAPACITY = 10_000_000
+BLOOM_ERROR_RATE = 0.001
+CRAWLED_HASH_FETCH_SIZE = 50_000
+
+# Pages rehashed per round-trip when moving old SHA-256 url_hash values
+URL_HASH_MIGRATION_BATCH = 5_000
+
+# Set in Redis once no old url_hash values remain, so later starts skip the
+# (unindexed) full scan for them
+URL_HASH_MIGRATED_KEY = 'crawler:url_hash_migrated'
+
+# Recently hashed URLs kept by _url_hash
+URL_HASH_CACHE_SIZE = 65_536
+
+
+def _copy_row(values):
+    """Format one row for COPY ... FROM STDIN text format (None -> \\N)"""
+    fields = []
+    for value in values:
+        if value is None:
+            fields.append('\\N')
+            continue
+        fields.append(str(value).replace('\\', '\\\\')
+                                .replace('\t', '\\t')
+                                .replace('\n', '\\n')
+                                .replace('\r', '\\r'))
+    return '\t'.join(fields) + '\n'
+
+
+@lru_cache(maxsize=URL_HASH_CACHE_SIZE)
+def _url_hash(url):
+    """
+    Dedup key for a URL: BLAKE3 truncated to 128 bits (32 hex chars)
+    Only compared for equality, so a cryptographic hash isn't needed
+    Memoized: discovered links repeat across pages and each URL is hashed
+    again when queued, crawled and saved
+    """
+    return blake3.blake3(url.encode()).hexdigest(length=16)
+
+
+def _robots_parser(base_url, status, body):
+    """
+    Build a RobotFileParser from a robots.txt response
+    Status handling mirrors RobotFileParser.read()
+    """
+    rp = RobotFileParser()
+    rp.set_url(urljoin(base_url, '/robots.txt'))
+    
+    if status in (401, 403):
+        rp.disallow_all = True
+    elif 400 <= status < 500:
+        rp.allow_all = True
+    elif status < 400:
+        rp.parse(body.splitlines())
+    
+    return rp
+
+
+class UrlHashBloom:
+    """
+    Bloom filter over url_hash hex digests
+    The digests are already 128-bit BLAKE3 (exactly 32 hex chars), so bit
+    positions are taken straight from their two 64-bit halves (double
+    hashing) instead of rehashing
+    """
+    
+    def __init__(self, capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE):
+        self.num_bits = int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, url_hash):
+        h1 = int(url_hash[:16], 16)
+        h2 = int(url_hash[16:32], 16) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def add(self, url_hash):
+        for pos in self._positions(url_hash):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, url_hash):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url_hash))
+
 
 class Crawler:
     """
     Web crawler with built-in Tier 1 filtering
     """
     
-    def __init__(self, redis_manager, db_conn, politeness_delay=1.0):
+    def __init__(self, redis_manager, db_conn, politeness_delay=1.0, concurrency=CRAWL_CONCURRENCY):
         self.redis = redis_manager
         self.db_conn = db_conn
         self.blocklist = get_blocklist()
         self.politeness_delay = politeness_delay
-        self.robots_cache = {}  # Cache robots.txt parsers
+        self.concurrency = concurrency
+        
+        # Async crawl state (see crawl)
+        self._client = None
+        self._host_locks = {}       # netloc -> asyncio.Lock
+        self._host_last_fetch = {}  # netloc -> time.monotonic() of last request
+        self._urls_dequeued = 0
+        self._in_flight = 0
+        self._url_buffer = deque()  # dequeued from Redis, not yet taken
+        self.robots_cache = LRUCache(maxsize=ROBOTS_MEMORY_CACHE_SIZE)  # Cache robots.txt parsers
+        self._pending_pages = {}  # url_hash -> crawled page awaiting flush_pages
+        self._flushing_pages = {}  # url_hash -> page being saved by _flush_pending
+        self._flush_lock = None    # asyncio.Lock, one flush at a time (see _crawl_async)
+        self._migrate_url_hashes()
+        self._crawled_bloom = self._load_crawled_hashes()
         
         # Initialize composite scorer
         self.scorer = CompositeScorer(db_conn)
@@ -79,10 +214,95 @@ class Crawler:
     
     def get_url_hash(self, url):
         """Generate hash for URL (for deduplication)"""
-        return hashlib.sha256(url.encode()).hexdigest()
+        return _url_hash(url)
+    
+    def _migrate_url_hashes(self):
+        """
+        Rewrite url_hash for pages saved under the old SHA-256 scheme
+        (64 hex chars) to the current BLAKE3 hash, in id order batches
+        Skipped once a previous run has recorded completion in Redis
+        """
+        if self.redis.cache_get(URL_HASH_MIGRATED_KEY):
+            return
+        
+        cursor = self.db_conn.cursor()
+        migrated = 0
+        
+        try:
+            last_id = 0
+            while True:
+                cursor.execute("""
+                    SELECT id, url FROM pages
+                    WHERE id > %s AND length(url_hash) = 64
+                    ORDER BY id
+                    LIMIT %s
+                """, (last_id, URL_HASH_MIGRATION_BATCH))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                
+                execute_values(
+                    cursor,
+                    """
+                    UPDATE pages SET url_hash = v.url_hash
+                    FROM (VALUES %s) AS v(id, url_hash)
+                    WHERE pages.id = v.id
+                    """,
+                    [(page_id, _url_hash(url)) for page_id, url in rows],
+                    page_size=URL_HASH_MIGRATION_BATCH
+                )
+                self.db_conn.commit()
+                
+                migrated += len(rows)
+                last_id = rows[-1][0]
+            
+            if migrated:
+                logger.info(f"Migrated url_hash of {migrated} pages to BLAKE3")
+            self.redis.cache_set(URL_HASH_MIGRATED_KEY, '1', ttl=None)
+            
+        except Exception as e:
+            self.db_conn.rollback()
+            logger.error(f"Error migrating url hashes: {e}")
+        finally:
+            cursor.close()
+    
+    def _load_crawled_hashes(self):
+        """
+        Stream every url_hash in pages into a bloom filter so most
+        is_url_crawled checks never reach the database
+        Returns None (always query) if pages can't be read
+        """
+        bloom = UrlHashBloom()
+        cursor = self.db_conn.cursor(name='crawled_hashes')
+        cursor.itersize = CRAWLED_HASH_FETCH_SIZE
+        
+        try:
+            cursor.execute("SELECT url_hash FROM pages")
+            count = 0
+            for (url_hash,) in cursor:
+                bloom.add(url_hash)
+                count += 1
+            
+            logger.info(f"Loaded {count} crawled URL hashes into bloom filter")
+            return bloom
+            
+        except Exception as e:
+            self.db_conn.rollback()
+            logger.warning(f"Could not preload crawled URLs, checking each in the database: {e}")
+            return None
+        finally:
+            cursor.close()
     
     def is_url_crawled(self, url_hash):
         """Check if URL has already been crawled"""
+        # Crawled but not yet flushed to the database
+        if url_hash in self._pending_pages or url_hash in self._flushing_pages:
+            return True
+        
+        # Definitely never saved by this crawler or before it started
+        if self._crawled_bloom is not None and url_hash not in self._crawled_bloom:
+            return False
+        
         cursor = self.db_conn.cursor()
         cursor.execute(
             "SELECT 1 FROM pages WHERE url_hash = %s LIMIT 1",
@@ -92,7 +312,7 @@ class Crawler:
         cursor.close()
         return result is not None
     
-    def can_fetch(self, url):
+    async def can_fetch(self, url):
         """Check robots.txt to see if we can fetch this URL"""
         try:
             parsed = urlparse(url)
@@ -100,17 +320,7 @@ class Crawler:
             
             # Check cache
             if base_url not in self.robots_cache:
-                robots_url = urljoin(base_url, '/robots.txt')
-                rp = RobotFileParser()
-                rp.set_url(robots_url)
-                
-                try:
-                    rp.read()
-                    self.robots_cache[base_url] = rp
-                except Exception as e:
-                    logger.debug(f"Could not read robots.txt for {base_url}: {e}")
-                    # If robots.txt doesn't exist or can't be read, allow crawling
-                    self.robots_cache[base_url] = None
+                self.robots_cache[base_url] = await self._load_robots(base_url)
             
             rp = self.robots_cache[base_url]
             if rp is None:
@@ -123,59 +333,137 @@ class Crawler:
             # Default to allowing if check fails
             return True
     
-    def fetch_page(self, url):
-        """Fetch page content"""
+    async def _load_robots(self, base_url):
+        """
+        Get robots.txt rules for a host, shared across crawler processes
+        through Redis ("<status>\\n<body>" for ROBOTS_CACHE_TTL); only a
+        Redis miss fetches it over HTTP
+        Returns None if it can't be fetched (crawling is allowed)
+        """
+        key = f'robots:{base_url}'
+        cached = self.redis.cache_get(key)
+        if cached is not None:
+            status, _, body = cached.partition('\n')
+            return _robots_parser(base_url, int(status), body)
+        
+        robots_url = urljoin(base_url, '/robots.txt')
         try:
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=10,
-                allow_redirects=True
-            )
-            
-            # Only process successful responses with HTML content
-            if response.status_code != 200:
-                logger.warning(f"Non-200 status {response.status_code} for {url}")
-                return None
-            
-            content_type = response.headers.get('Content-Type', '').lower()
-            if 'text/html' not in content_type:
-                logger.debug(f"Skipping non-HTML content for {url}: {content_type}")
-                return None
-            
-            return response
+            response = await self._client.get(robots_url, timeout=FETCH_TIMEOUT)
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not read robots.txt for {base_url}: {e}")
+            # If robots.txt doesn't exist or can't be read, allow crawling
+            return None
+        
+        # Server errors are transient - don't share them with other workers
+        if response.status_code < 500:
+            self.redis.cache_add(key, f"{response.status_code}\n{response.text}", ROBOTS_CACHE_TTL)
+        
+        return _robots_parser(base_url, response.status_code, response.text)
+    
+    async def fetch_page(self, url):
+        """
+        Fetch page content
+        The response is streamed: non-HTML and oversized (MAX_PAGE_BYTES)
+        responses are dropped after the headers instead of downloaded
+        
+        Returns:
+            tuple: (final URL after redirects, HTML text), or None
+        """
+        try:
+            async with self._client.stream('GET', url, timeout=FETCH_TIMEOUT) as response:
+                # Only process successful responses with HTML content
+                if response.status_code != 200:
+                    logger.warning(f"Non-200 status {response.status_code} for {url}")
+                    return None
+                
+                content_type = response.headers.get('Content-Type', '').lower()
+                if 'text/html' not in content_type:
+                    logger.debug(f"Skipping non-HTML content for {url}: {content_type}")
+                    return None
+                
+                content_length = response.headers.get('Content-Length', '')
+                if content_length.isdigit() and int(content_length) > MAX_PAGE_BYTES:
+                    logger.debug(f"Skipping oversized page {url}: {content_length} bytes")
+                    return None
+                
+                # Content-Length can be missing or wrong, so cap the body too
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) > MAX_PAGE_BYTES:
+                        logger.debug(f"Skipping oversized page {url}: over {MAX_PAGE_BYTES} bytes")
+                        return None
+                
+                html = body.decode(response.encoding or 'utf-8', errors='replace')
+                return str(response.url), html
             
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.warning(f"Timeout fetching {url}")
             return None
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
+    async def _wait_for_host(self, url):
+        """
+        Per-host politeness: hold the host's lock and wait until
+        politeness_delay has passed since the last request to it
+        Returns the acquired lock (caller releases it after fetching)
+        """
+        host = urlparse(url).netloc
+        if host not in self._host_locks and len(self._host_locks) >= HOST_STATE_MAX_SIZE:
+            self._prune_host_state()
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        await lock.acquire()
+        
+        wait = self._host_last_fetch.get(host, 0) + self.politeness_delay - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._host_last_fetch[host] = time.monotonic()
+        return lock
+    
+    def _prune_host_state(self):
+        """
+        Forget hosts whose politeness delay has run out and whose lock
+        nobody holds, so _host_locks / _host_last_fetch don't grow with
+        every host ever crawled
+        """
+        idle_before = time.monotonic() - self.politeness_delay - FETCH_TIMEOUT
+        for host, lock in list(self._host_locks.items()):
+            if not lock.locked() and self._host_last_fetch.get(host, 0) < idle_before:
+                del self._host_locks[host]
+                self._host_last_fetch.pop(host, None)
+    
     def extract_content(self, html, base_url):
         """Extract title, text content, and links from HTML"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            # lxml's C parser; bytes + explicit encoding so pages with an
+            # XML declaration still parse
+            tree = lxml_html.document_fromstring(html.encode('utf-8'), parser=_HTML_PARSER)
             
-            # Remove script and style elements
-            for script in soup(['script', 'style', 'nav', 'footer', 'header']):
-                script.decompose()
+            # Remove script and style elements and comments (their tail
+            # text is kept)
+            for element in tree.xpath('//script|//style|//nav|//footer|//header|//comment()'):
+                element.drop_tree()
             
             # Extract title
             title = None
-            if soup.title:
-                title = soup.title.string.strip() if soup.title.string else None
+            title_element = tree.find('.//title')
+            if title_element is not None:
+                title = title_element.text_content().strip()
             
-            # Extract main text content
-            text_content = soup.get_text(separator=' ', strip=True)
+            # Extract main text content, whitespace collapsed
+            text_content = ' '.join(' '.join(tree.itertext()).split())
             
-            # Clean up whitespace
-            text_content = ' '.join(text_content.split())
-            
-            # Extract links
+            # Extract links (once per target URL, first occurrence wins, at
+            # most MAX_LINKS_PER_PAGE so link farms stay bounded)
             links = []
-            for link in soup.find_all('a', href=True):
-                href = link['href']
+            seen_urls = set()
+            for link in tree.xpath('//a[@href]'):
+                if len(links) >= MAX_LINKS_PER_PAGE:
+                    break
+                
+                href = link.get('href')
                 
                 # Skip non-http(s) links
                 if href.startswith(('mailto:', 'tel:', 'javascript:')):
@@ -186,9 +474,12 @@ class Crawler:
                 
                 # Normalize
                 absolute_url = self.normalize_url(absolute_url)
+                if absolute_url in seen_urls:
+                    continue
+                seen_urls.add(absolute_url)
                 
                 # Get link text
-                link_text = link.get_text(strip=True)
+                link_text = ''.join(text.strip() for text in link.itertext())
                 
                 links.append({
                     'url': absolute_url,
@@ -205,60 +496,94 @@ class Crawler:
             logger.error(f"Error extracting content: {e}")
             return None
     
-    def save_page(self, url, url_hash, title, content, crawled_at):
-        """Save page to database"""
+    def save_pages(self, pages):
+        """
+        Save a batch of pages with one COPY into a staging table and one
+        upsert into pages
+        Returns dict: {url_hash: page_id} for the pages that were saved
+        """
+        buf = io.StringIO()
+        for page in pages:
+            buf.write(_copy_row((
+                page['url'], page['url_hash'], urlparse(page['url']).netloc,
+                page['title'], page['content'], page['crawled_at']
+            )))
+        buf.seek(0)
+        
         cursor = self.db_conn.cursor()
         
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc
-            
+            cursor.execute("""
+                CREATE TEMP TABLE _pages_stage (
+                    url text, url_hash text, domain text,
+                    title text, content text, crawled_at timestamp
+                ) ON COMMIT DROP
+            """)
+            cursor.copy_expert(
+                "COPY _pages_stage FROM STDIN WITH (FORMAT text)",
+                buf
+            )
             cursor.execute("""
                 INSERT INTO pages (url, url_hash, domain, title, content, crawled_at, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                SELECT url, url_hash, domain, title, content, crawled_at, crawled_at
+                FROM _pages_stage
                 ON CONFLICT (url_hash) 
                 DO UPDATE SET
                     title = EXCLUDED.title,
                     content = EXCLUDED.content,
                     crawled_at = EXCLUDED.crawled_at
-                RETURNING id
-            """, (url, url_hash, domain, title, content, crawled_at, crawled_at))
+                RETURNING id, url_hash
+            """)
             
-            page_id = cursor.fetchone()[0]
+            page_ids = {url_hash: page_id for page_id, url_hash in cursor.fetchall()}
             self.db_conn.commit()
             
-            return page_id
+            if self._crawled_bloom is not None:
+                for url_hash in page_ids:
+                    self._crawled_bloom.add(url_hash)
+            
+            return page_ids
             
         except Exception as e:
             self.db_conn.rollback()
-            logger.error(f"Error saving page {url}: {e}")
-            return None
+            logger.error(f"Error saving {len(pages)} pages: {e}")
+            return {}
         finally:
             cursor.close()
     
-    def save_links(self, source_page_id, links):
-        """Save links to database"""
-        if not links:
+    def save_links(self, link_rows):
+        """
+        Save links to database
+        
+        Args:
+            link_rows: list of (source_page_id, target_url, link_text)
+        """
+        if not link_rows:
             return
         
+        buf = io.StringIO()
+        for row in link_rows:
+            buf.write(_copy_row(row))
+        buf.seek(0)
+        
         cursor = self.db_conn.cursor()
         
         try:
-            # Prepare data for batch insert
-            link_data = [
-                (source_page_id, link['url'], link['text'])
-                for link in links
-            ]
-            
-            execute_values(
-                cursor,
-                """
+            cursor.execute("""
+                CREATE TEMP TABLE _links_stage (
+                    source_page_id integer, target_url text, link_text text
+                ) ON COMMIT DROP
+            """)
+            cursor.copy_expert(
+                "COPY _links_stage FROM STDIN WITH (FORMAT text)",
+                buf
+            )
+            cursor.execute("""
                 INSERT INTO links (source_page_id, target_url, link_text)
-                VALUES %s
+                SELECT source_page_id, target_url, link_text
+                FROM _links_stage
                 ON CONFLICT DO NOTHING
-                """,
-                link_data
-            )
+            """)
             
             self.db_conn.commit()
             
@@ -268,6 +593,85 @@ class Crawler:
         finally:
             cursor.close()
     
+    async def _flush_pending(self):
+        """
+        Run flush_pages in a worker thread so saving and scoring don't stall
+        the event loop; the lock keeps it to one flush at a time, so only
+        that thread writes on the database connection (psycopg2 serializes
+        it with the loop's lookups)
+        """
+        async with self._flush_lock:
+            if not self._pending_pages:
+                return
+            # Taken on the loop, so pages crawled meanwhile go to the next flush
+            self._flushing_pages, self._pending_pages = self._pending_pages, {}
+            try:
+                await asyncio.to_thread(self.flush_pages, list(self._flushing_pages.values()))
+            finally:
+                self._flushing_pages = {}
+    
+    def flush_pages(self, pending=None):
+        """
+        Save, score and follow the links of every page crawled since the
+        last flush (or of pending, pages already taken from _pending_pages)
+        Pages are written in one COPY batch, so their links are only queued
+        once the batch has page IDs
+        """
+        if pending is None:
+            pending = list(self._pending_pages.values())
+            self._pending_pages = {}
+        if not pending:
+            return
+        
+        page_ids = self.save_pages(pending)
+        saved = [page for page in pending if page['url_hash'] in page_ids]
+        self.stats['pages_failed'] += len(pending) - len(saved)
+        if not saved:
+            return
+        
+        # Save links
+        self.save_links([
+            (page_ids[page['url_hash']], link['url'], link['text'])
+            for page in saved
+            for link in page['links']
+        ])
+        
+        # Score the pages with composite scorer
+        try:
+            scores = self.scorer.score_batch([
+                (page_ids[page['url_hash']], page['url'], page['title'],
+                 page['content'], urlparse(page['url']).netloc, page['crawled_at'])
+                for page in saved
+            ])
+        except Exception as e:
+            logger.error(f"   ❌ Scoring failed: {e}")
+            scores = {}
+        
+        self.stats['pages_scored'] += len(scores)
+        self.stats['pages_score_failed'] += len(saved) - len(scores)
+        
+        for page in saved:
+            final_score = scores.get(page_ids[page['url_hash']])
+            
+            # Log score for visibility
+            if final_score is None:
+                pass
+            elif final_score < 40:
+                logger.info(f"   📊 Score: {final_score}/100 (NOT INDEXABLE) - {page['url']}")
+            elif final_score >= 70:
+                logger.info(f"   📊 Score: {final_score}/100 ✅ - {page['url']}")
+            else:
+                logger.info(f"   📊 Score: {final_score}/100 - {page['url']}")
+            
+            # Update stats
+            self.stats['pages_crawled'] += 1
+            self.stats['links_found'] += len(page['links'])
+            
+            logger.info(f"✅ Crawled successfully: {page['url']} ({len(page['links'])} links found)")
+        
+        # Queue new URLs from the whole batch at once
+        self.queue_urls([link['url'] for page in saved for link in page['links']])
+    
     def queue_url(self, url):
         """Add URL to crawl queue if not blocked and not already crawled"""
         # Check blocklist
@@ -276,6 +680,60 @@ class Crawler:
             logger.debug(f"Blocked URL (not queuing): {url} - {reason}")
             return False
         
+        return self._enqueue_if_uncrawled(url)
+    
+    def queue_urls(self, urls):
+        """
+        Queue a batch of URLs (e.g. a page's links)
+        The whole batch is classified against the blocklist in one call,
+        checked against pages in one query and pushed to Redis in one
+        pipeline
+        """
+        urls = list(dict.fromkeys(urls))
+        blocked = self.blocklist.is_blocked_batch(urls)
+        
+        candidates = {}
+        for url, is_blocked in zip(urls, blocked):
+            if is_blocked:
+                logger.debug(f"Blocked URL (not queuing): {url}")
+                continue
+            url_hash = self.get_url_hash(url)
+            if url_hash not in self._pending_pages and url_hash not in self._flushing_pages:
+                candidates[url_hash] = url
+        
+        crawled = self._crawled_hashes(list(candidates))
+        to_queue = [url for url_hash, url in candidates.items() if url_hash not in crawled]
+        if not to_queue:
+            return 0
+        
+        # Add to queue
+        self.redis.enqueue_urls(to_queue)
+        self.stats['urls_queued'] += len(to_queue)
+        return len(to_queue)
+    
+    def _crawled_hashes(self, url_hashes):
+        """
+        Subset of url_hashes already saved in pages
+        Hashes the bloom filter rules out never reach the database; the rest
+        are looked up in one query
+        """
+        if self._crawled_bloom is not None:
+            url_hashes = [url_hash for url_hash in url_hashes if url_hash in self._crawled_bloom]
+        if not url_hashes:
+            return set()
+        
+        cursor = self.db_conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT url_hash FROM pages WHERE url_hash = ANY(%s)",
+                (url_hashes,)
+            )
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+    
+    def _enqueue_if_uncrawled(self, url):
+        """Add an already blocklist-checked URL to the queue unless crawled"""
         # Check if already crawled
         url_hash = self.get_url_hash(url)
         if self.is_url_crawled(url_hash):
@@ -287,7 +745,7 @@ class Crawler:
         self.stats['urls_queued'] += 1
         return True
     
-    def crawl_url(self, url):
+    async def crawl_url(self, url):
         """Crawl a single URL"""
         logger.info(f"Crawling: {url}")
         
@@ -308,22 +766,24 @@ class Crawler:
             return
         
         # Check robots.txt
-        if not self.can_fetch(url):
+        if not await self.can_fetch(url):
             logger.warning(f"🤖 Disallowed by robots.txt: {url}")
             self.stats['pages_blocked'] += 1
             return
         
-        # Politeness delay
-        time.sleep(self.politeness_delay)
+        # Politeness delay (per host; other hosts are fetched meanwhile)
+        host_lock = await self._wait_for_host(url)
+        try:
+            fetched = await self.fetch_page(url)
+        finally:
+            host_lock.release()
         
-        # Fetch page
-        response = self.fetch_page(url)
-        if response is None:
+        if fetched is None:
             self.stats['pages_failed'] += 1
             return
         
-        # Get final URL after redirects
-        final_url = response.url
+        # Final URL is after redirects
+        final_url, html = fetched
         final_url_hash = self.get_url_hash(final_url)
         
         # Check if redirected URL is blocked
@@ -335,102 +795,109 @@ class Crawler:
                 return
         
         # Extract content
-        extracted = self.extract_content(response.text, final_url)
+        extracted = self.extract_content(html, final_url)
         if extracted is None:
             self.stats['pages_failed'] += 1
             return
         
-        # Save page
-        crawled_at = datetime.utcnow()
-        page_id = self.save_page(
-            final_url,
-            final_url_hash,
-            extracted['title'],
-            extracted['content'],
-            crawled_at
-        )
-        
-        if page_id is None:
-            self.stats['pages_failed'] += 1
-            return
-        
-        # Save links
-        self.save_links(page_id, extracted['links'])
-        
-        # Score the page with composite scorer
-        try:
-            parsed = urlparse(final_url)
-            domain = parsed.netloc
-            
-            final_score = self.scorer.score_page(
-                page_id=page_id,
-                url=final_url,
-                title=extracted['title'],
-                content=extracted['content'],
-                domain=domain,
-                crawled_at=crawled_at
-            )
-            
-            self.stats['pages_scored'] += 1
-            
-            # Log score for visibility
-            if final_score < 40:
-                logger.info(f"   📊 Score: {final_score}/100 (NOT INDEXABLE)")
-            elif final_score >= 70:
-                logger.info(f"   📊 Score: {final_score}/100 ✅")
-            else:
-                logger.info(f"   📊 Score: {final_score}/100")
-        
-        except Exception as e:
-            logger.error(f"   ❌ Scoring failed: {e}")
-            self.stats['pages_score_failed'] += 1
-            # Continue crawling even if scoring fails
-        
-        # Queue new URLs
-        for link in extracted['links']:
-            self.queue_url(link['url'])
-        
-        # Update stats
-        self.stats['pages_crawled'] += 1
-        self.stats['links_found'] += len(extracted['links'])
-        
-        logger.info(f"✅ Crawled successfully: {final_url} ({len(extracted['links'])} links found)")
+        # Save, score and queue links in batches (see flush_pages)
+        self._pending_pages[final_url_hash] = {
+            'url': final_url,
+            'url_hash': final_url_hash,
+            'title': extracted['title'],
+            'content': extracted['content'],
+            'crawled_at': datetime.utcnow(),
+            'links': extracted['links'],
+        }
+        # A flush already running takes these pages next time round
+        if len(self._pending_pages) >= PAGE_BATCH_SIZE and not self._flush_lock.locked():
+            await self._flush_pending()
     
     def crawl(self, max_pages=None):
         """Main crawl loop"""
-        logger.info(f"Starting crawler (max_pages={max_pages})")
-        
-        pages_crawled = 0
+        logger.info(f"Starting crawler (max_pages={max_pages}, concurrency={self.concurrency})")
         
         try:
-            while True:
-                # Check if we've hit the limit
-                if max_pages and pages_crawled >= max_pages:
-                    logger.info(f"Reached max_pages limit: {max_pages}")
-                    break
-                
-                # Get URL from queue
-                url = self.redis.dequeue_url()
-                
-                if url is None:
-                    logger.info("Queue is empty")
-                    break
-                
-                # Crawl the URL
-                self.crawl_url(url)
-                pages_crawled += 1
-                
-                # Print progress every 10 pages
-                if pages_crawled % 10 == 0:
-                    self.print_stats()
+            asyncio.run(self._crawl_async(max_pages))
         
         except KeyboardInterrupt:
             logger.info("\nCrawl interrupted by user")
         
         finally:
+            self.flush_pages()
             self.print_stats()
             logger.info("Crawler stopped")
     
+    async def _crawl_async(self, max_pages):
+        """Run concurrency workers over one shared HTTP/2 client"""
+        limits = httpx.Limits(
+            max_connections=self.concurrency,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+        )
+        
+        async with httpx.AsyncClient(http2=True, limits=limits, headers=self.headers,
+                                     follow_redirects=True) as client:
+            self._client = client
+            self._flush_lock = asyncio.Lock()
+            try:
+                await asyncio.gather(*(
+                    self._crawl_worker(max_pages) for _ in range(self.concurrency)
+                ))
+            finally:
+                self._client = None
+        
+        if max_pages and self._urls_dequeued >= max_pages:
+            logger.info(f"Reached max_pages limit: {max_pages}")
+        else:
+            logger.info("Queue is empty")
+    
+    async def _crawl_worker(self, max_pages):
+        """
+        Pull URLs from the queue and crawl them until max_pages URLs have
+        been taken or the queue is empty with nothing left in flight
+        (Parsing and lookups stay on the event loop thread; network waits
+        and batch flushes (see _flush_pending) overlap)
+        """
+        while True:
+            # Check if we've hit the limit
+            if max_pages and self._urls_dequeued >= max_pages:
+                return
+            
+            # Get URL from queue, refilling the local buffer in batches
+            # (never past max_pages, so nothing is left buffered)
+            if not self._url_buffer:
+                batch_size = DEQUEUE_BATCH_SIZE
+                if max_pages:
+                    batch_size = min(batch_size, max_pages - self._urls_dequeued)
+                self._url_buffer.extend(self.redis.dequeue_urls(batch_size))
+            url = self._url_buffer.popleft() if self._url_buffer else None
+            
+            if url is None:
+                if self._in_flight or self._flush_lock.locked():
+                    # Pages still being crawled or flushed may queue more links
+                    await asyncio.sleep(QUEUE_POLL_INTERVAL)
+                    continue
+                if self._pending_pages:
+                    # Unflushed pages hold links that haven't been queued yet
+                    await self._flush_pending()
+                    continue
+                return
+            
+            # Crawl the URL
+            self._urls_dequeued += 1
+            self._in_flight += 1
+            try:
+                await self.crawl_url(url)
+            except Exception as e:
+                logger.error(f"Error crawling {url}: {e}")
+                self.stats['pages_failed'] += 1
+            finally:
+                self._in_flight -= 1
+            
+            # Print progress every 10 pages
+            if self._urls_dequeued % 10 == 0:
+                self.print_stats()
+    
     def print_stats(self):
         """Print crawl statistics"""
         logger.info("\n" + "="*60)
@@ -463,6 +930,8 @@ def main():
     parser.add_argument('--seed', type=str, help='Seed URLs file')
     parser.add_argument('--max-pages', type=int, help='Maximum pages to crawl')
     parser.add_argument('--delay', type=float, default=1.0, help='Politeness delay in seconds (default: 1.0)')
+    parser.add_argument('--concurrency', type=int, default=CRAWL_CONCURRENCY,
+                        help=f'Concurrent fetches across hosts (default: {CRAWL_CONCURRENCY})')
     
     args = parser.parse_args()
     
@@ -502,28 +971,17 @@ def main():
         logger.info("Queue is empty, loading default seeds...")
         try:
             seed_urls = load_seed_urls('seed_urls.txt')
-            for url in seed_urls:
-                redis_manager.enqueue_url(url)
-            logger.info(f"✅ Auto-seeded {len(seed_urls)} URLs")
+            added = redis_manager.enqueue_urls(seed_urls)
+            logger.info(f"✅ Auto-seeded {added} URLs")
         except Exception as e:
             logger.warning(f"Could not auto-seed URLs: {e}")
     
     # Create crawler
-    # Auto-seed if queue is empty and no seed file provided
-    if not args.seed and redis_manager.queue_size() == 0:
-        logger.info("Queue is empty, loading default seeds...")
-        try:
-            seed_urls = load_seed_urls('seed_urls.txt')
-            for url in seed_urls:
-                redis_manager.enqueue_url(url)
-            logger.info(f"✅ Auto-seeded {len(seed_urls)} URLs")
-        except Exception as e:
-            logger.warning(f"Could not auto-seed URLs: {e}")
-    
     crawler = Crawler(
         redis_manager=redis_manager,
         db_conn=db_conn,
-        politeness_delay=args.delay
+        politeness_delay=args.delay,
+        concurrency=args.concurrency
     )
     
     # Print blocklist stats
@@ -535,6 +993,7 @@ def main():
     crawler.crawl(max_pages=args.max_pages)
     
     # Cleanup
+    crawler.scorer.close()
     db_conn.close()
     logger.info("Database connection closed")
 
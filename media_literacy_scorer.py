@@ -15,12 +15,301 @@ Models:
 
 import os
 import json
+import time
+import random
+import hashlib
+import asyncio
 import logging
+
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Red-flag keywords recorded in details['triggered_by']
+TRIGGERED_BY_LIMIT = 10
+
+# OpenRouter requests in flight at once during analyze_batch, and the
+# longest pause taken on a rate-limit header
+MAX_CONCURRENT_OPENROUTER_CALLS = 10
+MAX_RATE_LIMIT_WAIT = 60
+
+# Suspicious pages packed into one OpenRouter request by analyze_batch
+# (content samples are ANALYSIS_SAMPLE_CHARS, so ~4k input tokens per request)
+ANALYSIS_PAGES_PER_REQUEST = 6
+
+# Successful analyses cached in Redis by (model, prompt) hash
+ANALYSIS_CACHE_PREFIX = 'mls:'
+ANALYSIS_CACHE_TTL = 7 * 86400
+
+# Optional dependencies (graceful degradation)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Pooled keep-alive connections to OpenRouter; connection failures and
+# rate-limit/gateway responses are retried (read timeouts are not, since
+# the completion may already have been billed)
+HTTP_POOL_SIZE = 64
+OPENROUTER_RETRIES = 2
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+RETRY_BACKOFF = 0.5
+RETRY_BACKOFF_MAX = 8
+HTTP_RETRIES = Retry(
+    total=OPENROUTER_RETRIES,
+    read=0,
+    backoff_factor=RETRY_BACKOFF,
+    status_forcelist=RETRY_STATUS_CODES,
+    allowed_methods=frozenset({'POST'}),
+    raise_on_status=False
+)
+
+
+# Prompt sections shared by single-page and batched analysis prompts
+ANALYSIS_PATTERNS = """Detect these 7 patterns:
+1. Scientific Consensus Mismatch - contradicts established scientific consensus
+2. Extraordinary Claims - miracle cures, one weird trick, extreme promises without evidence
+3. Statistical Manipulation - correlation as causation, cherry-picked data, misleading stats
+4. Source-Expertise Mismatch - unqualified author making expert claims
+5. Conflict of Interest - undisclosed sponsorships, selling promoted products
+6. Historical Revisionism - contradicts established historical record
+7. Predatory Economic - MLM recruitment, pressure tactics, get-rich-quick schemes
+
+IMPORTANT NUANCE:
+- News reporting violence ≠ glorifying violence
+- Academic discussion ≠ advocacy
+- Historical analysis ≠ revisionism
+- Medical information from qualified sources ≠ miracle cure claims
+- Educational content explaining conspiracies ≠ promoting them"""
+
+ANALYSIS_RESULT_SCHEMA = """{
+  "major_red_flags": ["pattern_name1", "pattern_name2"],
+  "minor_concerns": ["pattern_name3"],
+  "explanation": "Brief 1-2 sentence reasoning",
+  "credibility_score": 0-100,
+  "context_box_needed": true or false,
+  "context_box_text": "Educational context for users if needed"
+}"""
+
+ANALYSIS_GUIDANCE = """Pattern names: scientific_mismatch, extraordinary_claims, statistical_manipulation, expertise_mismatch, conflict_of_interest, historical_revisionism, predatory_economic
+
+Be strict but fair. Academic and educational content should score 70+. Genuine misinformation should score 0-40."""
+
+# Static instructions sent first (as the system message) on every call, so
+# providers can reuse the cached prefix; only the user message varies
+ANALYSIS_SYSTEM_PROMPT = f"""Analyze webpage content for media literacy red flags.
+
+{ANALYSIS_PATTERNS}
+
+Each page's analysis is a JSON object:
+{ANALYSIS_RESULT_SCHEMA}
+
+{ANALYSIS_GUIDANCE}"""
+
+# Page text sent for analysis is cut to the first ANALYSIS_SAMPLE_CHARS
+# characters for cost efficiency
+ANALYSIS_SAMPLE_CHARS = 2500
+
+ANALYSIS_PAGE_TEMPLATE = """Title: {title}
+Domain: {domain}
+Text: {content_sample}"""
+
+# Structured output: models that support it must answer with JSON matching
+# ANALYSIS_RESULT_SCHEMA (no markdown fences); batched answers wrap the
+# per-page objects in an "analyses" array, since the root must be an object
+ANALYSIS_PATTERN_NAMES = [
+    'scientific_mismatch', 'extraordinary_claims', 'statistical_manipulation',
+    'expertise_mismatch', 'conflict_of_interest', 'historical_revisionism',
+    'predatory_economic'
+]
+
+ANALYSIS_JSON_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'major_red_flags': {'type': 'array', 'items': {'type': 'string', 'enum': ANALYSIS_PATTERN_NAMES}},
+        'minor_concerns': {'type': 'array', 'items': {'type': 'string', 'enum': ANALYSIS_PATTERN_NAMES}},
+        'explanation': {'type': 'string'},
+        'credibility_score': {'type': 'integer', 'minimum': 0, 'maximum': 100},
+        'context_box_needed': {'type': 'boolean'},
+        'context_box_text': {'type': 'string'}
+    },
+    'required': [
+        'major_red_flags', 'minor_concerns', 'explanation',
+        'credibility_score', 'context_box_needed', 'context_box_text'
+    ],
+    'additionalProperties': False
+}
+
+ANALYSIS_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {'name': 'analysis', 'strict': True, 'schema': ANALYSIS_JSON_SCHEMA}
+}
+
+BATCH_ANALYSIS_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {
+        'name': 'analyses',
+        'strict': True,
+        'schema': {
+            'type': 'object',
+            'properties': {'analyses': {'type': 'array', 'items': ANALYSIS_JSON_SCHEMA}},
+            'required': ['analyses'],
+            'additionalProperties': False
+        }
+    }
+}
+
+
+# Red flag keywords for fast filtering, matched against lowercased content;
+# duplicates dropped, order kept
+RED_FLAG_KEYWORDS = tuple(dict.fromkeys(keyword.lower() for keyword in [
+    # Miracle cure / snake oil
+    'miracle cure', 'doctors hate', 'one weird trick',
+    'scientists don\'t want you to know', 'big pharma',
+    'they don\'t want you to', 'shocking truth',
+    'government hiding', 'mainstream media lies',
+    'breakthrough discovery', 'suppressed information',
+    'what they won\'t tell you', 'banned by',
+    'secret that', 'industry doesn\'t want',
+    'proven to cure', 'guaranteed results',
+
+    # Conspiracy indicators
+    'new world order', 'illuminati', 'deep state',
+    'false flag', 'crisis actors', 'hoax',
+    'cover up', 'conspiracy', 'they\'re hiding',
+
+    # Specific conspiracy theories
+    'flat earth', 'earth is flat', 'globe lie',
+    'moon landing fake', 'moon landing hoax', 'never went to moon',
+    'chemtrails', 'chem trails', 'spraying chemicals',
+    '5g causes', '5g conspiracy', '5g radiation',
+    'vaccines cause autism', 'autism from vaccines', 'vaccine injury',
+    'anti-vax', 'anti-vaxx', 'vaccine danger', 'vaccine poison',
+    'big pharma conspiracy', 'pharmaceutical conspiracy',
+    'qanon', 'wwg1wga', 'trust the plan', 'the storm',
+    'adrenochrome', 'pizzagate', 'pedophile ring',
+    'covid hoax', 'plandemic', 'scamdemic', 'covid fake',
+    'coronavirus hoax', 'virus doesn\'t exist',
+    'microchip vaccine', 'vaccine tracking', 'bill gates microchip',
+    'lizard people', 'reptilians', 'shape shifters',
+    'sandy hook hoax', 'parkland hoax', 'shooting hoax',
+    'holocaust didn\'t happen', 'holocaust denial', 'holocaust hoax',
+    '9/11 inside job', '9/11 controlled demolition', 'twin towers explosives',
+    'agenda 21', 'agenda 2030', 'un takeover',
+    'jade helm', 'fema camps', 'martial law coming',
+    'crisis actor', 'paid protesters', 'soros funded',
+    'george soros conspiracy', 'soros controls',
+    'rothschild conspiracy', 'banking elite conspiracy',
+    'freemasons control', 'satanic ritual', 'satanic panic',
+
+    # MLM / Get rich quick
+    'be your own boss', 'financial freedom',
+    'work from home unlimited', 'passive income guaranteed',
+    'join my team', 'ground floor opportunity',
+    'unlimited earning potential', 'retired at 30',
+
+    # Predatory health claims
+    'detox', 'toxins', 'cleanse', 'boost your immune system',
+    'natural alternative to', 'big pharma doesn\'t want',
+    'FDA doesn\'t approve because', 'alternative to chemotherapy',
+
+    # Historical revisionism
+    'flat earth', 'moon landing fake', 'holocaust hoax',
+    'crisis actors', 'false flag operation',
+
+    # Statistical manipulation indicators
+    'correlation equals causation', '100% of people',
+    'studies show', 'experts agree', 'research proves',
+    'science says' # Often misused
+]))
+
+
+def _build_red_flag_automaton(keywords):
+    """
+    Aho-Corasick automaton over keywords, so needs_analysis finds every
+    keyword in one pass over the content
+    Values are (index, keyword) to report matches in keyword order
+    Returns None if pyahocorasick isn't installed
+    """
+    if not HAS_AHOCORASICK:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for index, keyword in enumerate(keywords):
+        automaton.add_word(keyword, (index, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+_RED_FLAG_AUTOMATON = _build_red_flag_automaton(RED_FLAG_KEYWORDS)
+
+
+# JSON for OpenRouter request/response bodies and cached analyses
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+def _json_dumps(obj):
+    """Encoded JSON (bytes), via orjson when installed"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _format_page(content, domain, title):
+    """One page's section of an analysis prompt"""
+    return ANALYSIS_PAGE_TEMPLATE.format(
+        title=title or 'No title', domain=domain,
+        content_sample=(content or '')[:ANALYSIS_SAMPLE_CHARS]
+    )
+
+
+def _retry_backoff(retry):
+    """Exponential backoff with jitter before retry number retry + 1"""
+    delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** retry)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RateLimiter:
+    """
+    Shared pause for async OpenRouter calls, set from response headers:
+    retry-after, or x-ratelimit-remaining = 0 until x-ratelimit-reset
+    (epoch milliseconds)
+    """
+    
+    def __init__(self):
+        self._resume_at = 0.0
+    
+    async def wait(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            logger.info(f"OpenRouter rate limit reached, waiting {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    def update(self, headers):
+        delay = None
+        try:
+            if headers.get('retry-after'):
+                delay = float(headers['retry-after'])
+            elif headers.get('x-ratelimit-remaining') == '0' and headers.get('x-ratelimit-reset'):
+                delay = int(headers['x-ratelimit-reset']) / 1000 - time.time()
+        except ValueError:
+            return
+        
+        if delay and delay > 0:
+            resume_at = time.monotonic() + min(delay, MAX_RATE_LIMIT_WAIT)
+            self._resume_at = max(self._resume_at, resume_at)
+
 
 class MediaLiteracyScorer:
     """
@@ -28,9 +317,12 @@ class MediaLiteracyScorer:
     Detects misinformation patterns using OpenRouter
     """
     
-    def __init__(self, db_conn=None):
+    def __init__(self, db_conn=None, redis_manager=None):
         self.db_conn = db_conn
         
+        # Analysis cache (see _get_redis); None = not connected yet
+        self._redis = redis_manager
+        
         # OpenRouter configuration
         self.api_key = os.getenv('OPENROUTER_API_KEY')
         self.base_url = 'https://openrouter.ai/api/v1/chat/completions'
@@ -45,96 +337,65 @@ class MediaLiteracyScorer:
         self.temperature = 0.3
         self.timeout = 15
         
+        # One session for every API call, so TLS connections are reused
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                              max_retries=HTTP_RETRIES)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'HTTP-Referer': 'https://nothere.one',
+            'X-Title': 'NotHere.one Media Literacy Scorer'
+        })
+        
+        self.rate_limiter = RateLimiter()
+        
         # Statistics
         self.stats = {
             'total_calls': 0,
             'skipped_neutral': 0,
             'analyzed': 0,
             'errors': 0,
-            'fallback_used': 0
+            'fallback_used': 0,
+            'cache_hits': 0
         }
         
-        # Red flag keywords for fast filtering
-        self.red_flag_keywords = [
-            # Miracle cure / snake oil
-            'miracle cure', 'doctors hate', 'one weird trick',
-            'scientists don\'t want you to know', 'big pharma',
-            'they don\'t want you to', 'shocking truth',
-            'government hiding', 'mainstream media lies',
-            'breakthrough discovery', 'suppressed information',
-            'what they won\'t tell you', 'banned by',
-            'secret that', 'industry doesn\'t want',
-            'proven to cure', 'guaranteed results',
-            
-            # Conspiracy indicators
-            'new world order', 'illuminati', 'deep state',
-            'false flag', 'crisis actors', 'hoax',
-            'cover up', 'conspiracy', 'they\'re hiding',
-            
-            # Specific conspiracy theories
-            'flat earth', 'earth is flat', 'globe lie',
-            'moon landing fake', 'moon landing hoax', 'never went to moon',
-            'chemtrails', 'chem trails', 'spraying chemicals',
-            '5g causes', '5g conspiracy', '5g radiation',
-            'vaccines cause autism', 'autism from vaccines', 'vaccine injury',
-            'anti-vax', 'anti-vaxx', 'vaccine danger', 'vaccine poison',
-            'big pharma conspiracy', 'pharmaceutical conspiracy',
-            'qanon', 'wwg1wga', 'trust the plan', 'the storm',
-            'adrenochrome', 'pizzagate', 'pedophile ring',
-            'covid hoax', 'plandemic', 'scamdemic', 'covid fake',
-            'coronavirus hoax', 'virus doesn\'t exist',
-            'microchip vaccine', 'vaccine tracking', 'bill gates microchip',
-            'lizard people', 'reptilians', 'shape shifters',
-            'sandy hook hoax', 'parkland hoax', 'shooting hoax',
-            'holocaust didn\'t happen', 'holocaust denial', 'holocaust hoax',
-            '9/11 inside job', '9/11 controlled demolition', 'twin towers explosives',
-            'agenda 21', 'agenda 2030', 'un takeover',
-            'jade helm', 'fema camps', 'martial law coming',
-            'crisis actor', 'paid protesters', 'soros funded',
-            'george soros conspiracy', 'soros controls',
-            'rothschild conspiracy', 'banking elite conspiracy',
-            'freemasons control', 'satanic ritual', 'satanic panic',
-            
-            # MLM / Get rich quick
-            'be your own boss', 'financial freedom',
-            'work from home unlimited', 'passive income guaranteed',
-            'join my team', 'ground floor opportunity',
-            'unlimited earning potential', 'retired at 30',
-            
-            # Predatory health claims
-            'detox', 'toxins', 'cleanse', 'boost your immune system',
-            'natural alternative to', 'big pharma doesn\'t want',
-            'FDA doesn\'t approve because', 'alternative to chemotherapy',
-            
-            # Historical revisionism
-            'flat earth', 'moon landing fake', 'holocaust hoax',
-            'crisis actors', 'false flag operation',
-            
-            # Statistical manipulation indicators
-            'correlation equals causation', '100% of people',
-            'studies show', 'experts agree', 'research proves',
-            'science says' # Often misused
-        ]
+        # Red flag keywords for fast filtering (shared, built at import)
+        self.red_flag_keywords = RED_FLAG_KEYWORDS
+        self._red_flag_automaton = _RED_FLAG_AUTOMATON
         
         if not self.api_key:
             logger.warning("OPENROUTER_API_KEY not set - media literacy will return neutral scores")
     
-    def needs_analysis(self, content, domain):
+    def needs_analysis(self, content, domain, content_lower=None):
         """
         Fast keyword check to determine if content needs AI analysis
         
+        Args:
+            content_lower: content.lower(), if the caller already has it
+        
         Returns:
             tuple: (needs_analysis: bool, matched_keywords: list)
         """
         if not content or len(content) < 100:
             return False, []
         
-        content_lower = content.lower()
-        matched = []
-        
-        for keyword in self.red_flag_keywords:
-            if keyword in content_lower:
-                matched.append(keyword)
+        if content_lower is None:
+            content_lower = content.lower()
+        
+        if self._red_flag_automaton is not None:
+            found = {value for _, value in self._red_flag_automaton.iter(content_lower)}
+            matched = [keyword for _, keyword in sorted(found)]
+        else:
+            # Stop once triggered_by is full; the 2-keyword gate only needs
+            # the first two
+            matched = []
+            for keyword in self.red_flag_keywords:
+                if keyword in content_lower:
+                    matched.append(keyword)
+                    if len(matched) >= TRIGGERED_BY_LIMIT:
+                        break
         
         # If 2+ red flag keywords, send to AI
         needs_ai = len(matched) >= 2
@@ -152,76 +413,54 @@ class MediaLiteracyScorer:
         Returns:
             str: Formatted prompt
         """
-        # Truncate content to first 2500 characters for cost efficiency
-        content_sample = content[:2500] if content else ""
+        page = _format_page(content, domain, title)
         
         prompt = f"""Analyze this webpage content for media literacy red flags.
 
 CONTENT:
-Title: {title or 'No title'}
-Domain: {domain}
-Text: {content_sample}
-
-Detect these 7 patterns:
-1. Scientific Consensus Mismatch - contradicts established scientific consensus
-2. Extraordinary Claims - miracle cures, one weird trick, extreme promises without evidence
-3. Statistical Manipulation - correlation as causation, cherry-picked data, misleading stats
-4. Source-Expertise Mismatch - unqualified author making expert claims
-5. Conflict of Interest - undisclosed sponsorships, selling promoted products
-6. Historical Revisionism - contradicts established historical record
-7. Predatory Economic - MLM recruitment, pressure tactics, get-rich-quick schemes
+{page}
 
-IMPORTANT NUANCE:
-- News reporting violence ≠ glorifying violence
-- Academic discussion ≠ advocacy
-- Historical analysis ≠ revisionism
-- Medical information from qualified sources ≠ miracle cure claims
-- Educational content explaining conspiracies ≠ promoting them
-
-Return ONLY a JSON object (no markdown, no code blocks):
-{{
-  "major_red_flags": ["pattern_name1", "pattern_name2"],
-  "minor_concerns": ["pattern_name3"],
-  "explanation": "Brief 1-2 sentence reasoning",
-  "credibility_score": 0-100,
-  "context_box_needed": true or false,
-  "context_box_text": "Educational context for users if needed"
-}}
-
-Pattern names: scientific_mismatch, extraordinary_claims, statistical_manipulation, expertise_mismatch, conflict_of_interest, historical_revisionism, predatory_economic
-
-Be strict but fair. Academic and educational content should score 70+. Genuine misinformation should score 0-40."""
+Return ONLY a JSON object (no markdown, no code blocks)."""
 
         return prompt
     
-    def _call_openrouter(self, prompt, model, attempt=1):
+    def _build_batch_prompt(self, pages):
         """
-        Make API call to OpenRouter
+        One prompt analyzing several pages, answered with an "analyses" array
         
-        Returns:
-            dict: API response or None on error
+        Args:
+            pages: list of (content, domain, title)
         """
-        if not self.api_key:
-            logger.error("No OpenRouter API key configured")
-            return None
-        
-        headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json',
-            'HTTP-Referer': 'https://nothere.one',
-            'X-Title': 'NotHere.one Media Literacy Scorer'
-        }
+        sections = [
+            f"[PAGE {number}]\n" + _format_page(content, domain, title)
+            for number, (content, domain, title) in enumerate(pages, 1)
+        ]
         
+        pages_text = '\n\n'.join(sections)
+        return f"""Analyze each of these {len(pages)} webpages for media literacy red flags.
+
+{pages_text}
+
+Return ONLY a JSON object (no markdown, no code blocks) whose "analyses" array has {len(pages)} objects, one per page, in page order."""
+    
+    def _request_payload(self, prompt, model, max_tokens=None,
+                         response_format=ANALYSIS_RESPONSE_FORMAT):
+        """JSON body for an OpenRouter chat completion"""
         data = {
             'model': model,
             'messages': [
+                {
+                    'role': 'system',
+                    'content': ANALYSIS_SYSTEM_PROMPT
+                },
                 {
                     'role': 'user',
                     'content': prompt
                 }
             ],
-            'max_tokens': self.max_tokens,
+            'max_tokens': max_tokens or self.max_tokens,
             'temperature': 0.3,
+            'response_format': response_format,
             'route': 'fallback'  # Enable automatic fallback
         }
         
@@ -231,19 +470,37 @@ Be strict but fair. Academic and educational content should score 70+. Genuine m
                 'blacklist': self.blocked_models
             }
         
+        return data
+    
+    def _call_openrouter(self, prompt, model, attempt=1):
+        """
+        Make API call to OpenRouter
+        
+        Returns:
+            dict: API response or None on error
+        """
+        if not self.api_key:
+            logger.error("No OpenRouter API key configured")
+            return None
+        
+        headers = {
+            'Authorization': f'Bearer {self.api_key}'
+        }
+        data = self._request_payload(prompt, model)
+        
         try:
             logger.debug(f"OpenRouter API call (model={model}, attempt={attempt})")
             
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
                 headers=headers,
-                json=data,
+                data=_json_dumps(data),
                 timeout=self.timeout
             )
             
             response.raise_for_status()
             
-            result = response.json()
+            result = _json_loads(response.content)
             
             # Log usage
             if 'usage' in result:
@@ -275,6 +532,11 @@ Be strict but fair. Academic and educational content should score 70+. Genuine m
         # Build prompt
         prompt = self._build_analysis_prompt(content, domain, title)
         
+        cache_key = self._analysis_cache_key(prompt)
+        cached = self._get_cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+        
         # Try primary model
         response = self._call_openrouter(prompt, self.primary_model, attempt=1)
         
@@ -284,6 +546,60 @@ Be strict but fair. Academic and educational content should score 70+. Genuine m
             response = self._call_openrouter(prompt, self.fallback_model, attempt=2)
             self.stats['fallback_used'] += 1
         
+        return self._cache_analysis(cache_key, self._analysis_from_response(response))
+    
+    # ========================================================================
+    # ANALYSIS CACHE
+    # ========================================================================
+    
+    def _get_redis(self):
+        """
+        RedisManager for the analysis cache, connected on first use
+        Returns None if Redis isn't available (analyses aren't cached)
+        """
+        if self._redis is None:
+            try:
+                from redis_manager import RedisManager
+                self._redis = RedisManager()
+            except Exception as e:
+                logger.warning(f"Media literacy analysis cache disabled: {e}")
+                self._redis = False
+        return self._redis or None
+    
+    def _analysis_cache_key(self, prompt):
+        """Cache key for a prompt sent to the primary model"""
+        digest = hashlib.sha256(
+            f"{self.primary_model}|{ANALYSIS_SYSTEM_PROMPT}|{prompt}".encode('utf-8')
+        ).hexdigest()
+        return ANALYSIS_CACHE_PREFIX + digest
+    
+    def _get_cached_analysis(self, cache_key):
+        """(score, details) from a previous identical analysis, or None"""
+        redis_manager = self._get_redis()
+        if redis_manager is None:
+            return None
+        
+        cached = redis_manager.cache_get(cache_key)
+        if cached is None:
+            return None
+        
+        score, details = _json_loads(cached)
+        self.stats['cache_hits'] += 1
+        return score, details
+    
+    def _cache_analysis(self, cache_key, analysis):
+        """Store a successful analysis; errors are never cached"""
+        score, details = analysis
+        redis_manager = self._get_redis()
+        if redis_manager is not None and details.get('status') == 'analyzed':
+            redis_manager.cache_set(cache_key, _json_dumps([score, details]), ttl=ANALYSIS_CACHE_TTL)
+        return analysis
+    
+    def _analysis_from_response(self, response):
+        """
+        Turn an OpenRouter completion (None if both models failed) into
+        (score, details)
+        """
         # If both fail, return neutral
         if response is None:
             logger.error("Both primary and fallback models failed")
@@ -295,54 +611,14 @@ Be strict but fair. Academic and educational content should score 70+. Genuine m
             }
         
         # Extract response
+        content_text = ''
         try:
-            choices = response.get('choices', [])
-            if not choices:
-                raise ValueError("No choices in response")
-            
-            message = choices[0].get('message', {})
-            content_text = message.get('content', '').strip()
-            
-            # Remove markdown code blocks if present
-            if content_text.startswith('```'):
-                content_text = content_text.split('```')[1]
-                if content_text.startswith('json'):
-                    content_text = content_text[4:]
-                content_text = content_text.strip()
+            content_text = self._response_text(response)
             
             # Parse JSON
-            analysis = json.loads(content_text)
-            
-            # Extract score
-            score = analysis.get('credibility_score', 50)
-            
-            # Validate score range
-            if not (0 <= score <= 100):
-                logger.warning(f"Invalid score {score}, clamping to 0-100")
-                score = max(0, min(100, score))
-            
-            # Build details
-            details = {
-                'status': 'analyzed',
-                'model_used': response.get('model', self.primary_model),
-                'major_red_flags': analysis.get('major_red_flags', []),
-                'minor_concerns': analysis.get('minor_concerns', []),
-                'explanation': analysis.get('explanation', ''),
-                'context_box_needed': analysis.get('context_box_needed', False),
-                'context_box_text': analysis.get('context_box_text', ''),
-                'raw_score': score
-            }
+            analysis = _json_loads(content_text)
             
-            self.stats['analyzed'] += 1
-            
-            # Log significant findings
-            if score < 40:
-                logger.warning(f"Low credibility score: {score}/100")
-                logger.warning(f"  Red flags: {details['major_red_flags']}")
-            elif score >= 80:
-                logger.info(f"High credibility score: {score}/100")
-            
-            return int(score), details
+            return self._analysis_from_json(analysis, response.get('model', self.primary_model))
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
@@ -362,28 +638,311 @@ Be strict but fair. Academic and educational content should score 70+. Genuine m
                 'error': str(e)
             }
     
-    def calculate_media_literacy_score(self, content, domain, title=None):
+    def _response_text(self, response):
+        """
+        Completion text of an OpenRouter response, markdown fences removed
+        (only needed when the model ignored response_format)
+        """
+        choices = response.get('choices', [])
+        if not choices:
+            raise ValueError("No choices in response")
+        
+        message = choices[0].get('message', {})
+        content_text = message.get('content', '').strip()
+        
+        # Remove markdown code blocks if present
+        if content_text.startswith('```'):
+            content_text = content_text.split('```')[1]
+            if content_text.startswith('json'):
+                content_text = content_text[4:]
+            content_text = content_text.strip()
+        
+        return content_text
+    
+    def _analysis_from_json(self, analysis, model):
+        """(score, details) from one parsed analysis object"""
+        # Extract score
+        score = analysis.get('credibility_score', 50)
+        
+        # Validate score range
+        if not (0 <= score <= 100):
+            logger.warning(f"Invalid score {score}, clamping to 0-100")
+            score = max(0, min(100, score))
+        
+        # Build details
+        details = {
+            'status': 'analyzed',
+            'model_used': model,
+            'major_red_flags': analysis.get('major_red_flags', []),
+            'minor_concerns': analysis.get('minor_concerns', []),
+            'explanation': analysis.get('explanation', ''),
+            'context_box_needed': analysis.get('context_box_needed', False),
+            'context_box_text': analysis.get('context_box_text', ''),
+            'raw_score': score
+        }
+        
+        self.stats['analyzed'] += 1
+        
+        # Log significant findings
+        if score < 40:
+            logger.warning(f"Low credibility score: {score}/100")
+            logger.warning(f"  Red flags: {details['major_red_flags']}")
+        elif score >= 80:
+            logger.info(f"High credibility score: {score}/100")
+        
+        return int(score), details
+    
+    # ========================================================================
+    # ASYNC BATCH ANALYSIS
+    # ========================================================================
+    
+    async def _call_openrouter_async(self, client, prompt, model, attempt=1, max_tokens=None,
+                                     response_format=ANALYSIS_RESPONSE_FORMAT):
+        """
+        _call_openrouter on a shared httpx.AsyncClient, with the same retry
+        policy; waits out (and records) OpenRouter rate limits via
+        self.rate_limiter
+        
+        Returns:
+            dict: API response or None on error
+        """
+        if not self.api_key:
+            logger.error("No OpenRouter API key configured")
+            return None
+        
+        try:
+            logger.debug(f"OpenRouter API call (model={model}, attempt={attempt})")
+            
+            # Same policy as HTTP_RETRIES: connection failures and
+            # RETRY_STATUS_CODES are retried (Retry-After honored through
+            # the rate limiter), read timeouts are not
+            for retry in range(OPENROUTER_RETRIES + 1):
+                await self.rate_limiter.wait()
+                try:
+                    response = await client.post(
+                        self.base_url,
+                        headers={'Authorization': f'Bearer {self.api_key}'},
+                        content=_json_dumps(self._request_payload(
+                            prompt, model, max_tokens, response_format
+                        ))
+                    )
+                except (httpx.ConnectError, httpx.ConnectTimeout):
+                    if retry == OPENROUTER_RETRIES:
+                        raise
+                else:
+                    self.rate_limiter.update(response.headers)
+                    if response.status_code not in RETRY_STATUS_CODES or retry == OPENROUTER_RETRIES:
+                        break
+                
+                await asyncio.sleep(_retry_backoff(retry))
+            
+            response.raise_for_status()
+            
+            result = _json_loads(response.content)
+            
+            # Log usage
+            if 'usage' in result:
+                usage = result['usage']
+                logger.debug(f"  Tokens: {usage.get('prompt_tokens', 0)} prompt, "
+                           f"{usage.get('completion_tokens', 0)} completion")
+            
+            return result
+            
+        except httpx.TimeoutException:
+            logger.error(f"OpenRouter timeout (attempt {attempt})")
+            return None
+            
+        except httpx.HTTPError as e:
+            logger.error(f"OpenRouter API error: {e}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Unexpected error calling OpenRouter: {e}")
+            return None
+    
+    async def analyze_with_openrouter_async(self, client, content, domain, title):
+        """
+        analyze_with_openrouter on a shared httpx.AsyncClient
+        
+        Returns:
+            tuple: (score: int, details: dict)
+        """
+        prompt = self._build_analysis_prompt(content, domain, title)
+        
+        cache_key = self._analysis_cache_key(prompt)
+        cached = self._get_cached_analysis(cache_key)
+        if cached is not None:
+            return cached
+        
+        response = await self._call_openrouter_async(client, prompt, self.primary_model, attempt=1)
+        
+        # Fallback to auto if primary fails
+        if response is None:
+            logger.warning(f"Primary model failed, trying fallback: {self.fallback_model}")
+            response = await self._call_openrouter_async(client, prompt, self.fallback_model, attempt=2)
+            self.stats['fallback_used'] += 1
+        
+        return self._cache_analysis(cache_key, self._analysis_from_response(response))
+    
+    async def _analyze_group_async(self, client, group):
+        """
+        Analyze several pages with one request to the primary model
+        
+        Args:
+            group: list of (index, content, domain, title, matched_keywords, cache_key)
+        
+        Returns:
+            list of (score, details) in group order, or None if the request
+            failed or didn't return one analysis per page
+        """
+        pages = [(content, domain, title) for _, content, domain, title, _, _ in group]
+        prompt = self._build_batch_prompt(pages)
+        
+        response = await self._call_openrouter_async(
+            client, prompt, self.primary_model, max_tokens=self.max_tokens * len(pages),
+            response_format=BATCH_ANALYSIS_RESPONSE_FORMAT
+        )
+        if response is None:
+            return None
+        
+        try:
+            analyses = _json_loads(self._response_text(response))
+            if isinstance(analyses, dict):
+                analyses = analyses.get('analyses')
+            if (not isinstance(analyses, list) or len(analyses) != len(pages)
+                    or not all(isinstance(analysis, dict) for analysis in analyses)):
+                raise ValueError(f"expected an analyses array of {len(pages)} objects")
+            
+            model = response.get('model', self.primary_model)
+            return [self._analysis_from_json(analysis, model) for analysis in analyses]
+            
+        except Exception as e:
+            logger.warning(f"Batched analysis of {len(pages)} pages unusable, "
+                           f"analyzing them one by one: {e}")
+            return None
+    
+    async def analyze_batch_async(self, items):
+        """
+        calculate_media_literacy_score for many pages; pages that pass the
+        keyword gate are packed ANALYSIS_PAGES_PER_REQUEST to a request and
+        analyzed concurrently (at most MAX_CONCURRENT_OPENROUTER_CALLS
+        requests in flight)
+        
+        Args:
+            items: list of (content, domain, title, content_lower); title
+                   and content_lower may be None
+        
+        Returns:
+            list of (score, details), in item order
+        """
+        results = [None] * len(items)
+        suspicious = []
+        for index, (content, domain, title, content_lower) in enumerate(items):
+            self.stats['total_calls'] += 1
+            needs_ai, matched_keywords = self.needs_analysis(content, domain, content_lower)
+            if needs_ai:
+                suspicious.append((index, content, domain, title, matched_keywords))
+            else:
+                self.stats['skipped_neutral'] += 1
+                results[index] = self._neutral_result()
+        
+        if not suspicious:
+            return results
+        
+        # Pages already analyzed (see _get_cached_analysis) need no request
+        pending = []
+        for index, content, domain, title, matched_keywords in suspicious:
+            cache_key = self._analysis_cache_key(self._build_analysis_prompt(content, domain, title))
+            cached = self._get_cached_analysis(cache_key)
+            if cached is not None:
+                score, details = cached
+                details['triggered_by'] = matched_keywords[:TRIGGERED_BY_LIMIT]
+                results[index] = (score, details)
+            else:
+                pending.append((index, content, domain, title, matched_keywords, cache_key))
+        
+        if not pending:
+            return results
+        
+        groups = [pending[start:start + ANALYSIS_PAGES_PER_REQUEST]
+                  for start in range(0, len(pending), ANALYSIS_PAGES_PER_REQUEST)]
+        logger.info(f"Sending {len(pending)} pages to OpenRouter in {len(groups)} requests")
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_OPENROUTER_CALLS)
+        limits = httpx.Limits(
+            max_connections=MAX_CONCURRENT_OPENROUTER_CALLS,
+            max_keepalive_connections=MAX_CONCURRENT_OPENROUTER_CALLS
+        )
+        
+        # HTTP/2 multiplexes the concurrent calls over one TLS connection
+        async with httpx.AsyncClient(http2=True, limits=limits, timeout=self.timeout,
+                                     headers=self.session.headers) as client:
+            async def analyze_page(page):
+                _, content, domain, title, _, _ = page
+                async with semaphore:
+                    return await self.analyze_with_openrouter_async(client, content, domain, title)
+            
+            async def analyze_group(group):
+                analyses = None
+                if len(group) > 1:
+                    async with semaphore:
+                        analyses = await self._analyze_group_async(client, group)
+                
+                if analyses is None:
+                    # One request per page, with the usual model fallback
+                    analyses = await asyncio.gather(*(analyze_page(page) for page in group))
+                else:
+                    for page, analysis in zip(group, analyses):
+                        self._cache_analysis(page[5], analysis)
+                
+                for (index, _, _, _, matched_keywords, _), (score, details) in zip(group, analyses):
+                    details['triggered_by'] = matched_keywords[:TRIGGERED_BY_LIMIT]
+                    results[index] = (score, details)
+            
+            await asyncio.gather(*(analyze_group(group) for group in groups))
+        
+        return results
+    
+    def analyze_batch(self, items):
+        """
+        Synchronous analyze_batch_async, for callers without an event loop
+        (the crawler flushes pages in a worker thread); code already running
+        in a loop should await analyze_batch_async instead
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.analyze_batch_async(items))
+        raise RuntimeError("analyze_batch called inside a running event loop; await analyze_batch_async instead")
+    
+    def _neutral_result(self):
+        """Score for pages that didn't pass the keyword gate"""
+        return 50, {
+            'status': 'neutral',
+            'reason': 'No red flag keywords detected',
+            'skipped_analysis': True
+        }
+    
+    def calculate_media_literacy_score(self, content, domain, title=None, content_lower=None):
         """
         Main entry point for media literacy scoring
         
         Cost-optimized: Only analyzes suspicious content
         
+        Args:
+            content_lower: content.lower(), if the caller already has it
+        
         Returns:
             tuple: (score: int, details: dict)
         """
         self.stats['total_calls'] += 1
         
         # Fast keyword check
-        needs_ai, matched_keywords = self.needs_analysis(content, domain)
+        needs_ai, matched_keywords = self.needs_analysis(content, domain, content_lower)
         
         if not needs_ai:
             # No red flags - return neutral score (no cost)
             self.stats['skipped_neutral'] += 1
-            return 50, {
-                'status': 'neutral',
-                'reason': 'No red flag keywords detected',
-                'skipped_analysis': True
-            }
+            return self._neutral_result()
         
         # Red flags detected - send to AI
         logger.info(f"Sending to OpenRouter: {domain[:50]}")
@@ -391,7 +950,7 @@ Be strict but fair. Academic and educational content should score 70+. Genuine m
         score, details = self.analyze_with_openrouter(content, domain, title)
         
         # Add matched keywords to details
-        details['triggered_by'] = matched_keywords[:10]  # Top 10
+        details['triggered_by'] = matched_keywords[:TRIGGERED_BY_LIMIT]
         
         return score, details
     
@@ -409,7 +968,18 @@ Be strict but fair. Academic and educational content should score 70+. Genuine m
 # Standalone function for use in composite_scorer.py
 _scorer_instance = None
 
-def calculate_media_literacy_score(content, domain, title=None, db_conn=None):
+
+def _get_scorer(db_conn=None):
+    """Shared MediaLiteracyScorer, created on first use"""
+    global _scorer_instance
+    if _scorer_instance is None:
+        _scorer_instance = MediaLiteracyScorer(db_conn)
+    elif db_conn and not _scorer_instance.db_conn:
+        _scorer_instance.db_conn = db_conn
+    return _scorer_instance
+
+
+def calculate_media_literacy_score(content, domain, title=None, db_conn=None, content_lower=None):
     """
     Calculate media literacy score (standalone function)
     
@@ -418,10 +988,18 @@ def calculate_media_literacy_score(content, domain, title=None, db_conn=None):
     Returns:
         tuple: (score: int, details: dict)
     """
-    global _scorer_instance
-    if _scorer_instance is None:
-        _scorer_instance = MediaLiteracyScorer(db_conn)
-    elif db_conn and not _scorer_instance.db_conn:
-        _scorer_instance.db_conn = db_conn
+    return _get_scorer(db_conn).calculate_media_literacy_score(content, domain, title, content_lower)
+
+
+def calculate_media_literacy_scores(items, db_conn=None):
+    """
+    Media literacy scores for a batch of pages, with the OpenRouter calls
+    made concurrently (see MediaLiteracyScorer.analyze_batch)
+    
+    Args:
+        items: list of (content, domain, title, content_lower)
     
-    return _scorer_instance.calculate_media_literacy_score(content, domain, title)
+    Returns:
+        list of (score: int, details: dict), in item order
+    """
+    return _get_scorer(db_conn).analyze_batch(items)
@@ -9,6 +9,37 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Seen-URL dedupe: a RedisBloom filter (~1% false positives, ~10 bits per
+# URL, grows by stacking sub-filters past the capacity) when the module is
+# loaded, else a plain SET of every URL ever queued
+SEEN_FILTER_KEY = 'crawler:seen'
+SEEN_FILTER_ERROR_RATE = 0.01
+SEEN_FILTER_CAPACITY = 10_000_000
+SEEN_MIGRATE_BATCH = 1000
+
+# Blocking dequeue wait; the socket timeout must outlast it, and keepalive
+# plus health checks keep idle connections alive through NAT/load balancers
+BLOCKING_DEQUEUE_TIMEOUT = 5
+SOCKET_TIMEOUT = BLOCKING_DEQUEUE_TIMEOUT + 25
+HEALTH_CHECK_INTERVAL = 30
+
+# SADD/BF.ADD + LPUSH in one round-trip: only URLs new to the dedupe
+# set/filter are queued
+ENQUEUE_SCRIPT = """
+if redis.call('SADD', KEYS[1], ARGV[1]) == 1 then
+    redis.call('LPUSH', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+ENQUEUE_BLOOM_SCRIPT = """
+if redis.call('BF.ADD', KEYS[1], ARGV[1]) == 1 then
+    redis.call('LPUSH', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
 
 class RedisManager:
     """
@@ -21,7 +52,13 @@ class RedisManager:
             redis_url = os.environ.get('REDIS_URL', 'redis://localhost:6379')
         
         # Parse Redis URL and connect
-        self.client = redis.from_url(redis_url, decode_responses=True)
+        self.client = redis.from_url(
+            redis_url,
+            decode_responses=True,
+            socket_keepalive=True,
+            socket_timeout=SOCKET_TIMEOUT,
+            health_check_interval=HEALTH_CHECK_INTERVAL
+        )
         
         # Queue key
         self.queue_key = 'crawler:queue'
@@ -33,6 +70,42 @@ class RedisManager:
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
+        
+        self.has_bloom = self._reserve_seen_filter()
+        self._seen_key = SEEN_FILTER_KEY if self.has_bloom else f'{self.queue_key}:set'
+        self._enqueue_script = self.client.register_script(
+            ENQUEUE_BLOOM_SCRIPT if self.has_bloom else ENQUEUE_SCRIPT
+        )
+    
+    def _reserve_seen_filter(self):
+        """
+        Create the seen-URL Bloom filter if needed and move any URLs from
+        the old dedupe SET into it
+        Returns False if RedisBloom isn't available
+        """
+        try:
+            self.client.execute_command(
+                'BF.RESERVE', SEEN_FILTER_KEY, SEEN_FILTER_ERROR_RATE, SEEN_FILTER_CAPACITY
+            )
+        except redis.ResponseError as e:
+            if 'exists' not in str(e):
+                logger.info(f"RedisBloom not available ({e}), deduplicating URLs with a set")
+                return False
+        
+        set_key = f'{self.queue_key}:set'
+        if self.client.exists(set_key):
+            batch = []
+            for url in self.client.sscan_iter(set_key, count=SEEN_MIGRATE_BATCH):
+                batch.append(url)
+                if len(batch) >= SEEN_MIGRATE_BATCH:
+                    self.client.execute_command('BF.MADD', SEEN_FILTER_KEY, *batch)
+                    batch = []
+            if batch:
+                self.client.execute_command('BF.MADD', SEEN_FILTER_KEY, *batch)
+            self.client.delete(set_key)
+            logger.info("Moved queued URL set into Bloom filter")
+        
+        return True
     
     def enqueue_url(self, url):
         """
@@ -40,19 +113,35 @@ class RedisManager:
         Uses LPUSH for FIFO queue behavior
         """
         try:
-            # Use SADD to prevent duplicates in queue
-            added = self.client.sadd(f'{self.queue_key}:set', url)
-            
-            if added:
-                # Add to list for processing
-                self.client.lpush(self.queue_key, url)
-                return True
-            return False
+            # SADD to prevent duplicates in queue, LPUSH only if new
+            return bool(self._enqueue_script(
+                keys=[self._seen_key, self.queue_key], args=[url]
+            ))
             
         except Exception as e:
             logger.error(f"Error enqueueing URL {url}: {e}")
             return False
     
+    def enqueue_urls(self, urls):
+        """
+        Add many URLs to the crawl queue in one round-trip (a pipeline of
+        enqueue script calls)
+        Returns number of URLs added
+        """
+        if not urls:
+            return 0
+        
+        try:
+            keys = [self._seen_key, self.queue_key]
+            pipe = self.client.pipeline(transaction=False)
+            for url in urls:
+                self._enqueue_script(keys=keys, args=[url], client=pipe)
+            return sum(pipe.execute())
+            
+        except Exception as e:
+            logger.error(f"Error enqueueing {len(urls)} URLs: {e}")
+            return 0
+    
     def dequeue_url(self):
         """
         Get next URL from the crawl queue
@@ -66,6 +155,32 @@ class RedisManager:
             logger.error(f"Error dequeuing URL: {e}")
             return None
     
+    def dequeue_url_blocking(self, timeout=BLOCKING_DEQUEUE_TIMEOUT):
+        """
+        Like dequeue_url, but wait up to timeout seconds (BRPOP) for a URL
+        to arrive instead of returning None on an empty queue right away
+        Returns None if nothing arrived in time
+        """
+        try:
+            result = self.client.brpop(self.queue_key, timeout=timeout)
+            return result[1] if result else None
+        except Exception as e:
+            logger.error(f"Error dequeuing URL: {e}")
+            return None
+    
+    def dequeue_urls(self, n=32):
+        """
+        Get up to n URLs from the crawl queue in one round-trip
+        (RPOP with a count, Redis 6.2+), in the same order as dequeue_url
+        URLs stay in the dedupe set, as with dequeue_url
+        Returns an empty list if queue is empty
+        """
+        try:
+            return self.client.rpop(self.queue_key, n) or []
+        except Exception as e:
+            logger.error(f"Error dequeuing {n} URLs: {e}")
+            return []
+    
     def queue_size(self):
         """Get current queue size"""
         try:
@@ -77,27 +192,48 @@ class RedisManager:
     def clear_queue(self):
         """Clear the entire queue"""
         try:
-            self.client.delete(self.queue_key)
-            self.client.delete(f'{self.queue_key}:set')
+            self.client.delete(self.queue_key, self._seen_key)
+            if self.has_bloom:
+                self._reserve_seen_filter()
             logger.info("Queue cleared")
         except Exception as e:
             logger.error(f"Error clearing queue: {e}")
     
     def is_url_queued(self, url):
-        """Check if URL is already in queue"""
+        """
+        Check if URL is already in queue (or was queued before; with the
+        Bloom filter ~1% of new URLs also report True)
+        """
         try:
-            return self.client.sismember(f'{self.queue_key}:set', url)
+            if self.has_bloom:
+                return bool(self.client.execute_command('BF.EXISTS', self._seen_key, url))
+            return self.client.sismember(self._seen_key, url)
         except Exception as e:
             logger.error(f"Error checking if URL queued: {e}")
             return False
     
     def cache_set(self, key, value, ttl=3600):
-        """Set a cached value with TTL (default 1 hour)"""
+        """Set a cached value with TTL (default 1 hour; None = no expiry)"""
         try:
-            self.client.setex(key, ttl, value)
+            if ttl is None:
+                self.client.set(key, value)
+            else:
+                self.client.setex(key, ttl, value)
         except Exception as e:
             logger.error(f"Error setting cache: {e}")
     
+    def cache_add(self, key, value, ttl=3600):
+        """
+        Set a cached value with TTL only if the key doesn't exist yet
+        (first writer wins when several workers fill the same key)
+        Returns True if this call stored the value
+        """
+        try:
+            return bool(self.client.set(key, value, ex=ttl, nx=True))
+        except Exception as e:
+            logger.error(f"Error setting cache: {e}")
+            return False
+    
     def cache_get(self, key):
         """Get a cached value"""
         try:
@@ -110,7 +246,8 @@ class RedisManager:
         """Get Redis stats"""
         return {
             'queue_size': self.queue_size(),
-            'queue_set_size': self.client.scard(f'{self.queue_key}:set')
+            'queue_set_size': (self.client.execute_command('BF.CARD', self._seen_key)
+                               if self.has_bloom else self.client.scard(self._seen_key))
         }
 
 
@@ -6,8 +6,9 @@ Verifies blocklist, Redis, and database connections
 
 import os
 import sys
+from itertools import islice
 import psycopg2
-from blocklist import get_blocklist
+from blocklist import Tier1Blocklist, get_blocklist
 
 
 def test_blocklist():
@@ -36,8 +37,8 @@ def test_blocklist():
     
     print("\nTest cases:")
     all_passed = True
-    for url, should_block, description in test_cases:
-        is_blocked, reason = blocklist.is_blocked(url)
+    results = blocklist.is_blocked_batch([url for url, _, _ in test_cases], with_reasons=True)
+    for (url, should_block, description), (is_blocked, reason) in zip(test_cases, results):
         
         if is_blocked == should_block:
             status = "✓ PASS"
@@ -60,6 +61,79 @@ def test_blocklist():
         return False
 
 
+def test_blocklist_regex_pattern():
+    """Test that a pattern with regex syntax isn't skipped by the prefilter"""
+    print("="*60)
+    print("TESTING BLOCKLIST REGEX PATTERN")
+    print("="*60)
+    
+    blocklist = Tier1Blocklist()
+    blocklist.add_pattern('(porn)')
+    
+    url = 'https://example.com/pornography/'
+    is_blocked, reason = blocklist.is_blocked(url)
+    
+    if is_blocked:
+        print(f"✓ {url} blocked ({reason})")
+        print("✅ Regex pattern test passed!\n")
+        return True
+    else:
+        print(f"❌ {url} not blocked by pattern '(porn)'\n")
+        return False
+
+
+def test_blocklist_batch():
+    """Test that is_blocked_batch agrees with is_blocked on awkward URLs"""
+    print("="*60)
+    print("TESTING BLOCKLIST BATCH")
+    print("="*60)
+    
+    blocklist = Tier1Blocklist()
+    blocklist.add_pattern('/Gambling/')
+    
+    urls = [
+        'https://example.com/gambling/',    # Pattern with capitals
+        'https://Example.com/GAMBLING/',
+        '//pornhub.com/video',              # No scheme
+        '//www.example.xxx/',
+        'https://[::1/',                    # Unparseable host
+        'https://[::1]/page',
+        'https://porn\thub.com/',            # Tab stripped by urlparse
+        ' https://pornhub.com/',
+        'https://ex\u2100ample.com/',         # Invalid netloc (NFKC), fails closed
+        'https://ex\u00e4mple.com/',
+        'pornhub.com',
+        'https://wikipedia.org/wiki/Casino',
+        'https://example.com/casino/',
+    ]
+    
+    batch = blocklist.is_blocked_batch(urls)
+    all_passed = True
+    for url, batch_blocked in zip(urls, batch):
+        single_blocked, reason = blocklist.is_blocked(url)
+        if batch_blocked == single_blocked:
+            status = "✓ PASS"
+        else:
+            status = "✗ FAIL"
+            all_passed = False
+        print(f"  {status}: {url!r} batch={batch_blocked}, single={single_blocked} ({reason})")
+    
+    # Malformed URLs must fail closed, not slip past the prefilter
+    if not blocklist.is_blocked('https://ex\u2100ample.com/')[0]:
+        print("  ✗ FAIL: invalid netloc should be blocked")
+        all_passed = False
+    
+    if not isinstance(batch, list):
+        print("  ✗ FAIL: is_blocked_batch should return a list")
+        all_passed = False
+    
+    if all_passed:
+        print("✅ Blocklist batch tests passed!\n")
+    else:
+        print("❌ Blocklist batch verdicts differ from is_blocked!\n")
+    return all_passed
+
+
 def test_redis():
     """Test Redis connection"""
     print("="*60)
@@ -122,18 +196,16 @@ def test_database():
         
         cursor = conn.cursor()
         
-        # Check for required tables
+        # Check for required tables (one query for all of them)
         tables = ['pages', 'links']
+        cursor.execute("""
+            SELECT table_name FROM information_schema.tables
+            WHERE table_name = ANY(%s)
+        """, (tables,))
+        existing = {row[0] for row in cursor.fetchall()}
+        
         for table in tables:
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = %s
-                )
-            """, (table,))
-            
-            exists = cursor.fetchone()[0]
-            if exists:
+            if table in existing:
                 print(f"✓ Table '{table}' exists")
             else:
                 print(f"⚠️  Table '{table}' does not exist (run SQL schema)")
@@ -164,22 +236,24 @@ def test_seed_file():
     print("="*60)
     
     try:
+        # Stream the file: keep the first 5 URLs, only count the rest
         with open('seed_urls.txt', 'r') as f:
-            urls = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            urls = (line.strip() for line in f if line.strip() and not line.startswith('#'))
+            sample = list(islice(urls, 5))
+            url_count = len(sample) + sum(1 for _ in urls)
         
-        print(f"✓ Found {len(urls)} seed URLs")
+        print(f"✓ Found {url_count} seed URLs")
         
-        if len(urls) >= 20:
-            print(f"✓ Sufficient seed URLs ({len(urls)} >= 20)")
+        if url_count >= 20:
+            print(f"✓ Sufficient seed URLs ({url_count} >= 20)")
         else:
-            print(f"⚠️  Few seed URLs ({len(urls)} < 20)")
+            print(f"⚠️  Few seed URLs ({url_count} < 20)")
         
-        # Test a few URLs against blocklist
+        # Test a few URLs (the first 5) against blocklist
         blocklist = get_blocklist()
         blocked_count = 0
         
-        for url in urls[:5]:  # Test first 5
-            is_blocked, _ = blocklist.is_blocked(url)
+        for url, is_blocked in zip(sample, blocklist.is_blocked_batch(sample)):
             if is_blocked:
                 blocked_count += 1
                 print(f"⚠️  Seed URL is blocked: {url}")
@@ -208,6 +282,8 @@ def main():
     
     # Run tests
     results.append(("Blocklist", test_blocklist()))
+    results.append(("Blocklist Regex Pattern", test_blocklist_regex_pattern()))
+    results.append(("Blocklist Batch", test_blocklist_batch()))
     results.append(("Redis", test_redis()))
     results.append(("Database", test_database()))
     results.append(("Seed File", test_seed_file()))